@@ -1,26 +1,50 @@
 # dashboard_defense_russie_avance.py
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+import time
+DEBUT_SCRIPT = time.perf_counter()
+
+import importlib
+import sys
+
+# Coût des imports chargés pendant l'exécution courante (secondes)
+TEMPS_IMPORTS = {}
+
+def timed_import(nom):
+    """Importe un module en mesurant son premier chargement dans le processus"""
+    deja_charge = nom in sys.modules
+    debut = time.perf_counter()
+    module = importlib.import_module(nom)
+    if not deja_charge:
+        TEMPS_IMPORTS[nom] = time.perf_counter() - debut
+    return module
+
+st = timed_import('streamlit')
+pd = timed_import('pandas')
+np = timed_import('numpy')
+go = timed_import('plotly.graph_objects')
+pio = timed_import('plotly.io')
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import zipfile
+from types import MappingProxyType
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse Stratégique Avancée - Russie",
-    page_icon="⚡",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Version du code : invalide les singletons du processus quand ce fichier change
+with open(__file__, 'rb') as source:
+    VERSION_CODE = hashlib.sha1(source.read()).hexdigest()[:12]
 
 # CSS personnalisé avancé
-st.markdown("""
+CSS_DASHBOARD = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -92,14 +116,1543 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def configure_page():
+    """Configuration de la page et CSS (uniquement pour l'application Streamlit)"""
+    st.set_page_config(
+        page_title="Analyse Stratégique Avancée - Russie",
+        page_icon="⚡",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CSS_DASHBOARD, unsafe_allow_html=True)
+
+# Année de référence des tendances simulées (t = annee - ANNEE_REFERENCE)
+ANNEE_REFERENCE = 2000
+
+# Registre déclaratif des métriques simulées.
+# Chaque métrique est une tendance linéaire par morceaux :
+#   segments        : [(annee_debut, valeur, pente)], le dernier segment commencé s'applique
+#   parametre       : (cle_config, defaut), ajoute p * (1 + croissance * t)
+#   sauts           : [(annee, increment)] cumulés à partir de l'année indiquée
+#   saisonnalite    : (amplitude, periode) en années
+#   multiplicateurs : [(debut, fin, facteur)], le premier intervalle qui correspond s'applique
+#   plancher/plafond: bornes de la série
+#   entier          : série entière, déduit par défaut de coefficients tous entiers
+#   priorite        : priorité de configuration requise, None pour les métriques de base
+MODELES_METRIQUES = {
+    'Budget_Defense_Mds': {
+        'parametre': ('budget_base', 60.0), 'croissance': 0.04,
+        # Post-Géorgie, post-Crimée puis modernisation avancée (le palier 2022 est couvert par 2020)
+        'multiplicateurs': [(2008, 2012, 1.15), (2014, 2016, 1.1), (2020, None, 1.2)],
+    },
+    'Personnel_Milliers': {'parametre': ('personnel_base', 800), 'croissance': 0.01},
+    'PIB_Militaire_Pourcent': {'segments': [(2000, 3.5, 0.3)]},
+    'Exercices_Militaires': {
+        'parametre': ('exercices_base', 100), 'segments': [(2000, 0, 5)], 'saisonnalite': (10, 4),
+    },
+    'Readiness_Operative': {
+        'segments': [(2000, 70, 1.2)],
+        # Réformes militaires, modernisation, expérience opérationnelle
+        'sauts': [(2008, 10), (2014, 8), (2020, 5)],
+        'plafond': 95,
+    },
+    'Capacite_Dissuasion': {
+        # Héritage soviétique, modernisation puis systèmes hypersoniques
+        'segments': [(2000, 85, 0)], 'sauts': [(2008, 2), (2018, 5)], 'plafond': 98,
+    },
+    'Temps_Mobilisation_Jours': {'segments': [(2000, 30, -0.5)], 'plancher': 7},
+    'Tests_Missiles': {'segments': [(2000, 5, 0), (2008, 8, 1), (2014, 15, 2)]},
+    'Developpement_Technologique': {'segments': [(2000, 75, 1.5)], 'plafond': 95},
+    'Capacite_Artillerie': {'segments': [(2000, 80, 1.2)], 'plafond': 95},
+    'Couverture_AD': {'segments': [(2000, 70, 2)], 'plafond': 95},
+    'Resilience_Logistique': {'segments': [(2000, 65, 2.5)], 'plafond': 92},
+    'Cyber_Capabilities': {'segments': [(2000, 70, 3)], 'plafond': 94},
+    'Production_Armements': {'segments': [(2000, 75, 2)], 'plafond': 96},
+    # Programmes nucléaires
+    'Stock_Ogives_Nucleaires': {
+        # Réduction START puis modernisation
+        'segments': [(2000, 8000, -200), (2010, 6000, 50)], 'plancher': 4000,
+        'priorite': 'nucleaire',
+    },
+    'Portee_Max_Missiles_Km': {
+        # Sarmat opérationnel en 2017
+        'segments': [(2000, 11000, 0), (2009, 12000, 500), (2017, 18000, 0)],
+        'priorite': 'nucleaire',
+    },
+    'Tetes_Multiples': {'segments': [(2000, 6, 0.5)], 'plafond': 12, 'priorite': 'nucleaire'},
+    'Essais_Souterrains': {'segments': [(2000, 85, 1)], 'plafond': 98, 'priorite': 'nucleaire'},
+    # Modernisation
+    'Nouveaux_Systemes': {'segments': [(2000, 5, 2)], 'plafond': 50, 'priorite': 'modernisation'},
+    'Taux_Modernisation': {'segments': [(2000, 30, 4)], 'plafond': 85, 'priorite': 'modernisation'},
+    'Exportations_Armes': {'segments': [(2000, 4, 0.5)], 'plafond': 15, 'priorite': 'modernisation'},
+    # Aérospatial
+    'Satellites_Militaires': {'segments': [(2000, 80, 5)], 'plafond': 150, 'priorite': 'aerospatial'},
+    'Capacite_Antisatellite': {'segments': [(2000, 60, 3)], 'plafond': 95, 'priorite': 'aerospatial'},
+    'Defense_Aerospatiale': {'segments': [(2000, 70, 2.5)], 'plafond': 92, 'priorite': 'aerospatial'},
+    # Cyber
+    'Attaques_Cyber_Reussies': {'segments': [(2000, 20, 3)], 'plafond': 100, 'priorite': 'cyber'},
+    'Reseau_Commandement_Cyber': {'segments': [(2000, 75, 2)], 'plafond': 95, 'priorite': 'cyber'},
+    'Cyber_Defense_Niveau': {'segments': [(2000, 70, 2.5)], 'plafond': 92, 'priorite': 'cyber'},
+}
+
+# Début des projections : les scénarios ne modifient que les années suivantes
+ANNEE_PROJECTION = 2024
+
+# Horizon configurable et résolutions temporelles (nombre de pas par année)
+HORIZON_MIN, HORIZON_MAX = 1950, 2100
+RESOLUTIONS = {"Annuelle": 1, "Mensuelle": 12, "Quotidienne": 365}
+
+# Au-delà de ce nombre de points, une trace est décimée côté serveur pour l'affichage
+POINTS_MAX_TRACE = 2000
+METHODE_DECIMATION = 'minmax'
+
+# Au-delà de ce nombre de points de courbes dans une figure, les courbes passent en WebGL
+SEUIL_WEBGL = 5000
+
+# Nombre maximal de valeurs d'un cube de scénarios ; au-delà, évaluation à la demande
+TAILLE_MAX_CUBE = 20_000_000
+
+# Types de systèmes classés offensifs dans le catalogue (les autres sont défensifs)
+TYPES_OFFENSIFS = ('ICBM', 'SLBM')
+
+# Mode compact : années int16 (int32 au-delà de 32767), métriques float32 (int32 si entières)
+MODE_COMPACT = True
+
+# Préchauffage des caches au démarrage du processus ('0' : désactivé)
+PRECHAUFFAGE = os.environ.get('DASHBOARD_PRECHAUFFAGE', '1') != '0'
+
+# Stockage colonnaire sur disque (un .npy par colonne), relu par memory map ; vide : désactivé
+REPERTOIRE_STOCKAGE = os.environ.get('DASHBOARD_STOCKAGE',
+                                     os.path.join(os.path.dirname(os.path.abspath(__file__)), '.stockage'))
+TAILLE_MAX_STOCKAGE = int(os.environ.get('DASHBOARD_STOCKAGE_MO', 512)) * 1024 ** 2
+
+# Scénarios géopolitiques : facteurs appliqués aux métriques sur la période projetée,
+# avant les plafonds du registre
+SCENARIOS = {
+    "Statut Quo": {},
+    "Escalation OTAN": {
+        'metriques': {
+            'Budget_Defense_Mds': 1.15, 'Exercices_Militaires': 1.3, 'Readiness_Operative': 1.04,
+            'Temps_Mobilisation_Jours': 0.85, 'Tests_Missiles': 1.25, 'Couverture_AD': 1.05,
+            'Stock_Ogives_Nucleaires': 1.05, 'Capacite_Antisatellite': 1.05,
+        },
+    },
+    "Modernisation Accélérée": {
+        'metriques': {
+            'Budget_Defense_Mds': 1.1, 'Developpement_Technologique': 1.05, 'Production_Armements': 1.08,
+            'Cyber_Capabilities': 1.05, 'Nouveaux_Systemes': 1.3, 'Taux_Modernisation': 1.15,
+            'Satellites_Militaires': 1.1, 'Tetes_Multiples': 1.1,
+        },
+    },
+    "Conflit Majeur": {
+        'metriques': {
+            'Budget_Defense_Mds': 1.35, 'Personnel_Milliers': 1.25, 'Readiness_Operative': 0.9,
+            'Temps_Mobilisation_Jours': 0.6, 'Capacite_Artillerie': 1.05, 'Resilience_Logistique': 0.85,
+            'Production_Armements': 1.15, 'Exportations_Armes': 0.6, 'Attaques_Cyber_Reussies': 1.2,
+        },
+    },
+}
+
+# Mode Monte Carlo : écarts-types des perturbations, tirées par tirage et par métrique
+INCERTITUDES = {
+    'parametre': 0.10,   # relatif, log-normal : budget_base, personnel_base, exercices_base
+    'croissance': 0.25,  # relatif, log-normal : taux de croissance (0.04 du budget)
+    'ruptures': 1.0,     # années : décalage des ruptures (segments, sauts, multiplicateurs)
+    'bornes': 0.03,      # relatif : planchers et plafonds
+}
+
+# Percentiles conservés par les bandes Monte Carlo
+PERCENTILES_BANDES = (5, 10, 25, 50, 75, 90, 95)
+
+# Intervalles affichables : (percentile bas, percentile haut)
+INTERVALLES_BANDES = {"50 %": (25, 75), "80 %": (10, 90), "90 %": (5, 95)}
+
+# Au-delà de ce nombre de tirages, les métriques sont réparties sur le pool de processus
+TIRAGES_MIN_PARALLELE = 20_000
+
+# Rapports imprimables : pages A4 paysage (pouces) rendues en PNG à cette résolution
+FORMAT_PAGE_RAPPORT = (11.69, 8.27)
+DPI_RAPPORT = 150
+
+# Capacités principales tracées par la figure d'évolution et par les rapports : libellé, couleur
+CAPACITES_PRINCIPALES = {
+    'Readiness_Operative': ('Préparation Opér.', '#0033A0'),
+    'Capacite_Dissuasion': ('Dissuasion Strat.', '#D52B1E'),
+    'Cyber_Capabilities': ('Capacités Cyber', '#2d3436'),
+    'Couverture_AD': ('Défense Anti-Aérienne', '#4B0082'),
+}
+
+# Mémoire visée pour un bloc de trajectoires (tirages × années × 8 octets)
+OCTETS_BLOC_TIRAGES = 64 * 1024 ** 2
+
+# Leviers du balayage de sensibilité : paramètre de configuration, ou coefficient
+# du registre compilé (tableau, métrique, colonne ou None)
+LEVIERS_SENSIBILITE = {
+    'budget_base': {'libelle': "Budget de base (Md$)", 'parametre': 'budget_base'},
+    'croissance_budget': {'libelle': "Croissance annuelle du budget",
+                          'tableau': ('croissance', 'Budget_Defense_Mds', None)},
+    'multiplicateur_2008': {'libelle': "Multiplicateur budget 2008-2012",
+                            'tableau': ('mult_facteur', 'Budget_Defense_Mds', 0)},
+    'multiplicateur_2014': {'libelle': "Multiplicateur budget 2014-2016",
+                            'tableau': ('mult_facteur', 'Budget_Defense_Mds', 1)},
+    'multiplicateur_2020': {'libelle': "Multiplicateur budget depuis 2020",
+                            'tableau': ('mult_facteur', 'Budget_Defense_Mds', 2)},
+    'personnel_base': {'libelle': "Effectifs de base (milliers)", 'parametre': 'personnel_base'},
+    'croissance_personnel': {'libelle': "Croissance annuelle des effectifs",
+                             'tableau': ('croissance', 'Personnel_Milliers', None)},
+    'exercices_base': {'libelle': "Exercices de base", 'parametre': 'exercices_base'},
+    'pente_exercices': {'libelle': "Exercices supplémentaires par an",
+                        'tableau': ('seg_pente', 'Exercices_Militaires', 0)},
+    'pente_readiness': {'libelle': "Progression annuelle de la préparation",
+                        'tableau': ('seg_pente', 'Readiness_Operative', 0)},
+    'plafond_readiness': {'libelle': "Plafond de préparation (%)",
+                          'tableau': ('plafond', 'Readiness_Operative', None)},
+}
+
+# Traitement des leviers hors carte de chaleur : référence, ou agrégation NumPy
+AGREGATIONS_BALAYAGE = {"Valeur de référence": 'base', "Moyenne": 'mean', "Minimum": 'min', "Maximum": 'max'}
+
+# Nombre maximal de combinaisons d'un balayage, et nombre d'étapes de progression
+TAILLE_MAX_BALAYAGE = 1_000_000
+ETAPES_BALAYAGE = 20
+
+# Processus de calcul du pool partagé
+NB_PROCESSUS = os.cpu_count() or 1
+
+def time_axis(annee_debut, annee_fin, pas=1):
+    """Axe temporel contigu en années décimales, `pas` points par année (entiers en annuel)"""
+    if pas == 1:
+        return np.arange(annee_debut, annee_fin + 1)
+    return annee_debut + np.arange((annee_fin - annee_debut + 1) * pas) / pas
+
+def freeze(valeur):
+    """Copie immuable d'une structure : dictionnaires en MappingProxyType, listes en
+    tuples, tableaux NumPy en vues en lecture seule"""
+    if isinstance(valeur, (dict, MappingProxyType)):
+        return MappingProxyType({cle: freeze(element) for cle, element in valeur.items()})
+    if isinstance(valeur, (list, tuple)):
+        return tuple(freeze(element) for element in valeur)
+    if isinstance(valeur, np.ndarray):
+        valeur = valeur.view()
+        valeur.flags.writeable = False
+    return valeur
+
+def compact_years(annees):
+    """Axe temporel entier (résolution annuelle) en int16, int32 hors de la plage int16 ; inchangé sinon"""
+    annees = np.asarray(annees)
+    if annees.dtype.kind not in 'iu':
+        return annees
+    limites = np.iinfo(np.int16)
+    if annees.size and (annees.min() < limites.min or annees.max() > limites.max):
+        return annees.astype(np.int32)
+    return annees.astype(np.int16)
+
+def decimate_minmax(y, points):
+    """Indices du minimum et du maximum de chaque tranche : les pics restent visibles"""
+    y = np.asarray(y, dtype=float)
+    taille = -(-len(y) // max(1, points // 2))
+    tranches = -(-len(y) // taille)
+    complet = np.full(tranches * taille, np.nan)
+    complet[:len(y)] = y
+    complet = complet.reshape(tranches, taille)
+    origines = np.arange(tranches) * taille
+    indices = np.concatenate([origines + np.nanargmin(complet, axis=1), origines + np.nanargmax(complet, axis=1),
+                              [0, len(y) - 1]])
+    return np.unique(indices)
+
+def decimate_lttb(x, y, points):
+    """Indices retenus par Largest-Triangle-Three-Buckets : la forme de la courbe est conservée"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    bords = np.linspace(1, n - 1, points - 1).astype(int)
+    indices = np.empty(points, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        debut, fin = bords[i], bords[i + 1]
+        # Sommet moyen de la tranche suivante (le dernier point pour la dernière tranche)
+        suivant = slice(bords[i + 1], bords[i + 2] if i + 2 < len(bords) else n)
+        moyenne_x, moyenne_y = x[suivant].mean(), y[suivant].mean()
+        aires = np.abs((x[a] - moyenne_x) * (y[debut:fin] - y[a]) - (x[a] - x[debut:fin]) * (moyenne_y - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+    return indices
+
+def decimate(x, y, points=POINTS_MAX_TRACE, methode=METHODE_DECIMATION):
+    """Série réduite pour l'affichage ; les séries assez courtes sont rendues telles quelles"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= points:
+        return x, y
+    indices = decimate_minmax(y, points) if methode == 'minmax' else decimate_lttb(x, y, points)
+    return x[indices], y[indices]
+
+def content_hash(valeur):
+    """Empreinte stable d'une structure JSON (clés triées)"""
+    contenu = json.dumps(valeur, sort_keys=True,
+                         default=lambda v: dict(v) if isinstance(v, MappingProxyType) else str(v))
+    return hashlib.sha1(contenu.encode('utf-8')).hexdigest()[:12]
+
+def model_version(modeles=MODELES_METRIQUES, scenarios=SCENARIOS):
+    """Empreinte du registre et des scénarios, utilisée dans les clés de cache"""
+    return content_hash([modeles, scenarios])
+
+class MoteurSimulation:
+    """Évaluateur NumPy du registre des métriques.
+
+    Le registre est compilé une fois en tableaux (métrique en dernier axe) ;
+    toutes les métriques sont ensuite évaluées en une passe pour un vecteur
+    d'années, avec diffusion sur d'éventuels axes de paramètres en tête.
+    """
+
+    def __init__(self, modeles=MODELES_METRIQUES, scenarios=SCENARIOS):
+        # Moteur partagé par toutes les sessions : tout est figé, lisible sans verrou
+        self.version = model_version(modeles, scenarios)
+        self.modeles = freeze(modeles)
+        self.scenarios = freeze(scenarios)
+        self.metriques = tuple(modeles)
+        self.priorites = tuple(spec.get('priorite') for spec in modeles.values())
+        self.entiers = freeze(np.array([spec.get('entier', self.is_integral(spec)) for spec in modeles.values()]))
+
+        # Paramètres de configuration utilisés par le registre, avec leur valeur par défaut
+        parametres = {}
+        for spec in modeles.values():
+            if 'parametre' in spec:
+                cle, defaut = spec['parametre']
+                parametres.setdefault(cle, defaut)
+        self.parametres = MappingProxyType(parametres)
+        self.noms_parametres = tuple(parametres)
+
+        self.tableaux = freeze(self.compile_models())
+
+    @staticmethod
+    def is_integral(spec):
+        """Vrai si la tendance ne produit que des valeurs entières (années entières)"""
+        if any(cle in spec for cle in ('parametre', 'saisonnalite', 'multiplicateurs')):
+            return False
+        coefficients = [c for segment in spec.get('segments', []) for c in segment]
+        coefficients += [c for saut in spec.get('sauts', []) for c in saut]
+        coefficients += [spec[cle] for cle in ('plancher', 'plafond') if cle in spec]
+        return all(float(c).is_integer() for c in coefficients)
+
+    def compile_models(self):
+        """Convertit le registre en tableaux (..., K) ou (..., K, n) complétés"""
+        specs = list(self.modeles.values())
+        nb_segments = max(len(spec.get('segments', [])) for spec in specs) or 1
+        nb_sauts = max(len(spec.get('sauts', [])) for spec in specs) or 1
+        nb_mult = max(len(spec.get('multiplicateurs', [])) for spec in specs) or 1
+
+        segments, sauts, multiplicateurs = [], [], []
+        for spec in specs:
+            segs = list(spec.get('segments', [])) or [(ANNEE_REFERENCE, 0.0, 0.0)]
+            # Le dernier segment est répété : le sélectionner à nouveau ne change rien
+            segments.append(segs + [segs[-1]] * (nb_segments - len(segs)))
+            sts = list(spec.get('sauts', []))
+            sauts.append(sts + [(np.inf, 0.0)] * (nb_sauts - len(sts)))
+            mults = [(debut, np.inf if fin is None else fin, facteur)
+                     for debut, fin, facteur in spec.get('multiplicateurs', [])]
+            multiplicateurs.append(mults + [(np.inf, np.inf, 1.0)] * (nb_mult - len(mults)))
+
+        segments = np.array(segments, dtype=float)
+        sauts = np.array(sauts, dtype=float)
+        multiplicateurs = np.array(multiplicateurs, dtype=float)
+        index_parametres = [self.noms_parametres.index(spec['parametre'][0]) if 'parametre' in spec else -1
+                            for spec in specs]
+
+        return {
+            'seg_debut': segments[..., 0],
+            'seg_valeur': segments[..., 1],
+            'seg_pente': segments[..., 2],
+            'index_parametre': np.array(index_parametres),
+            'croissance': np.array([spec.get('croissance', 0.0) for spec in specs]),
+            'saut_annee': sauts[..., 0],
+            'saut_increment': sauts[..., 1],
+            'saison_amplitude': np.array([spec.get('saisonnalite', (0.0, 1.0))[0] for spec in specs], dtype=float),
+            'saison_periode': np.array([spec.get('saisonnalite', (0.0, 1.0))[1] for spec in specs], dtype=float),
+            'mult_debut': multiplicateurs[..., 0],
+            'mult_fin': multiplicateurs[..., 1],
+            'mult_facteur': multiplicateurs[..., 2],
+            'plancher': np.array([spec.get('plancher', -np.inf) for spec in specs], dtype=float),
+            'plafond': np.array([spec.get('plafond', np.inf) for spec in specs], dtype=float),
+        }
+
+    def scenario_arrays(self, noms):
+        """Facteurs (scenarios, metriques) et années de début des scénarios demandés"""
+        facteurs = np.ones((len(noms), len(self.metriques)))
+        debuts = np.empty(len(noms))
+        for i, nom in enumerate(noms):
+            scenario = self.scenarios[nom]
+            debuts[i] = scenario.get('debut', ANNEE_PROJECTION)
+            for metrique, facteur in scenario.get('metriques', {}).items():
+                facteurs[i, self.metriques.index(metrique)] = facteur
+        return {'facteur': facteurs, 'debut': debuts}
+
+    def scenario_array(self, nom):
+        """Facteurs (metriques,) et année de début d'un scénario"""
+        tableaux = self.scenario_arrays([nom])
+        return {'facteur': tableaux['facteur'][0], 'debut': tableaux['debut'][0]}
+
+    def config_parameters(self, config):
+        """Vecteur des paramètres du registre pour une configuration"""
+        return np.array([config.get(cle, defaut) for cle, defaut in self.parametres.items()], dtype=float)
+
+    def active_metrics(self, config):
+        """Masque des métriques calculées pour les priorités de la configuration"""
+        priorites = config.get('priorites', [])
+        return np.array([p is None or p in priorites for p in self.priorites])
+
+    def evaluate(self, annees, valeurs_parametres, tableaux=None, scenario=None):
+        """Évalue toutes les métriques : retourne un tableau (..., annees, metriques)
+
+        Les axes en tête de `valeurs_parametres` (..., parametres) et du scénario
+        (`scenario_arrays`, (..., metriques)) sont diffusés ensemble.
+        """
+        tab = self.tableaux if tableaux is None else tableaux
+        y = np.asarray(annees, dtype=float)[:, None]
+        t = y - ANNEE_REFERENCE
+
+        def axe(nom, i=None):
+            valeurs = tab[nom] if i is None else tab[nom][..., i]
+            return valeurs[..., None, :]
+
+        # Tendance par morceaux : le dernier segment commencé l'emporte
+        debut = axe('seg_debut', 0)
+        serie = axe('seg_valeur', 0) + axe('seg_pente', 0) * (y - debut)
+        for i in range(1, tab['seg_debut'].shape[-1]):
+            debut = axe('seg_debut', i)
+            serie = np.where(y >= debut, axe('seg_valeur', i) + axe('seg_pente', i) * (y - debut), serie)
+
+        # Paramètre de configuration (0 pour les métriques sans paramètre)
+        valeurs_parametres = np.asarray(valeurs_parametres, dtype=float)
+        valeurs_parametres = np.concatenate(
+            [valeurs_parametres, np.zeros(valeurs_parametres.shape[:-1] + (1,))], axis=-1)
+        p = np.take(valeurs_parametres, tab['index_parametre'], axis=-1)[..., None, :]
+        serie = serie + p * (1 + axe('croissance') * t)
+
+        for i in range(tab['saut_annee'].shape[-1]):
+            serie = serie + np.where(y >= axe('saut_annee', i), axe('saut_increment', i), 0.0)
+
+        serie = serie + axe('saison_amplitude') * np.sin(2 * np.pi * t / axe('saison_periode'))
+
+        # Multiplicateurs : le premier intervalle correspondant l'emporte
+        facteur = np.ones_like(serie)
+        for i in reversed(range(tab['mult_debut'].shape[-1])):
+            dans_intervalle = (y >= axe('mult_debut', i)) & (y <= axe('mult_fin', i))
+            facteur = np.where(dans_intervalle, axe('mult_facteur', i), facteur)
+        serie = serie * facteur
+
+        if scenario is not None:
+            debut = np.asarray(scenario['debut'], dtype=float)[..., None, None]
+            serie = np.where(y >= debut, serie * np.asarray(scenario['facteur'])[..., None, :], serie)
+
+        return np.minimum(np.maximum(serie, axe('plancher')), axe('plafond'))
+
+    def build_frame(self, annees, valeurs, config, compact=False):
+        """DataFrame des métriques actives à partir d'une évaluation (annees, metriques)
+        
+        En mode compact, les années sont en int16 (int32 au-delà de 32767) et les
+        métriques en float32 (int32 si entières) ; les colonnes sont des vues sans
+        copie de `valeurs` s'il est déjà en float32.
+        """
+        annees = compact_years(annees) if compact else np.asarray(annees)
+        entier = np.int32 if compact else np.int64
+        data = {'Annee': annees}
+        for k in np.flatnonzero(self.active_metrics(config)):
+            colonne = valeurs[:, k]
+            if self.entiers[k]:
+                colonne = np.rint(colonne).astype(entier)
+            elif compact:
+                colonne = colonne.astype(np.float32, copy=False)
+            data[self.metriques[k]] = colonne
+        # Index par année : une ligne se lit par df.loc[annee], sans parcours de colonne
+        return pd.DataFrame(data, index=pd.Index(annees), copy=False)
+
+    def metric_arrays(self, k):
+        """Tableaux compilés réduits à la métrique k (dernier axe de taille 1)
+
+        Les colonnes de complément du registre sont retirées : autant de passes en moins.
+        """
+        tab = {nom: valeurs[k:k + 1] for nom, valeurs in self.tableaux.items()}
+        spec = self.modeles[self.metriques[k]]
+        for noms, n in ((('seg_debut', 'seg_valeur', 'seg_pente'), len(spec.get('segments', [])) or 1),
+                        (('saut_annee', 'saut_increment'), len(spec.get('sauts', []))),
+                        (('mult_debut', 'mult_fin', 'mult_facteur'), len(spec.get('multiplicateurs', [])))):
+            for nom in noms:
+                tab[nom] = tab[nom][..., :n]
+        return tab
+
+    def perturb_metric(self, k, valeurs_parametres, tirages, graine, incertitudes=INCERTITUDES):
+        """Tableaux et paramètres d'une métrique perturbés, avec l'axe des tirages en tête
+
+        Le générateur dépend de (graine, k) : les tirages d'une métrique sont les
+        mêmes quel que soit le découpage en blocs d'années ou en processus.
+        """
+        rng = np.random.default_rng([graine, k])
+        tab = self.metric_arrays(k)
+
+        def log_normal(ecart, forme):
+            return rng.lognormal(-ecart ** 2 / 2, ecart, forme)
+
+        parametres = np.asarray(valeurs_parametres, dtype=float) * log_normal(incertitudes['parametre'], (tirages, 1))
+        tab['croissance'] = tab['croissance'] * log_normal(incertitudes['croissance'], (tirages, 1))
+
+        # Calendrier décalé d'un nombre entier d'années ; le premier segment ancre la tendance
+        decalage = np.rint(rng.normal(0.0, incertitudes['ruptures'], (tirages, 1, 1)))
+        ruptures = tab['seg_debut'] != tab['seg_debut'][..., :1]
+        tab['seg_debut'] = tab['seg_debut'] + decalage * ruptures
+        for nom in ('saut_annee', 'mult_debut', 'mult_fin'):
+            tab[nom] = tab[nom] + decalage
+
+        bornes = 1 + rng.normal(0.0, incertitudes['bornes'], (tirages, 1))
+        tab['plancher'] = tab['plancher'] * bornes
+        tab['plafond'] = tab['plafond'] * bornes
+        return tab, parametres
+
+    def draw_quantiles(self, k, annees, config, tirages, graine, scenario=None, percentiles=PERCENTILES_BANDES):
+        """Percentiles (percentiles, annees) des trajectoires tirées d'une métrique
+
+        Les tirages sont évalués par blocs d'années pour borner la mémoire.
+        """
+        tab, parametres = self.perturb_metric(k, self.config_parameters(config), tirages, graine)
+        if scenario is not None:
+            scenario = {'facteur': scenario['facteur'][k:k + 1], 'debut': scenario['debut']}
+        annees = np.asarray(annees)
+        bloc = max(1, OCTETS_BLOC_TIRAGES // (8 * tirages))
+        resultats = []
+        for debut in range(0, len(annees), bloc):
+            valeurs = self.evaluate(annees[debut:debut + bloc], parametres, tab, scenario)[..., 0]
+            # Tirages contigus par année : la sélection des percentiles est plus rapide
+            resultats.append(np.percentile(np.ascontiguousarray(valeurs.T), percentiles, axis=1))
+        return np.concatenate(resultats, axis=1)
+
+    def metric_levers(self, metrique):
+        """Leviers du balayage de sensibilité qui agissent sur une métrique"""
+        spec = self.modeles[metrique]
+        leviers = []
+        for nom, levier in LEVIERS_SENSIBILITE.items():
+            if 'parametre' in levier:
+                agit = 'parametre' in spec and spec['parametre'][0] == levier['parametre']
+            else:
+                agit = levier['tableau'][1] == metrique
+            if agit:
+                leviers.append(nom)
+        return leviers
+
+    def lever_base(self, nom, config):
+        """Valeur de référence d'un levier pour une configuration"""
+        levier = LEVIERS_SENSIBILITE[nom]
+        if 'parametre' in levier:
+            return float(config.get(levier['parametre'], self.parametres[levier['parametre']]))
+        tableau, metrique, colonne = levier['tableau']
+        valeur = self.tableaux[tableau][self.metriques.index(metrique)]
+        return float(valeur if colonne is None else valeur[colonne])
+
+    def sweep(self, metrique, annee, config, grilles, scenario=None):
+        """Valeur d'une métrique en `annee` sur le produit des grilles {levier: valeurs}
+
+        Chaque levier occupe son propre axe et l'évaluation diffuse les axes entre
+        eux : le résultat (n1, ..., nd) est calculé sans boucle sur les combinaisons.
+        """
+        k = self.metriques.index(metrique)
+        tab = self.metric_arrays(k)
+        parametres = self.config_parameters(config)
+        for axe, (nom, valeurs) in enumerate(grilles.items()):
+            forme = [1] * len(grilles)
+            forme[axe] = len(valeurs)
+            valeurs = np.asarray(valeurs, dtype=float).reshape(forme + [1])
+            levier = LEVIERS_SENSIBILITE[nom]
+            if 'parametre' in levier:
+                masque = np.arange(len(parametres)) == self.noms_parametres.index(levier['parametre'])
+                parametres = np.where(masque, valeurs, parametres)
+            else:
+                tableau, _, colonne = levier['tableau']
+                if colonne is None:
+                    tab[tableau] = valeurs
+                else:
+                    masque = np.arange(tab[tableau].shape[-1]) == colonne
+                    tab[tableau] = np.where(masque, valeurs[..., None], tab[tableau])
+        if scenario is not None:
+            scenario = {'facteur': scenario['facteur'][k:k + 1], 'debut': scenario['debut']}
+        valeurs = self.evaluate(np.array([annee]), parametres, tab, scenario)[..., 0, 0]
+        return np.broadcast_to(valeurs, tuple(len(grille) for grille in grilles.values()))
+
+@functools.lru_cache(maxsize=1)
+def process_engine():
+    """Moteur des processus du pool, construit une fois par processus"""
+    return MoteurSimulation(MODELES_METRIQUES, SCENARIOS)
+
+def compute_metric_bands(indices, annees, config, tirages, graine, scenario):
+    """Tâche du pool de processus : percentiles d'un groupe de métriques"""
+    moteur = process_engine()
+    tableaux = moteur.scenario_array(scenario)
+    return [moteur.draw_quantiles(k, annees, config, tirages, graine, tableaux) for k in indices]
+
+class BandesMonteCarlo:
+    """Percentiles des trajectoires Monte Carlo (percentiles × année × métrique)"""
+
+    def __init__(self, annees, metriques, percentiles, valeurs, tirages, duree):
+        self.annees = annees
+        self.metriques = list(metriques)
+        self.percentiles = tuple(percentiles)
+        self.valeurs = valeurs
+        self.tirages = tirages
+        self.duree = duree
+        self.cle = None
+
+    def __contains__(self, metrique):
+        return metrique in self.metriques
+
+    def band(self, metrique, bas, haut):
+        """Bornes (bas, haut) d'une métrique pour deux percentiles conservés, sans copie"""
+        k = self.metriques.index(metrique)
+        return (self.valeurs[self.percentiles.index(bas), :, k],
+                self.valeurs[self.percentiles.index(haut), :, k])
+
+class CatalogueSystemes:
+    """Catalogue typé des systèmes d'armes, stocké en colonnes NumPy
+    
+    Les attributs qualitatifs sont codés en int16 avec un index inversé par
+    modalité ; les attributs numériques ont un index trié interrogé par recherche
+    dichotomique. Une requête retourne des positions triées, intersection des
+    critères, sans parcourir le catalogue.
+    """
+
+    CATEGORIES = {'type': 'Type', 'statut': 'Statut', 'classification': 'Classification',
+                  'nucleaire': 'Nucléaire'}
+    NUMERIQUES = {'portee': ('Portée (km)', np.int32), 'annee_service': ('Année Service', np.int16),
+                  'ogives': ('Ogives', np.int16)}
+
+    def __init__(self, noms, modalites, codes, valeurs, manquants, details):
+        self.noms = freeze(np.asarray(noms, dtype=object))
+        self.positions = MappingProxyType({nom: i for i, nom in enumerate(self.noms)})
+        self.details = tuple(freeze(detail) for detail in details)
+
+        self.modalites, self.codes, self.index = {}, {}, {}
+        for champ in self.CATEGORIES:
+            self.modalites[champ] = tuple(modalites[champ])
+            self.codes[champ] = freeze(np.asarray(codes[champ], dtype=np.int16))
+            self.index[champ] = MappingProxyType({modalite: freeze(np.flatnonzero(self.codes[champ] == code))
+                                                  for code, modalite in enumerate(self.modalites[champ])})
+
+        # Valeurs manquantes exclues des index triés : un intervalle ne les retient jamais
+        self.valeurs, self.manquants, self.tris = {}, {}, {}
+        for champ, (_, dtype) in self.NUMERIQUES.items():
+            self.valeurs[champ] = freeze(np.asarray(valeurs[champ], dtype=dtype))
+            self.manquants[champ] = freeze(np.asarray(manquants[champ], dtype=bool))
+            presents = np.flatnonzero(~self.manquants[champ])
+            ordre = presents[np.argsort(self.valeurs[champ][presents], kind='stable')]
+            self.tris[champ] = (freeze(ordre), freeze(self.valeurs[champ][ordre]))
+
+    @classmethod
+    def from_systems(cls, systemes):
+        """Catalogue encodé à partir de fiches {nom, type, statut, portee, ...}"""
+        modalites, codes, valeurs, manquants = {}, {}, {}, {}
+        for champ in cls.CATEGORIES:
+            brutes = [systeme.get(champ) for systeme in systemes]
+            modalites[champ] = tuple(dict.fromkeys(brutes))
+            codes[champ] = [modalites[champ].index(valeur) for valeur in brutes]
+        for champ in cls.NUMERIQUES:
+            brutes = [systeme.get(champ) for systeme in systemes]
+            manquants[champ] = [valeur is None for valeur in brutes]
+            valeurs[champ] = [0 if valeur is None else valeur for valeur in brutes]
+        return cls([systeme['nom'] for systeme in systemes], modalites, codes, valeurs, manquants,
+                   [systeme.get('details', {}) for systeme in systemes])
+
+    @classmethod
+    def from_columns(cls, colonnes, meta):
+        """Catalogue relu du stockage colonnaire (voir columns)"""
+        return cls(colonnes['noms'], meta['modalites'],
+                   {champ: colonnes[f'code_{champ}'] for champ in cls.CATEGORIES},
+                   {champ: colonnes[f'valeur_{champ}'] for champ in cls.NUMERIQUES},
+                   {champ: colonnes[f'manquant_{champ}'] for champ in cls.NUMERIQUES}, meta['details'])
+
+    def columns(self):
+        """Colonnes NumPy et métadonnées JSON (modalités, détails) pour le stockage colonnaire"""
+        colonnes = {'noms': self.noms.astype(str)}
+        colonnes.update({f'code_{champ}': self.codes[champ] for champ in self.CATEGORIES})
+        colonnes.update({f'valeur_{champ}': self.valeurs[champ] for champ in self.NUMERIQUES})
+        colonnes.update({f'manquant_{champ}': self.manquants[champ] for champ in self.NUMERIQUES})
+        meta = {'modalites': {champ: list(modalites) for champ, modalites in self.modalites.items()},
+                'details': [dict(detail) for detail in self.details]}
+        return colonnes, meta
+
+    def __len__(self):
+        return len(self.noms)
+
+    def query(self, **criteres):
+        """Positions triées des systèmes qui satisfont tous les critères
+        
+        Un critère qualitatif vaut une modalité ou une liste de modalités ; un
+        critère numérique est un intervalle fermé (min, max), None laissant la
+        borne ouverte. Exemple : query(statut='Opérationnel', portee=(5000, None)).
+        """
+        resultat = np.arange(len(self))
+        for champ, critere in criteres.items():
+            if champ in self.index:
+                modalites = critere if isinstance(critere, (list, tuple, set, frozenset)) else [critere]
+                positions = np.sort(np.concatenate([self.index[champ].get(modalite, np.empty(0, dtype=np.intp))
+                                                    for modalite in modalites] or [np.empty(0, dtype=np.intp)]))
+            elif champ in self.tris:
+                bas, haut = critere
+                ordre, tries = self.tris[champ]
+                debut = 0 if bas is None else np.searchsorted(tries, bas, side='left')
+                fin = len(tries) if haut is None else np.searchsorted(tries, haut, side='right')
+                positions = np.sort(ordre[debut:fin])
+            else:
+                raise KeyError(f"Critère inconnu : {champ}")
+            resultat = np.intersect1d(resultat, positions, assume_unique=True)
+        return resultat
+
+    def frame(self, positions=None, colonnes=None):
+        """DataFrame des systèmes aux positions données (tous par défaut)
+        
+        Les catégories suivent l'ordre d'apparition dans la sélection ; un attribut
+        numérique manquant donne une colonne entière nullable.
+        """
+        positions = np.arange(len(self)) if positions is None else np.asarray(positions)
+        data = {'Système': self.noms[positions]}
+        for champ, nom in self.CATEGORIES.items():
+            codes = self.codes[champ][positions]
+            apparition = pd.unique(codes)
+            table = np.full(len(self.modalites[champ]), -1, dtype=np.int16)
+            table[apparition] = np.arange(len(apparition))
+            data[nom] = pd.Categorical.from_codes(table[codes], [self.modalites[champ][c] for c in apparition])
+        for champ, (nom, _) in self.NUMERIQUES.items():
+            valeurs, manquants = self.valeurs[champ][positions], self.manquants[champ][positions]
+            data[nom] = pd.arrays.IntegerArray(valeurs, manquants) if manquants.any() else valeurs
+        df = pd.DataFrame(data)
+        return df if colonnes is None else df[list(colonnes)]
+
+    def records(self, positions):
+        """Fiches des systèmes aux positions données (mêmes libellés que frame), sans DataFrame"""
+        for i in positions:
+            fiche = {'Système': self.noms[i]}
+            fiche.update({nom: self.modalites[champ][self.codes[champ][i]] for champ, nom in self.CATEGORIES.items()})
+            fiche.update({nom: None if self.manquants[champ][i] else int(self.valeurs[champ][i])
+                          for champ, (nom, _) in self.NUMERIQUES.items()})
+            yield fiche
+
+class SyntheseIndicateurs:
+    """Indicateurs clés d'une combinaison : référence, dernière valeur, écart et croissance
+    
+    Les résumés couvrent toutes les métriques du moteur ; `disponible` indique
+    celles que la sélection calcule, les autres valent NaN. Calculé une fois par
+    combinaison, il sert aux cartes du tableau de bord comme aux exports.
+    """
+
+    def __init__(self, df, metriques, annee_reference=ANNEE_REFERENCE):
+        # Référence : annee_reference, ou début de l'horizon s'il ne la contient pas
+        position = df.index.searchsorted(annee_reference)
+        self.annee_reference = df.index[position if position < len(df) else 0]
+        self.annee_finale = df.index[-1]
+        lignes = df.loc[[self.annee_reference, self.annee_finale]].reindex(columns=metriques).to_numpy(float)
+        self.metriques = list(metriques)
+        self.disponible = pd.Series([metrique in df.columns for metrique in metriques], index=metriques)
+        self.reference = pd.Series(lignes[0], index=metriques)
+        self.actuel = pd.Series(lignes[1], index=metriques)
+        self.ecart = self.actuel - self.reference
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.croissance = self.ecart / self.reference * 100
+        self.cle = None
+
+    def __contains__(self, metrique):
+        return bool(self.disponible.get(metrique, False))
+
+    def frame(self):
+        """Tableau des indicateurs des métriques disponibles (une ligne par métrique)"""
+        return pd.DataFrame({
+            f"{self.annee_reference:g}": self.reference,
+            f"{self.annee_finale:g}": self.actuel,
+            'Écart': self.ecart,
+            'Croissance (%)': self.croissance,
+        })[self.disponible]
+
+class BalayageSensibilite:
+    """Valeurs d'une métrique cible sur la grille produit des leviers (un axe par levier)
+
+    Les grilles ont un nombre impair de points centrés sur la valeur de référence :
+    l'indice central de chaque axe correspond au modèle non modifié.
+    """
+
+    def __init__(self, metrique, annee, grilles, valeurs, duree):
+        self.metrique = metrique
+        self.annee = annee
+        self.grilles = grilles
+        self.leviers = list(grilles)
+        self.valeurs = valeurs
+        self.duree = duree
+        self.centre = tuple(len(grille) // 2 for grille in grilles.values())
+        self.valeur_base = float(valeurs[self.centre])
+        # Distribution sur toutes les combinaisons, calculée une fois avec le balayage
+        self.resume = dict(zip(['min', 'p5', 'mediane', 'p95', 'max'],
+                               np.percentile(valeurs, [0, 5, 50, 95, 100]).tolist()))
+        self.cle = None
+
+    def tornado(self):
+        """Valeurs aux bornes de chaque levier, les autres à leur référence, par amplitude décroissante"""
+        lignes = []
+        for axe, nom in enumerate(self.leviers):
+            index = list(self.centre)
+            index[axe] = slice(None)
+            profil = self.valeurs[tuple(index)]
+            lignes.append({'Levier': nom, 'Bas': float(profil[0]), 'Haut': float(profil[-1])})
+        tornado = pd.DataFrame(lignes, columns=['Levier', 'Bas', 'Haut'])
+        return tornado.reindex((tornado['Haut'] - tornado['Bas']).abs().sort_values().index)
+
+    def heatmap(self, levier_x, levier_y, agregation='base'):
+        """Coupe 2-D (levier_y, levier_x) ; les autres leviers à leur référence ou agrégés"""
+        axe_x, axe_y = self.leviers.index(levier_x), self.leviers.index(levier_y)
+        autres = tuple(axe for axe in range(len(self.leviers)) if axe not in (axe_x, axe_y))
+        if agregation == 'base':
+            index = tuple(slice(None) if axe in (axe_x, axe_y) else centre
+                          for axe, centre in enumerate(self.centre))
+            coupe = self.valeurs[index]
+        else:
+            coupe = getattr(np, agregation)(self.valeurs, axis=autres)
+        # Les axes restants sont dans l'ordre croissant : (y, x) attendu par Plotly
+        return coupe if axe_y < axe_x else coupe.T
+
+class CubeScenarios:
+    """Cube (selection × scénario × année × métrique) évalué en une seule passe diffusée"""
+
+    def __init__(self, moteur, configs, scenarios, annees, compact=False, valeurs=None, actifs=None):
+        self.moteur = moteur
+        self.compact = compact
+        self.configs = dict(configs)
+        self.selections = list(self.configs)
+        self.scenarios = list(scenarios)
+        self.annees = np.asarray(annees)
+        self.index_selections = {nom: i for i, nom in enumerate(self.selections)}
+        self.index_scenarios = {nom: i for i, nom in enumerate(self.scenarios)}
+
+        # Valeurs fournies : cube relu du stockage colonnaire, déjà compacté s'il y a lieu
+        if valeurs is None:
+            parametres = np.stack([moteur.config_parameters(c) for c in self.configs.values()])
+            valeurs = moteur.evaluate(self.annees, parametres[:, None, :],
+                                      scenario=moteur.scenario_arrays(self.scenarios))
+            actifs = np.stack([moteur.active_metrics(c) for c in self.configs.values()])
+            if compact:
+                self.annees = compact_years(self.annees)
+                # Métriques entières arrondies avant réduction, comme dans build_frame
+                valeurs = np.where(moteur.entiers, np.rint(valeurs), valeurs).astype(np.float32)
+        # Cube partagé par les sessions en lecture seule : les frames en sont des vues
+        self.annees = freeze(self.annees)
+        self.valeurs = freeze(valeurs)
+        self.actifs = freeze(np.asarray(actifs))
+
+    def __contains__(self, cle):
+        selection, scenario = cle
+        return selection in self.index_selections and scenario in self.index_scenarios
+
+    def slice(self, selection, scenario):
+        """Tableau (annees, metriques) d'une combinaison, sans copie"""
+        return self.valeurs[self.index_selections[selection], self.index_scenarios[scenario]]
+
+    def frame(self, selection, scenario):
+        """DataFrame des métriques actives d'une combinaison"""
+        return self.moteur.build_frame(self.annees, self.slice(selection, scenario), self.configs[selection],
+                                       self.compact)
+
+    def batch(self, selections, scenario):
+        """Tableau (selections, annees, metriques) et masque des métriques actives, en une indexation"""
+        index = [self.index_selections[selection] for selection in selections]
+        return self.valeurs[index, self.index_scenarios[scenario]], self.actifs[index]
+
+class CacheLRU:
+    """Cache LRU borné en nombre d'entrées et en octets, sûr entre threads
+
+    Les compteurs (hits, misses, evictions) mesurent l'efficacité du cache
+    partagé par toutes les sessions. Une clé absente n'est calculée qu'une fois :
+    les sessions qui la demandent pendant le calcul en attendent le résultat.
+    """
+
+    def __init__(self, max_entrees=256, max_octets=None, taille=None):
+        self.max_entrees = max_entrees
+        self.max_octets = max_octets
+        self.taille = taille or (lambda valeur: 0)
+        self.entrees = OrderedDict()
+        self.octets = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.verrou = threading.Lock()
+        self.en_cours = {}
+
+    def get(self, cle, defaut=None):
+        with self.verrou:
+            if cle in self.entrees:
+                self.entrees.move_to_end(cle)
+                self.hits += 1
+                return self.entrees[cle][0]
+            self.misses += 1
+            return defaut
+
+    def put(self, cle, valeur):
+        taille = self.taille(valeur)
+        with self.verrou:
+            if cle in self.entrees:
+                self.octets -= self.entrees.pop(cle)[1]
+            self.entrees[cle] = (valeur, taille)
+            self.octets += taille
+            # Éviction des entrées les moins récemment utilisées (la dernière est conservée)
+            while len(self.entrees) > 1 and (
+                    len(self.entrees) > self.max_entrees
+                    or (self.max_octets is not None and self.octets > self.max_octets)):
+                _, (_, taille_evincee) = self.entrees.popitem(last=False)
+                self.octets -= taille_evincee
+                self.evictions += 1
+
+    def get_or_compute(self, cle, calcul):
+        """Valeur en cache, ou calculée hors verrou puis mémorisée"""
+        return self.lookup(cle, calcul)[0]
+
+    def lookup(self, cle, calcul):
+        """Comme get_or_compute, avec un indicateur de hit : (valeur, hit)"""
+        manquant = object()
+        valeur = self.get(cle, manquant)
+        if valeur is not manquant:
+            return valeur, True
+        with self.verrou:
+            verrou_cle = self.en_cours.setdefault(cle, threading.Lock())
+        with verrou_cle:
+            with self.verrou:
+                if cle in self.entrees:
+                    # Calculée par une autre session pendant l'attente
+                    self.entrees.move_to_end(cle)
+                    self.misses -= 1
+                    self.hits += 1
+                    return self.entrees[cle][0], True
+            try:
+                valeur = calcul()
+                self.put(cle, valeur)
+            finally:
+                with self.verrou:
+                    self.en_cours.pop(cle, None)
+        return valeur, False
+
+    def values(self):
+        """Copie des valeurs en cache, de la moins à la plus récemment utilisée"""
+        with self.verrou:
+            return [valeur for valeur, _ in self.entrees.values()]
+
+    def clear(self):
+        with self.verrou:
+            self.entrees.clear()
+            self.octets = 0
+
+    def stats(self):
+        with self.verrou:
+            requetes = self.hits + self.misses
+            return {
+                'entrees': len(self.entrees),
+                'octets': self.octets,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'taux_hit': self.hits / requetes if requetes else 0.0,
+            }
+
+class StockageColonnes:
+    """Stockage colonnaire sur disque : un fichier .npy par colonne et un manifeste JSON
+    
+    Une entrée (espace, clé) est écrite dans un répertoire temporaire puis
+    renommée : un lecteur ne voit jamais d'entrée partielle, et de deux processus
+    qui l'écrivent ensemble, le premier l'emporte. Les colonnes sont relues par
+    memory map en lecture seule : les processus du serveur partagent les pages
+    du cache du système au lieu d'en garder chacun une copie. Sans racine, le
+    stockage est désactivé et les calculs sont servis tels quels.
+    
+    Les entrées sont rangées par génération (version du code et du modèle) : une
+    entrée d'une autre génération n'est jamais relue. Au-delà de max_octets, les
+    entrées les moins récemment lues sont supprimées, générations périmées d'abord.
+    """
+
+    def __init__(self, racine=REPERTOIRE_STOCKAGE, generation=VERSION_CODE, max_octets=TAILLE_MAX_STOCKAGE):
+        self.racine = racine or None
+        self.generation = generation
+        self.max_octets = max_octets
+        # Octets sur disque estimés par ce processus ; recalculés à chaque éviction
+        self.octets = None
+        self.verrou = threading.Lock()
+
+    def path(self, espace, cle):
+        empreinte = hashlib.sha1(repr(cle).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.racine, self.generation, espace, empreinte)
+
+    def save(self, espace, cle, colonnes, meta=None):
+        """Écrit les colonnes {nom: tableau} d'une entrée ; False si le disque la refuse"""
+        if self.racine is None:
+            return False
+        chemin = self.path(espace, cle)
+        if os.path.isdir(chemin):
+            return True
+        temporaire = f"{chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(temporaire)
+            manifeste = {'cle': repr(cle), 'meta': meta or {}, 'colonnes': {}}
+            for i, (nom, tableau) in enumerate(colonnes.items()):
+                tableau = np.ascontiguousarray(tableau)
+                fichier = f"{i}.npy"
+                np.save(os.path.join(temporaire, fichier), tableau, allow_pickle=False)
+                manifeste['colonnes'][nom] = {'fichier': fichier, 'forme': list(tableau.shape)}
+            with open(os.path.join(temporaire, 'manifeste.json'), 'w', encoding='utf-8') as fichier:
+                json.dump(manifeste, fichier, ensure_ascii=False)
+            taille = self.entry_size(temporaire)
+            os.rename(temporaire, chemin)
+        except (OSError, ValueError):
+            # Disque plein ou en lecture seule, ou entrée écrite entre-temps par un autre processus
+            shutil.rmtree(temporaire, ignore_errors=True)
+            return os.path.isdir(chemin)
+        self.track(taille)
+        return True
+
+    def load(self, espace, cle):
+        """(colonnes memory-mappées, métadonnées) d'une entrée, ou None si absente ou illisible"""
+        if self.racine is None:
+            return None
+        chemin = self.path(espace, cle)
+        try:
+            with open(os.path.join(chemin, 'manifeste.json'), encoding='utf-8') as fichier:
+                manifeste = json.load(fichier)
+            if manifeste['cle'] != repr(cle):
+                return None
+            colonnes = {}
+            for nom, spec in manifeste['colonnes'].items():
+                # Un tableau vide ne se projette pas en mémoire ; vue ndarray simple sur la projection
+                mode = 'r' if all(spec['forme']) else None
+                tableau = np.load(os.path.join(chemin, spec['fichier']), mmap_mode=mode, allow_pickle=False)
+                colonnes[nom] = freeze(tableau.view(np.ndarray))
+            # Date de dernière lecture, ordre de l'éviction LRU
+            os.utime(chemin)
+        except (OSError, ValueError, KeyError):
+            # Entrée absente, illisible ou supprimée par l'éviction d'un autre processus
+            return None
+        return colonnes, manifeste['meta']
+
+    def load_or_save(self, espace, cle, calcul):
+        """Entrée relue du stockage, ou calculée par `calcul` → (colonnes, meta), écrite puis relue"""
+        stocke = self.load(espace, cle)
+        if stocke is None:
+            colonnes, meta = calcul()
+            if self.save(espace, cle, colonnes, meta):
+                stocke = self.load(espace, cle)
+            if stocke is None:
+                return colonnes, meta
+        return stocke
+
+    @staticmethod
+    def entry_size(chemin):
+        return sum(os.path.getsize(os.path.join(chemin, fichier)) for fichier in os.listdir(chemin))
+
+    def entries(self):
+        """Entrées sur disque, toutes générations : (génération, espace, chemin, octets, dernière lecture)"""
+        if self.racine is None or not os.path.isdir(self.racine):
+            return
+        for generation in sorted(os.listdir(self.racine)):
+            racine_generation = os.path.join(self.racine, generation)
+            for espace in sorted(os.listdir(racine_generation)) if os.path.isdir(racine_generation) else []:
+                racine_espace = os.path.join(racine_generation, espace)
+                for nom in os.listdir(racine_espace):
+                    chemin = os.path.join(racine_espace, nom)
+                    if nom.endswith('.tmp'):
+                        continue
+                    try:
+                        yield generation, espace, chemin, self.entry_size(chemin), os.stat(chemin).st_mtime
+                    except OSError:
+                        # Supprimée entre-temps par un autre processus
+                        continue
+
+    def track(self, taille):
+        """Compte une entrée écrite ; évince quand l'estimation dépasse max_octets"""
+        with self.verrou:
+            if self.octets is not None:
+                self.octets += taille
+            depasse = self.octets is None or self.octets > self.max_octets
+        if depasse:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment lues au-delà de max_octets, générations périmées d'abord
+        
+        Sûr entre processus : une entrée supprimée pendant sa lecture est simplement
+        recalculée, et les colonnes déjà projetées restent valides après suppression.
+        """
+        with self.verrou:
+            entrees = sorted(self.entries(), key=lambda entree: (entree[0] == self.generation, entree[4]))
+            total = sum(entree[3] for entree in entrees)
+            for _, _, chemin, octets, _ in entrees:
+                if total <= self.max_octets:
+                    break
+                shutil.rmtree(chemin, ignore_errors=True)
+                total -= octets
+            self.octets = total
+        return total
+
+    def clear(self):
+        """Supprime toutes les entrées du stockage"""
+        if self.racine is not None:
+            shutil.rmtree(self.racine, ignore_errors=True)
+        self.octets = None
+
+    def stats(self):
+        """Entrées et octets sur disque par espace de la génération courante, et des générations périmées"""
+        resultat = {}
+        for generation, espace, _, octets, _ in self.entries():
+            nom = espace if generation == self.generation else 'périmées'
+            stats = resultat.setdefault(nom, {'entrees': 0, 'octets': 0})
+            stats['entrees'] += 1
+            stats['octets'] += octets
+        return resultat
+
+class RapportImprimable:
+    """Rapport rendu : octets du PDF (ou de l'archive ZIP des pages PNG), nombre de pages et durée"""
+
+    def __init__(self, octets, format_, pages, duree):
+        self.octets = octets
+        self.format = format_
+        self.pages = pages
+        self.duree = duree
+
+    @property
+    def mime(self):
+        return 'application/pdf' if self.format == 'pdf' else 'application/zip'
+
+    @property
+    def extension(self):
+        return 'pdf' if self.format == 'pdf' else 'zip'
+
+class TravauxRapports:
+    """Rapports rendus en arrière-plan, suivis par toutes les sessions du processus
+    
+    Chaque rapport est orchestré par un thread qui attend ses pages, rendues dans
+    le pool de processus : la session qui le demande n'est jamais bloquée, et un
+    rapport déjà lancé par une autre session n'est pas relancé. Un rapport en
+    échec est relancé à la demande suivante.
+    """
+
+    def __init__(self, max_travaux=2):
+        self.executeur = ThreadPoolExecutor(max_travaux, thread_name_prefix='rapports')
+        self.futurs = {}
+        self.progression = {}
+        self.verrou = threading.Lock()
+
+    def submit(self, cle, tache):
+        """Lance tache(progression) une fois par clé ; progression(faites, total) suit le rendu"""
+        with self.verrou:
+            futur = self.futurs.get(cle)
+            if futur is None or (futur.done() and futur.exception() is not None):
+                self.progression[cle] = (0, 0)
+                futur = self.futurs[cle] = self.executeur.submit(tache, functools.partial(self.advance, cle))
+        return futur
+
+    def advance(self, cle, faites, total):
+        self.progression[cle] = (faites, total)
+
+    def status(self, cle):
+        """État d'un rapport : connu, terminé, étapes faites sur le total, erreur éventuelle"""
+        futur = self.futurs.get(cle)
+        faites, total = self.progression.get(cle, (0, 0))
+        termine = futur is not None and futur.done()
+        return {
+            'connu': futur is not None,
+            'termine': termine,
+            'faites': faites,
+            'total': total,
+            'erreur': repr(futur.exception()) if termine and futur.exception() is not None else None,
+        }
+
+class PrechauffageCaches:
+    """Préchauffage des caches partagés par un thread d'arrière-plan
+    
+    Les tâches (nom, fonction) s'exécutent dans l'ordre et passent par les caches
+    single-flight : une session qui demande une combinaison en cours de calcul
+    attend ce même calcul, et une combinaison pas encore atteinte est calculée à
+    la demande. Une tâche en échec est notée et laissée au calcul à la demande.
+    """
+
+    def __init__(self, taches):
+        self.taches = list(taches)
+        self.faites = 0
+        self.en_cours = None
+        self.erreurs = []
+        self.debut = self.fin = None
+        self.thread = None
+        self.verrou = threading.Lock()
+
+    def start(self):
+        """Lance le thread une seule fois par processus ; vrai s'il vient d'être lancé"""
+        with self.verrou:
+            if self.thread is not None:
+                return False
+            self.debut = time.perf_counter()
+            self.thread = threading.Thread(target=self.run, name='prechauffage', daemon=True)
+            self.thread.start()
+        return True
+
+    def run(self):
+        for nom, tache in self.taches:
+            self.en_cours = nom
+            try:
+                tache()
+            except Exception as erreur:
+                self.erreurs.append((nom, repr(erreur)))
+            self.faites += 1
+        self.en_cours = None
+        self.fin = time.perf_counter()
+
+    def status(self):
+        """Progression : lancé, terminé, tâches faites, tâche en cours, durée et erreurs"""
+        total = len(self.taches)
+        return {
+            'lance': self.thread is not None,
+            'termine': self.fin is not None,
+            'faites': self.faites,
+            'total': total,
+            'progression': self.faites / total if total else 1.0,
+            'en_cours': self.en_cours,
+            'duree': None if self.debut is None else (self.fin or time.perf_counter()) - self.debut,
+            'erreurs': list(self.erreurs),
+        }
+
+class TraceurPerformance:
+    """Spans de temps d'un rerun (mur, CPU du thread, détails), exportables en Chrome trace"""
+
+    def __init__(self, max_spans=10000):
+        self.spans = deque(maxlen=max_spans)
+        self.origine = time.perf_counter()
+        # Profondeur d'imbrication propre à chaque thread : le traceur hors session est
+        # partagé par le préchauffage, les benchmarks et les travaux en arrière-plan
+        self.local = threading.local()
+
+    @contextmanager
+    def span(self, nom, categorie, **details):
+        """Mesure le bloc ; les détails (octets, cache...) peuvent être complétés dans le bloc"""
+        debut, debut_cpu = time.perf_counter(), time.thread_time()
+        profondeur = getattr(self.local, 'profondeur', 0)
+        self.local.profondeur = profondeur + 1
+        try:
+            yield details
+        finally:
+            self.local.profondeur = profondeur
+            self.spans.append({
+                'nom': nom,
+                'categorie': categorie,
+                'debut_ms': (debut - self.origine) * 1000,
+                'mur_ms': (time.perf_counter() - debut) * 1000,
+                'cpu_ms': (time.thread_time() - debut_cpu) * 1000,
+                'profondeur': profondeur,
+                'thread': threading.get_ident(),
+                'details': details,
+            })
+
+    def frame(self):
+        """Spans sous forme de DataFrame, dans l'ordre de début"""
+        lignes = [{
+            'Span': '  ' * span['profondeur'] + span['nom'],
+            'Catégorie': span['categorie'],
+            'Mur (ms)': span['mur_ms'],
+            'CPU (ms)': span['cpu_ms'],
+            'Octets': span['details'].get('octets'),
+            'Cache': span['details'].get('cache'),
+            'Rendu': span['details'].get('rendu'),
+            'Points': span['details'].get('points'),
+        } for span in sorted(self.spans, key=lambda span: span['debut_ms'])]
+        return pd.DataFrame(lignes, columns=['Span', 'Catégorie', 'Mur (ms)', 'CPU (ms)', 'Octets', 'Cache',
+                                             'Rendu', 'Points'])
+
+    def chrome_trace(self):
+        """Export au format Chrome trace (chrome://tracing, Perfetto)"""
+        return json.dumps({'traceEvents': [{
+            'name': span['nom'],
+            'cat': span['categorie'],
+            'ph': 'X',
+            'ts': span['debut_ms'] * 1000,
+            'dur': span['mur_ms'] * 1000,
+            'pid': os.getpid(),
+            'tid': span['thread'],
+            'args': dict(span['details'], cpu_ms=span['cpu_ms']),
+        } for span in self.spans]}, default=str)
+
+# Traceur utilisé hors session Streamlit (scripts, benchmarks)
+TRACEUR_HORS_SESSION = TraceurPerformance()
+
+def current_tracer():
+    """Traceur du rerun de la session courante, ou traceur du processus hors session"""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return TRACEUR_HORS_SESSION
+    if 'traceur' not in st.session_state:
+        st.session_state['traceur'] = TraceurPerformance()
+    return st.session_state['traceur']
+
+def frame_size(resultat):
+    """Taille mémoire d'un résultat (DataFrame, config) de generate_advanced_data"""
+    return int(resultat[0].memory_usage(deep=True).sum())
+
+def frame_memory(df):
+    """Empreinte d'un DataFrame généré : octets, part partagée avec le cube et équivalent float64
+    
+    Les colonnes flottantes et l'axe temporel d'une frame issue du cube ou du
+    stockage sont des vues du cube partagé ou des fichiers projetés en mémoire ;
+    seules les colonnes entières arrondies lui sont propres.
+    """
+    octets = df.memory_usage(deep=True)
+    partages = 0
+    if df.attrs.get('source') in ('cube', 'stockage'):
+        partages = int(octets['Index']) + sum(int(octets[colonne]) for colonne in df.columns
+                                              if df[colonne].dtype.kind == 'f' or colonne == 'Annee')
+    return {
+        'lignes': len(df),
+        'octets': int(octets.sum()),
+        'partages': partages,
+        'float64': (df.shape[1] + 1) * len(df) * 8,
+    }
+
+def object_size(valeur, vus=None):
+    """Taille approchée d'un objet : tableaux, DataFrames, conteneurs et attributs parcourus une fois"""
+    vus = set() if vus is None else vus
+    if id(valeur) in vus:
+        return 0
+    vus.add(id(valeur))
+    if isinstance(valeur, pd.DataFrame):
+        return int(valeur.memory_usage(deep=True).sum())
+    if isinstance(valeur, np.ndarray):
+        return valeur.nbytes
+    taille = sys.getsizeof(valeur)
+    if isinstance(valeur, dict):
+        taille += sum(object_size(cle, vus) + object_size(element, vus) for cle, element in valeur.items())
+    elif isinstance(valeur, (list, tuple, set, frozenset, deque)):
+        taille += sum(object_size(element, vus) for element in valeur)
+    elif hasattr(valeur, '__dict__') and not isinstance(valeur, type):
+        taille += object_size(vars(valeur), vus)
+    return taille
+
+@st.cache_resource(show_spinner=False)
+def get_data_cache(max_entrees=512, max_octets=64 * 1024 ** 2):
+    """Cache des données générées, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees, max_octets, taille=frame_size)
+
+def serialize_figure(fig):
+    """JSON d'une figure Plotly (None si la figure n'a pas de données à afficher)"""
+    return None if fig is None else pio.to_json(fig, validate=False)
+
+def select_render_mode(fig, seuil=SEUIL_WEBGL):
+    """Passe les courbes en WebGL (Scattergl) au-delà du seuil : (figure, infos de rendu)
+
+    Couleurs, hovertemplates et axes sont repris tels quels ; les traces empilées
+    (stackgroup, non pris en charge par Scattergl) restent en SVG.
+    """
+    if fig is None:
+        return None, None
+    courbes = [trace for trace in fig.data if trace.type == 'scatter']
+    points = sum(0 if trace.x is None else len(trace.x) for trace in courbes)
+    infos = {'rendu': 'svg', 'points': points, 'seuil': seuil}
+    convertibles = [trace.stackgroup is None for trace in courbes]
+    if points > seuil and any(convertibles):
+        traces = []
+        for trace in fig.data:
+            if trace.type == 'scatter' and trace.stackgroup is None:
+                proprietes = trace.to_plotly_json()
+                proprietes.pop('type')
+                trace = go.Scattergl(proprietes)
+            traces.append(trace)
+        fig = go.Figure(data=traces, layout=fig.layout)
+        infos['rendu'] = 'webgl' if all(convertibles) else 'mixte'
+    return fig, infos
+
+def render_figure(fig):
+    """Mode de rendu choisi puis sérialisation : (spec JSON, infos de rendu)"""
+    fig, infos = select_render_mode(fig)
+    return serialize_figure(fig), infos
+
+@st.cache_resource(show_spinner=False)
+def get_store(racine=None):
+    """Stockage colonnaire sur disque, partagé par les processus du serveur (REPERTOIRE_STOCKAGE par défaut)
+    
+    La génération suit la version du code et celle du modèle : une modification
+    de l'un ou de l'autre périme toutes les entrées.
+    """
+    return StockageColonnes(REPERTOIRE_STOCKAGE if racine is None else racine, f"{VERSION_CODE}-{model_version()}")
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache(max_entrees=1024, max_octets=128 * 1024 ** 2):
+    """Cache des figures sérialisées, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees, max_octets, taille=lambda rendu: len(rendu[0]) if rendu[0] else 0)
+
+@st.cache_resource(show_spinner=False)
+def get_band_cache(max_entrees=64, max_octets=32 * 1024 ** 2):
+    """Cache des bandes Monte Carlo, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees, max_octets, taille=lambda bandes: bandes.valeurs.nbytes)
+
+@st.cache_resource(show_spinner=False)
+def get_kpi_cache(max_entrees=512):
+    """Cache des synthèses d'indicateurs, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees)
+
+@st.cache_resource(show_spinner=False)
+def get_sweep_cache(max_entrees=32, max_octets=128 * 1024 ** 2):
+    """Cache des balayages de sensibilité, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees, max_octets, taille=lambda balayage: balayage.valeurs.nbytes)
+
+@st.cache_resource(show_spinner=False)
+def get_process_pool(max_workers=NB_PROCESSUS):
+    """Pool de processus partagé pour les calculs lourds
+
+    Les processus sont lancés par « spawn » : ils n'héritent pas des threads du serveur.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+def importable_module():
+    """Ce fichier sous forme de module importable par les processus du pool
+
+    Streamlit exécute le script sous le nom __main__, que les processus du pool
+    ne peuvent pas importer : les tâches sont référencées par le nom du fichier.
+    """
+    if __name__ != '__main__':
+        return sys.modules[__name__]
+    dossier, fichier = os.path.split(os.path.abspath(__file__))
+    if dossier not in sys.path:
+        sys.path.insert(0, dossier)
+    return importlib.import_module(os.path.splitext(fichier)[0])
+
+@functools.lru_cache(maxsize=2)
+def process_dashboard(compact=MODE_COMPACT):
+    """Dashboard des processus du pool (pages de rapport), construit une fois par processus"""
+    return DefenseRussieDashboardAvance(compact)
+
+def report_style():
+    """Paramètres matplotlib des rapports : thème seaborn s'il est installé, grille légère sinon"""
+    try:
+        sns = timed_import('seaborn')
+    except ImportError:
+        return {'axes.grid': True, 'grid.alpha': 0.3, 'axes.spines.top': False, 'axes.spines.right': False}
+    return {**sns.axes_style('whitegrid'), **sns.plotting_context('paper')}
+
+def render_report_page(page, selection, scenario, annee_debut, annee_fin, pas, compact, dpi):
+    """Tâche du pool de processus : une page de rapport en PNG (matplotlib, backend Agg)
+    
+    La figure est construite sans pyplot : aucun état global, ni fenêtre.
+    """
+    matplotlib = timed_import('matplotlib')
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    dashboard = process_dashboard(compact)
+    with matplotlib.rc_context(report_style()):
+        fig = Figure(figsize=FORMAT_PAGE_RAPPORT, layout='constrained')
+        if page == 'synthese':
+            dashboard.draw_summary_page(fig, scenario, annee_debut, annee_fin)
+        else:
+            dashboard.draw_selection_page(fig, selection, scenario, annee_debut, annee_fin, pas)
+        tampon = io.BytesIO()
+        fig.savefig(tampon, format='png', dpi=dpi)
+    return tampon.getvalue()
+
+def assemble_report(pages, format_, dpi, titre):
+    """Tâche du pool de processus : pages PNG assemblées en PDF multipage, ou en archive ZIP"""
+    tampon = io.BytesIO()
+    if format_ == 'png':
+        with zipfile.ZipFile(tampon, 'w', zipfile.ZIP_STORED) as archive:
+            for i, page in enumerate(pages, 1):
+                archive.writestr(f"page_{i:02d}.png", page)
+        return tampon.getvalue()
+    matplotlib = timed_import('matplotlib')
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+    with PdfPages(tampon, metadata={'Title': titre}) as pdf:
+        for page in pages:
+            image = imread(io.BytesIO(page), format='png')
+            fig = Figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi), dpi=dpi)
+            fig.figimage(image)
+            pdf.savefig(fig, dpi=dpi)
+    return tampon.getvalue()
+
+@st.cache_resource(show_spinner=False)
+def get_report_jobs():
+    """Rapports en cours de rendu, partagés par toutes les sessions du processus"""
+    return TravauxRapports()
+
+@st.cache_resource(show_spinner=False)
+def get_report_cache(max_entrees=32, max_octets=256 * 1024 ** 2):
+    """Cache des rapports rendus, partagé par toutes les sessions du processus"""
+    return CacheLRU(max_entrees, max_octets, taille=lambda rapport: len(rapport.octets))
+
+@st.cache_resource(show_spinner=False)
+def get_startup_report():
+    """Rapport de démarrage du processus : coût des imports et temps de rendu"""
+    return {'imports': {}, 'premier_rendu': None, 'dernier_rendu': None, 'rendus': 0}
+
+def record_startup(duree_rendu):
+    """Ajoute les imports de l'exécution courante et la durée du rendu au rapport"""
+    rapport = get_startup_report()
+    for nom, duree in TEMPS_IMPORTS.items():
+        rapport['imports'].setdefault(nom, duree)
+    if rapport['premier_rendu'] is None:
+        rapport['premier_rendu'] = duree_rendu
+    rapport['dernier_rendu'] = duree_rendu
+    rapport['rendus'] += 1
+    return rapport
+
+@st.cache_resource(show_spinner=False)
+def get_cube_cache(max_entrees=8, max_octets=2 * TAILLE_MAX_CUBE * 4):
+    """Cache des cubes des scénarios, partagé par toutes les sessions du processus
+    
+    Borné en octets : chaque position du curseur d'horizon construit un cube, les
+    moins récemment utilisés sont libérés (le dernier est toujours conservé).
+    """
+    return CacheLRU(max_entrees, max_octets, taille=lambda cube: cube.valeurs.nbytes)
+
+def build_scenario_cube(dashboard, selections, scenarios, annee_debut, annee_fin, pas, version, compact=False):
+    """Cube des scénarios partagé par le processus, construit une seule fois par horizon et résolution
+    
+    Le cube est relu du stockage colonnaire s'il y figure ; sinon il est évalué,
+    écrit puis relu par memory map, pour que les processus en partagent les pages.
+    """
+    configs = {selection: dashboard.get_advanced_config(selection) for selection in selections}
+    cle = (selections, content_hash(configs), scenarios, annee_debut, annee_fin, pas, version, compact)
+
+    def evaluate():
+        cube = CubeScenarios(dashboard.moteur, configs, scenarios, time_axis(annee_debut, annee_fin, pas), compact)
+        return {'annees': cube.annees, 'valeurs': cube.valeurs, 'actifs': cube.actifs}, {}
+
+    def construction():
+        colonnes, _ = get_store().load_or_save('cubes', cle, evaluate)
+        return CubeScenarios(dashboard.moteur, configs, scenarios, colonnes['annees'], compact,
+                             colonnes['valeurs'], colonnes['actifs'])
+
+    return get_cube_cache().get_or_compute(cle, construction)
+
+@st.cache_resource(show_spinner=False)
+def get_warmup(_dashboard, version_code=VERSION_CODE):
+    """Préchauffage des caches du processus, créé une fois par version du code et lancé par start()"""
+    return PrechauffageCaches(_dashboard.define_warmup_tasks())
 
 class DefenseRussieDashboardAvance:
-    def __init__(self):
-        self.branches_options = self.define_branches_options()
-        self.programmes_options = self.define_programmes_options()
-        self.nuclear_arsenal = self.define_nuclear_arsenal()
-        self.missile_systems = self.define_missile_systems()
+    """Moteur du dashboard, partagé par toutes les sessions du processus (get_dashboard)
+    
+    Catalogues, configurations et registre sont figés à la construction (tuples,
+    MappingProxyType, tableaux en lecture seule) : les sessions les lisent en
+    parallèle sans verrou. L'état propre à un analyste (contrôles, traceur) reste
+    dans st.session_state ; les résultats calculés vivent dans les caches partagés,
+    indexés par requête.
+    """
+    
+    def __init__(self, compact=MODE_COMPACT):
+        self.compact = compact
+        self.branches_options = freeze(self.define_branches_options())
+        self.programmes_options = freeze(self.define_programmes_options())
+        self.modes_analyse = freeze(self.define_analysis_modes())
+        self.nuclear_arsenal = freeze(self.define_nuclear_arsenal())
+        self.missile_systems = freeze(self.define_missile_systems())
+        self.catalogue = self.define_systems_catalog()
+        self.tables = self.define_table_store()
+        self.scenarios_options = freeze(self.define_scenarios_options())
+        self.configs = freeze(self.define_advanced_configs())
+        self.config_defaut = freeze(self.define_default_config())
+        self.moteur = MoteurSimulation(MODELES_METRIQUES, SCENARIOS)
+        self.sections = freeze(self.define_sections())
         
     def define_branches_options(self):
         return [
@@ -115,6 +1668,40 @@ class DefenseRussieDashboardAvance:
             "Flotte Nord", "Systèmes Hypersoniques", "Guerre Électronique"
         ]
     
+    def define_analysis_modes(self):
+        """Modes d'analyse du panneau de contrôle et sélections proposées par chacun
+        
+        Un mode à sélection unique n'affiche pas de liste.
+        """
+        return {
+            "Analyse Branche Militaire": self.branches_options,
+            "Programmes Stratégiques": self.programmes_options,
+            "Vue Systémique": ["Forces Armées Russes"],
+            "Scénarios Géopolitiques": ["Scénarios Géopolitiques"],
+        }
+    
+    def define_scenarios_options(self):
+        return list(SCENARIOS)
+    
+    def define_sections(self):
+        """Sections du dashboard : rendus (un fragment chacun) avec leurs entrées, et option d'affichage"""
+        return {
+            "📊 Tableau de Bord": {'rendus': [(self.display_strategic_metrics, ('kpi',)),
+                                              (self.create_comprehensive_analysis, ('df', 'config', 'controls'))]},
+            "⚖️ Comparaison": {'rendus': [(self.create_comparison_analysis, ('controls',))]},
+            "🔬 Analyse Technique": {'rendus': [(self.create_technical_analysis, ('df', 'config'))]},
+            "🌍 Contexte Géopolitique": {'rendus': [(self.create_geopolitical_analysis, ('df', 'config'))],
+                                        'option': 'show_geopolitical'},
+            "📚 Doctrine Militaire": {'rendus': [(self.create_doctrinal_analysis, ('config',))],
+                                     'option': 'show_doctrinal'},
+            "⚠️ Évaluation Menaces": {'rendus': [(self.create_threat_assessment, ('df', 'config'))],
+                                     'option': 'threat_assessment'},
+            "☢️ Systèmes Stratégiques": {'rendus': [(self.create_nuclear_database, ())],
+                                        'option': 'show_technical'},
+            "🎚️ Sensibilité": {'rendus': [(self.create_sensitivity_analysis, ('config', 'controls'))]},
+            "💎 Synthèse Stratégique": {'rendus': [(self.create_strategic_synthesis, ('df', 'config', 'controls'))]},
+        }
+    
     def define_nuclear_arsenal(self):
         return {
             "RS-28 Sarmat": {"type": "ICBM", "portee": 18000, "ogives": 10, "statut": "Déploiement"},
@@ -133,65 +1720,262 @@ class DefenseRussieDashboardAvance:
             "3M22 Zircon": {"type": "Missile Anti-Navire", "portee": 1000, "vitesse": "Mach 9", "statut": "Test"}
         }
     
-    def generate_advanced_data(self, selection):
-        """Génère des données avancées et détaillées pour la Russie"""
-        annees = list(range(2000, 2028))
-        
-        config = self.get_advanced_config(selection)
-        
-        data = {
-            'Annee': annees,
-            'Budget_Defense_Mds': self.simulate_advanced_budget(annees, config),
-            'Personnel_Milliers': self.simulate_advanced_personnel(annees, config),
-            'PIB_Militaire_Pourcent': self.simulate_military_gdp_percentage(annees),
-            'Exercices_Militaires': self.simulate_advanced_exercises(annees, config),
-            'Readiness_Operative': self.simulate_advanced_readiness(annees),
-            'Capacite_Dissuasion': self.simulate_advanced_deterrence(annees),
-            'Temps_Mobilisation_Jours': self.simulate_advanced_mobilization(annees),
-            'Tests_Missiles': self.simulate_missile_tests(annees),
-            'Developpement_Technologique': self.simulate_tech_development(annees),
-            'Capacite_Artillerie': self.simulate_artillery_capacity(annees),
-            'Couverture_AD': self.simulate_air_defense_coverage(annees),
-            'Resilience_Logistique': self.simulate_logistical_resilience(annees),
-            'Cyber_Capabilities': self.simulate_cyber_capabilities(annees),
-            'Production_Armements': self.simulate_weapon_production(annees)
+    def define_weapon_systems(self):
+        return {
+            "T-14 Armata": {"type": "Char de Combat", "portee": 5, "annee_service": 2020, "statut": "Production"},
+            "Su-57 Felon": {"type": "Chasseur", "portee": 3500, "annee_service": 2020, "statut": "Opérationnel"},
+            "S-500 Prometheus": {"annee_service": 2021},
+            "RS-28 Sarmat": {"annee_service": 2022},
+            "Sous-marin Borei": {"type": "SNLE", "portee": 10000, "annee_service": 2013, "statut": "Opérationnel"},
+            "Avion MiG-41": {"type": "Intercepteur", "portee": 4000, "annee_service": 2025, "statut": "Développement"}
         }
+    
+    def define_systems_catalog(self):
+        """Catalogue unique des systèmes d'armes, de l'arsenal nucléaire et des systèmes de missiles"""
+        systemes = {nom: {'nom': nom, **specs} for nom, specs in self.define_weapon_systems().items()}
+        for nom, specs in self.nuclear_arsenal.items():
+            systemes.setdefault(nom, {'nom': nom}).update(dict(specs), nucleaire=True)
+        for nom, specs in self.missile_systems.items():
+            systeme = systemes.setdefault(nom, {'nom': nom})
+            systeme.update({cle: specs[cle] for cle in ('type', 'portee', 'statut')})
+            systeme['details'] = {cle: valeur for cle, valeur in specs.items() if cle not in systeme}
+        for systeme in systemes.values():
+            systeme.setdefault('nucleaire', False)
+            systeme['classification'] = 'Offensif' if systeme['type'] in TYPES_OFFENSIFS else 'Défensif'
+        systemes = list(systemes.values())
+        colonnes, meta = get_store().load_or_save('catalogues', ('systemes', content_hash(systemes)),
+                                                  lambda: CatalogueSystemes.from_systems(systemes).columns())
+        return CatalogueSystemes.from_columns(colonnes, meta)
+    
+    def define_reference_tables(self):
+        """Tables de référence statiques des sections géopolitique, technique et menaces"""
+        return {
+            'sanctions': {
+                'Année': [2014, 2016, 2018, 2020, 2022, 2023],
+                'Sanctions': ['Crimée', 'Syrie', 'Skripal', 'Nord Stream 2', 'Opération Spéciale', 'Nouvelles sanctions'],
+                'Impact': [4, 5, 6, 5, 8, 9]  # sur 10
+            },
+            'modernisation': {
+                'Domaine': ['Forces Terrestres', 'Forces Stratégiques', 
+                          'Défense Aérienne', 'Marine', 'Forces Aérospatiales'],
+                'Niveau 2000': [40, 70, 60, 50, 45],
+                'Niveau 2027': [85, 95, 92, 80, 88]
+            },
+            'menaces': {
+                'Type de Menace': ['Expansion OTAN', 'Frappe de Décapitation', 'Guerre Cyber', 
+                                 'Encerclement Stratégique', 'Instabilité Périphérique', 'Sanctions Économiques'],
+                'Probabilité': [0.8, 0.3, 0.9, 0.7, 0.6, 0.9],
+                'Impact': [0.8, 0.9, 0.7, 0.8, 0.5, 0.7],
+                'Niveau Préparation': [0.9, 0.95, 0.8, 0.7, 0.6, 0.5]
+            },
+            'reponses': {
+                'Scénario': ['Conflit Régional', 'Crise Nucléaire', 'Guerre Cyber', 
+                           'Opérations Hybrides', 'Intervention Étrangère'],
+                'Dissuasion': [0.7, 1.0, 0.3, 0.8, 0.9],
+                'Défense': [0.8, 0.4, 0.7, 0.6, 0.8],
+                'Riposte': [0.9, 1.0, 0.8, 0.9, 0.95]
+            },
+        }
+    
+    def define_table_store(self):
+        """Tables de référence relues du stockage colonnaire (colonnes en lecture seule)"""
+        tables = {}
+        for nom, table in self.define_reference_tables().items():
+            colonnes, _ = get_store().load_or_save('tables', (nom, content_hash(table)),
+                                                   lambda: ({colonne: np.asarray(valeurs)
+                                                             for colonne, valeurs in table.items()}, {}))
+            tables[nom] = pd.DataFrame(colonnes, copy=False)
+        return MappingProxyType(tables)
+    
+    def get_scenario_cube(self, annee_debut=2000, annee_fin=2027, pas=1):
+        """Cube de toutes les branches et programmes pour tous les scénarios"""
+        selections = tuple(dict.fromkeys(self.branches_options + self.programmes_options))
+        return build_scenario_cube(self, selections, tuple(self.scenarios_options),
+                                   annee_debut, annee_fin, pas, self.moteur.version, self.compact)
+    
+    def cube_fits(self, annees):
+        """Vrai si le cube des scénarios de cet axe temporel reste sous TAILLE_MAX_CUBE"""
+        taille_cube = (len(self.branches_options) + len(self.programmes_options)) * len(self.scenarios_options) \
+            * len(annees) * len(self.moteur.metriques)
+        return taille_cube <= TAILLE_MAX_CUBE
+    
+    def generate_advanced_data(self, selection, scenario="Statut Quo", annee_debut=2000, annee_fin=2027, pas=1):
+        """Génère des données avancées et détaillées pour la Russie (`pas` points par année)"""
+        cle = (selection, scenario, annee_debut, annee_fin, pas, self.moteur.version, self.compact)
+        with current_tracer().span('generate_advanced_data', 'donnees', selection=selection,
+                                   scenario=scenario) as details:
+            resultat, hit = get_data_cache().lookup(cle, lambda: self.compute_cached_data(cle))
+            details['cache'] = 'hit' if hit else 'miss'
+        return resultat
+    
+    def generate_kpi_summary(self, selection, scenario="Statut Quo", annee_debut=2000, annee_fin=2027, pas=1):
+        """Synthèse des indicateurs clés d'une combinaison, calculée une fois et partagée"""
+        df, _ = self.generate_advanced_data(selection, scenario, annee_debut, annee_fin, pas)
+        with current_tracer().span('generate_kpi_summary', 'donnees', selection=selection,
+                                   scenario=scenario) as details:
+            synthese, hit = get_kpi_cache().lookup(df.attrs['cle'], lambda: self.compute_kpi_summary(df))
+            details['cache'] = 'hit' if hit else 'miss'
+        return synthese
+    
+    def compute_kpi_summary(self, df):
+        """Calcule une synthèse d'indicateurs, sans passer par le cache"""
+        synthese = SyntheseIndicateurs(df, self.moteur.metriques)
+        synthese.cle = df.attrs['cle']
+        return synthese
+    
+    def compute_cached_data(self, cle):
+        """Calcule une entrée du cache ; la clé est conservée dans df.attrs pour les figures"""
+        df, config = self.compute_advanced_data(*cle[:5])
+        df.attrs['cle'] = cle
+        return df, config
+    
+    def compute_advanced_data(self, selection, scenario, annee_debut, annee_fin, pas=1):
+        """Calcule les données d'une combinaison, sans passer par le cache"""
+        config = self.get_advanced_config(selection)
         
-        # Données spécifiques aux programmes
-        if 'nucleaire' in config.get('priorites', []):
-            data.update({
-                'Stock_Ogives_Nucleaires': self.simulate_nuclear_arsenal_size(annees),
-                'Portee_Max_Missiles_Km': self.simulate_missile_range_evolution(annees),
-                'Tetes_Multiples': self.simulate_mirv_development(annees),
-                'Essais_Souterrains': self.simulate_underground_tests(annees)
-            })
-        
-        if 'modernisation' in config.get('priorites', []):
-            data.update({
-                'Nouveaux_Systemes': self.simulate_new_systems(annees),
-                'Taux_Modernisation': self.simulate_modernization_rate(annees),
-                'Exportations_Armes': self.simulate_weapon_exports(annees)
-            })
-        
-        if 'aerospatial' in config.get('priorites', []):
-            data.update({
-                'Satellites_Militaires': self.simulate_military_satellites(annees),
-                'Capacite_Antisatellite': self.simulate_antisatellite_capability(annees),
-                'Defense_Aerospatiale': self.simulate_aerospace_defense(annees)
-            })
-        
-        if 'cyber' in config.get('priorites', []):
-            data.update({
-                'Attaques_Cyber_Reussies': self.simulate_cyber_attacks(annees),
-                'Reseau_Commandement_Cyber': self.simulate_cyber_command(annees),
-                'Cyber_Defense_Niveau': self.simulate_cyber_defense(annees)
-            })
+        # Les branches et programmes sont lus dans le cube des scénarios ; les autres
+        # sélections, et les horizons trop longs pour un cube, sont évalués à la
+        # demande. Les données spécifiques aux programmes sont filtrées selon les
+        # priorités de la configuration.
+        annees = time_axis(annee_debut, annee_fin, pas)
+        if self.cube_fits(annees):
+            cube = self.get_scenario_cube(annee_debut, annee_fin, pas)
+            if (selection, scenario) in cube:
+                df = cube.frame(selection, scenario)
+                df.attrs['source'] = 'cube'
+                return df, config
+        
+        # Séries hors cube : relues du stockage colonnaire, ou évaluées puis écrites
+        cle = (content_hash(config), scenario, annee_debut, annee_fin, pas, self.moteur.version, self.compact)
+        stocke = get_store().load('series', cle)
+        if stocke is None:
+            valeurs = self.moteur.evaluate(annees, self.moteur.config_parameters(config),
+                                           scenario=self.moteur.scenario_array(scenario))
+            if self.compact:
+                annees = compact_years(annees)
+                valeurs = np.where(self.moteur.entiers, np.rint(valeurs), valeurs).astype(np.float32)
+            if get_store().save('series', cle, {'annees': annees, 'valeurs': valeurs}):
+                stocke = get_store().load('series', cle)
+        if stocke is not None:
+            colonnes, _ = stocke
+            annees, valeurs = colonnes['annees'], colonnes['valeurs']
+        df = self.moteur.build_frame(annees, valeurs, config, self.compact)
+        df.attrs['source'] = 'evaluation' if stocke is None else 'stockage'
+        return df, config
+    
+    def generate_comparison(self, selections, scenario="Statut Quo", annee_debut=2000, annee_fin=2027, pas=1):
+        """Séries de plusieurs sélections en un seul appel : (annees, valeurs, actifs)
+        
+        Les valeurs (selections, annees, metriques) sont lues d'une indexation dans le
+        cube partagé ; hors cube, elles sont évaluées en une passe diffusée sur
+        l'axe des sélections. Aucun DataFrame n'est construit par sélection.
+        """
+        with current_tracer().span('generate_comparison', 'donnees', selections=len(selections),
+                                   scenario=scenario) as details:
+            annees = time_axis(annee_debut, annee_fin, pas)
+            cube = self.get_scenario_cube(annee_debut, annee_fin, pas) if self.cube_fits(annees) else None
+            if cube is not None and all((selection, scenario) in cube for selection in selections):
+                valeurs, actifs = cube.batch(selections, scenario)
+                details['source'] = 'cube'
+            else:
+                configs = [self.get_advanced_config(selection) for selection in selections]
+                parametres = np.stack([self.moteur.config_parameters(config) for config in configs])
+                valeurs = self.moteur.evaluate(annees, parametres, scenario=self.moteur.scenario_array(scenario))
+                actifs = np.stack([self.moteur.active_metrics(config) for config in configs])
+                details['source'] = 'evaluation'
+            details['octets'] = valeurs.nbytes
+        return annees, valeurs, actifs
+    
+    def generate_monte_carlo_bands(self, selection, scenario="Statut Quo", tirages=10_000, graine=0,
+                                   annee_debut=2000, annee_fin=2027, pas=1):
+        """Bandes d'incertitude Monte Carlo, calculées une fois par combinaison puis servies par le cache
+
+        Les tirages suivent le même axe temporel que les données (`pas` points par
+        année) : les bandes se superposent point à point aux séries.
+        """
+        cle = (selection, scenario, annee_debut, annee_fin, pas, tirages, graine, self.moteur.version,
+               VERSION_CODE)
+        with current_tracer().span('generate_monte_carlo_bands', 'donnees', selection=selection,
+                                   scenario=scenario, tirages=tirages) as details:
+            bandes, hit = get_band_cache().lookup(cle, lambda: self.compute_cached_bands(cle))
+            details['cache'] = 'hit' if hit else 'miss'
+            details['octets'] = bandes.valeurs.nbytes
+        return bandes
+    
+    def compute_cached_bands(self, cle):
+        """Calcule une entrée du cache de bandes ; la clé est conservée pour les figures"""
+        bandes = self.compute_monte_carlo_bands(*cle[:7])
+        bandes.cle = cle
+        return bandes
+    
+    def compute_monte_carlo_bands(self, selection, scenario, annee_debut, annee_fin, pas, tirages, graine):
+        """Tire les trajectoires des métriques actives ; le pool de processus prend les grands tirages"""
+        debut = time.perf_counter()
+        config = self.get_advanced_config(selection)
+        annees = time_axis(annee_debut, annee_fin, pas)
+        indices = np.flatnonzero(self.moteur.active_metrics(config))
         
-        return pd.DataFrame(data), config
+        if tirages < TIRAGES_MIN_PARALLELE:
+            tableaux = self.moteur.scenario_array(scenario)
+            quantiles = [self.moteur.draw_quantiles(k, annees, config, tirages, graine, tableaux) for k in indices]
+        else:
+            # Un groupe de métriques par tâche ; le résultat ne dépend pas du découpage
+            tache = importable_module().compute_metric_bands
+            groupes = np.array_split(indices, min(len(indices), 2 * NB_PROCESSUS))
+            # Les MappingProxyType ne se sérialisent pas : la configuration part en dict
+            futures = [get_process_pool().submit(tache, groupe, annees, dict(config), tirages, graine, scenario)
+                       for groupe in groupes]
+            quantiles = [q for future in futures for q in future.result()]
+        
+        return BandesMonteCarlo(annees, [self.moteur.metriques[k] for k in indices], PERCENTILES_BANDES,
+                                np.stack(quantiles, axis=-1), tirages, time.perf_counter() - debut)
+    
+    def generate_sensitivity_sweep(self, selection, scenario, metrique, annee, leviers, points, amplitude,
+                                   progression=None):
+        """Balayage de sensibilité servi par le cache ; `progression(fraction)` suit un calcul"""
+        cle = (selection, scenario, metrique, annee, tuple(leviers), points, amplitude, self.moteur.version)
+        with current_tracer().span('generate_sensitivity_sweep', 'donnees', metrique=metrique,
+                                   combinaisons=points ** len(leviers)) as details:
+            balayage, hit = get_sweep_cache().lookup(cle, lambda: self.compute_cached_sweep(cle, progression))
+            details['cache'] = 'hit' if hit else 'miss'
+            details['octets'] = balayage.valeurs.nbytes
+        return balayage
+    
+    def compute_cached_sweep(self, cle, progression=None):
+        """Calcule une entrée du cache de balayages ; la clé est conservée pour les figures"""
+        balayage = self.compute_sensitivity_sweep(*cle[:7], progression=progression)
+        balayage.cle = cle
+        return balayage
+    
+    def compute_sensitivity_sweep(self, selection, scenario, metrique, annee, leviers, points, amplitude,
+                                  progression=None):
+        """Évalue la grille ±amplitude autour des valeurs de référence, par tranches du premier levier"""
+        debut = time.perf_counter()
+        config = self.get_advanced_config(selection)
+        grilles = {}
+        for nom in leviers:
+            base = self.moteur.lever_base(nom, config)
+            grilles[nom] = np.linspace(base * (1 - amplitude), base * (1 + amplitude), points)
+        tableaux = self.moteur.scenario_array(scenario)
+        
+        # Tranches du premier axe : la progression est rapportée entre deux tranches
+        valeurs = np.empty((points,) * len(leviers))
+        premier = leviers[0]
+        tranches = np.array_split(np.arange(points), min(points, ETAPES_BALAYAGE))
+        for i, tranche in enumerate(tranches):
+            valeurs[tranche] = self.moteur.sweep(metrique, annee, config,
+                                                 dict(grilles, **{premier: grilles[premier][tranche]}), tableaux)
+            if progression:
+                progression((i + 1) / len(tranches))
+        return BalayageSensibilite(metrique, annee, grilles, valeurs, time.perf_counter() - debut)
     
     def get_advanced_config(self, selection):
-        """Configuration avancée avec plus de détails pour la Russie"""
-        configs = {
+        """Configuration avancée d'une sélection (immuable, partagée par les sessions)"""
+        return self.configs.get(selection, self.config_defaut)
+    
+    def define_advanced_configs(self):
+        """Configurations avancées avec plus de détails pour la Russie"""
+        return {
             "Forces Armées Russes": {
                 "type": "armee_totale",
                 "budget_base": 65.0,
@@ -225,190 +2009,144 @@ class DefenseRussieDashboardAvance:
                 "estimations_stock": "6000 ogives nucléaires"
             }
         }
-        
-        return configs.get(selection, {
+    
+    def define_default_config(self):
+        """Configuration des sélections sans configuration dédiée"""
+        return {
             "type": "branche",
             "personnel_base": 100,
             "exercices_base": 30,
             "priorites": ["defense_generique"]
-        })
+        }
+    
+    def simulate_metric(self, metrique, annees, config=None):
+        """Série d'une métrique du registre, sous forme de liste"""
+        valeurs = self.moteur.evaluate(annees, self.moteur.config_parameters(config or {}))
+        k = self.moteur.metriques.index(metrique)
+        serie = valeurs[:, k]
+        return np.rint(serie).astype(np.int64).tolist() if self.moteur.entiers[k] else serie.tolist()
     
     def simulate_advanced_budget(self, annees, config):
         """Simulation avancée du budget avec variations géopolitiques"""
-        budget_base = config.get('budget_base', 60.0)
-        budgets = []
-        for annee in annees:
-            base = budget_base * (1 + 0.04 * (annee - 2000))
-            # Variations selon événements géopolitiques
-            if 2008 <= annee <= 2012:  # Modernisation post-Géorgie
-                base *= 1.15
-            elif 2014 <= annee <= 2016:  # Post-Crimée
-                base *= 1.1
-            elif annee >= 2020:  # Modernisation avancée
-                base *= 1.2
-            elif annee >= 2022:  # Opérations spéciales
-                base *= 1.3
-            budgets.append(base)
-        return budgets
+        return self.simulate_metric('Budget_Defense_Mds', annees, config)
     
     def simulate_advanced_personnel(self, annees, config):
         """Simulation avancée des effectifs"""
-        personnel_base = config.get('personnel_base', 800)
-        return [personnel_base * (1 + 0.01 * (annee - 2000)) for annee in annees]
+        return self.simulate_metric('Personnel_Milliers', annees, config)
     
     def simulate_military_gdp_percentage(self, annees):
         """Pourcentage du PIB consacré à la défense"""
-        return [3.5 + 0.3 * (annee - 2000) for annee in annees]
+        return self.simulate_metric('PIB_Militaire_Pourcent', annees)
     
     def simulate_advanced_exercises(self, annees, config):
         """Exercices militaires avec saisonnalité"""
-        base = config.get('exercices_base', 100)
-        return [base + 5 * (annee - 2000) + 10 * np.sin(2 * np.pi * (annee - 2000)/4) for annee in annees]
+        return self.simulate_metric('Exercices_Militaires', annees, config)
     
     def simulate_advanced_readiness(self, annees):
         """Préparation opérationnelle avancée"""
-        readiness = []
-        for annee in annees:
-            base = 70 + 1.2 * (annee - 2000)
-            if annee >= 2008:  # Réformes militaires
-                base += 10
-            if annee >= 2014:  # Modernisation
-                base += 8
-            if annee >= 2020:  # Expérience opérationnelle
-                base += 5
-            readiness.append(min(base, 95))
-        return readiness
+        return self.simulate_metric('Readiness_Operative', annees)
     
     def simulate_advanced_deterrence(self, annees):
         """Capacité de dissuasion avancée"""
-        deterrence = []
-        for annee in annees:
-            base = 85  # Héritage soviétique
-            if annee >= 2008:
-                base += 2  # Modernisation
-            if annee >= 2018:
-                base += 5  # Systèmes hypersoniques
-            deterrence.append(min(base, 98))
-        return deterrence
+        return self.simulate_metric('Capacite_Dissuasion', annees)
     
     def simulate_advanced_mobilization(self, annees):
         """Temps de mobilisation avancé"""
-        return [max(30 - 0.5 * (annee - 2000), 7) for annee in annees]
+        return self.simulate_metric('Temps_Mobilisation_Jours', annees)
     
     def simulate_missile_tests(self, annees):
         """Tests de missiles"""
-        tests = []
-        for annee in annees:
-            if annee < 2008:
-                tests.append(5)
-            elif annee < 2014:
-                tests.append(8 + (annee - 2008))
-            else:
-                tests.append(15 + 2 * (annee - 2014))
-        return tests
+        return self.simulate_metric('Tests_Missiles', annees)
     
     def simulate_tech_development(self, annees):
         """Développement technologique global"""
-        return [min(75 + 1.5 * (annee - 2000), 95) for annee in annees]
+        return self.simulate_metric('Developpement_Technologique', annees)
     
     def simulate_artillery_capacity(self, annees):
         """Capacité d'artillerie"""
-        return [min(80 + 1.2 * (annee - 2000), 95) for annee in annees]
+        return self.simulate_metric('Capacite_Artillerie', annees)
     
     def simulate_air_defense_coverage(self, annees):
         """Couverture de défense anti-aérienne"""
-        return [min(70 + 2 * (annee - 2000), 95) for annee in annees]
+        return self.simulate_metric('Couverture_AD', annees)
     
     def simulate_logistical_resilience(self, annees):
         """Résilience logistique"""
-        return [min(65 + 2.5 * (annee - 2000), 92) for annee in annees]
+        return self.simulate_metric('Resilience_Logistique', annees)
     
     def simulate_cyber_capabilities(self, annees):
         """Capacités cybernétiques"""
-        return [min(70 + 3 * (annee - 2000), 94) for annee in annees]
+        return self.simulate_metric('Cyber_Capabilities', annees)
     
     def simulate_weapon_production(self, annees):
         """Production d'armements (indice)"""
-        return [min(75 + 2 * (annee - 2000), 96) for annee in annees]
+        return self.simulate_metric('Production_Armements', annees)
     
     def simulate_nuclear_arsenal_size(self, annees):
         """Évolution du stock d'ogives nucléaires"""
-        stock = []
-        for annee in annees:
-            if annee < 2010:
-                stock.append(8000 - 200 * (annee - 2000))  # Réduction START
-            else:
-                stock.append(6000 + 50 * (annee - 2010))  # Modernisation
-        return [max(s, 4000) for s in stock]
+        return self.simulate_metric('Stock_Ogives_Nucleaires', annees)
     
     def simulate_missile_range_evolution(self, annees):
         """Évolution de la portée maximale des missiles"""
-        portee = []
-        for annee in annees:
-            if annee < 2009:
-                portee.append(11000)
-            elif annee < 2017:
-                portee.append(12000 + 500 * (annee - 2009))
-            else:
-                portee.append(18000)  # Sarmat opérationnel
-        return portee
+        return self.simulate_metric('Portee_Max_Missiles_Km', annees)
     
     def simulate_mirv_development(self, annees):
         """Développement des têtes multiples"""
-        return [min(6 + 0.5 * (annee - 2000), 12) for annee in annees]
+        return self.simulate_metric('Tetes_Multiples', annees)
     
     def simulate_underground_tests(self, annees):
         """Essais souterrains et préparation"""
-        return [min(85 + 1 * (annee - 2000), 98) for annee in annees]
+        return self.simulate_metric('Essais_Souterrains', annees)
     
     def simulate_new_systems(self, annees):
         """Nouveaux systèmes déployés"""
-        return [min(5 + 2 * (annee - 2000), 50) for annee in annees]
+        return self.simulate_metric('Nouveaux_Systemes', annees)
     
     def simulate_modernization_rate(self, annees):
         """Taux de modernisation des équipements"""
-        return [min(30 + 4 * (annee - 2000), 85) for annee in annees]
+        return self.simulate_metric('Taux_Modernisation', annees)
     
     def simulate_weapon_exports(self, annees):
         """Exportations d'armes (milliards USD)"""
-        return [min(4 + 0.5 * (annee - 2000), 15) for annee in annees]
+        return self.simulate_metric('Exportations_Armes', annees)
     
     def simulate_military_satellites(self, annees):
         """Satellites militaires en orbite"""
-        return [min(80 + 5 * (annee - 2000), 150) for annee in annees]
+        return self.simulate_metric('Satellites_Militaires', annees)
     
     def simulate_antisatellite_capability(self, annees):
         """Capacité antisatellite"""
-        return [min(60 + 3 * (annee - 2000), 95) for annee in annees]
+        return self.simulate_metric('Capacite_Antisatellite', annees)
     
     def simulate_aerospace_defense(self, annees):
         """Défense aérospatiale"""
-        return [min(70 + 2.5 * (annee - 2000), 92) for annee in annees]
+        return self.simulate_metric('Defense_Aerospatiale', annees)
     
     def simulate_cyber_attacks(self, annees):
         """Attaques cyber réussies (estimation)"""
-        return [min(20 + 3 * (annee - 2000), 100) for annee in annees]
+        return self.simulate_metric('Attaques_Cyber_Reussies', annees)
     
     def simulate_cyber_command(self, annees):
         """Réseau de commandement cyber"""
-        return [min(75 + 2 * (annee - 2000), 95) for annee in annees]
+        return self.simulate_metric('Reseau_Commandement_Cyber', annees)
     
     def simulate_cyber_defense(self, annees):
         """Capacités de cyber défense"""
-        return [min(70 + 2.5 * (annee - 2000), 92) for annee in annees]
+        return self.simulate_metric('Cyber_Defense_Niveau', annees)
     
-    def display_advanced_header(self):
-        """En-tête avancé avec plus d'informations"""
+    def display_advanced_header(self, controls):
+        """En-tête avancé avec plus d'informations (horizon choisi dans le panneau de contrôle)"""
         st.markdown('<h1 class="main-header">⚡ ANALYSE STRATÉGIQUE AVANCÉE - FÉDÉRATION DE RUSSIE</h1>', 
                    unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.markdown("""
+            st.markdown(f"""
             <div style='text-align: center; background: linear-gradient(135deg, #0033A0, #D52B1E); 
             padding: 1rem; border-radius: 10px; color: white; margin: 1rem 0;'>
             <h3>🛡️ SYSTÈME DE DÉFENSE INTÉGRÉ DE LA FÉDÉRATION DE RUSSIE</h3>
-            <p><strong>Analyse multidimensionnelle des capacités militaires et stratégiques (2000-2027)</strong></p>
+            <p><strong>Analyse multidimensionnelle des capacités militaires et stratégiques
+            ({controls['annee_debut']}-{controls['annee_fin']})</strong></p>
             </div>
             """, unsafe_allow_html=True)
     
@@ -417,19 +2155,14 @@ class DefenseRussieDashboardAvance:
         st.sidebar.markdown("## 🎛️ PANEL DE CONTRÔLE AVANCÉ")
         
         # Sélection du type d'analyse
-        type_analyse = st.sidebar.radio(
-            "Mode d'analyse:",
-            ["Analyse Branche Militaire", "Programmes Stratégiques", "Vue Systémique", "Scénarios Géopolitiques"]
-        )
+        type_analyse = st.sidebar.radio("Mode d'analyse:", list(self.modes_analyse))
         
         if type_analyse == "Analyse Branche Militaire":
-            selection = st.sidebar.selectbox("Branche militaire:", self.branches_options)
+            selection = st.sidebar.selectbox("Branche militaire:", self.modes_analyse[type_analyse])
         elif type_analyse == "Programmes Stratégiques":
-            selection = st.sidebar.selectbox("Programme stratégique:", self.programmes_options)
-        elif type_analyse == "Vue Systémique":
-            selection = "Forces Armées Russes"
+            selection = st.sidebar.selectbox("Programme stratégique:", self.modes_analyse[type_analyse])
         else:
-            selection = "Scénarios Géopolitiques"
+            selection = self.modes_analyse[type_analyse][0]
         
         # Options avancées
         st.sidebar.markdown("### 🔧 OPTIONS AVANCÉES")
@@ -440,7 +2173,25 @@ class DefenseRussieDashboardAvance:
         
         # Paramètres de simulation
         st.sidebar.markdown("### ⚙️ PARAMÈTRES DE SIMULATION")
-        scenario = st.sidebar.selectbox("Scénario:", ["Statut Quo", "Escalation OTAN", "Modernisation Accélérée", "Conflit Majeur"])
+        scenario = st.sidebar.selectbox("Scénario:", self.scenarios_options, key='scenario')
+        annee_debut, annee_fin = st.sidebar.slider("Horizon:", HORIZON_MIN, HORIZON_MAX, (2000, 2027), key='horizon')
+        resolution = st.sidebar.selectbox("Résolution:", list(RESOLUTIONS), key='resolution')
+        # Le coût des tirages croît avec le nombre de points : bandes en résolution annuelle uniquement
+        annuelle = RESOLUTIONS[resolution] == 1
+        monte_carlo = st.sidebar.checkbox("Bandes d'incertitude (Monte Carlo)", value=False, key='monte_carlo',
+                                          disabled=not annuelle) and annuelle
+        if not annuelle:
+            st.sidebar.caption("Bandes d'incertitude disponibles en résolution annuelle uniquement.")
+        tirages = st.sidebar.select_slider("Tirages Monte Carlo:", [10_000, 20_000, 50_000, 100_000],
+                                           value=10_000, key='tirages', disabled=not monte_carlo)
+        intervalle = st.sidebar.selectbox("Intervalle:", list(INTERVALLES_BANDES), index=2, key='intervalle',
+                                          disabled=not monte_carlo)
+        
+        # Performance
+        st.sidebar.markdown("### 🚀 PERFORMANCE")
+        navigation_paresseuse = st.sidebar.checkbox("Navigation paresseuse (section active uniquement)", value=True,
+                                                    key='navigation_paresseuse')
+        panneau_performance = st.sidebar.checkbox("Panneau de performance", value=False, key='panneau_performance')
         
         return {
             'selection': selection,
@@ -449,17 +2200,164 @@ class DefenseRussieDashboardAvance:
             'show_doctrinal': show_doctrinal,
             'show_technical': show_technical,
             'threat_assessment': threat_assessment,
-            'scenario': scenario
+            'scenario': scenario,
+            'annee_debut': annee_debut,
+            'annee_fin': annee_fin,
+            'pas': RESOLUTIONS[resolution],
+            'monte_carlo': monte_carlo,
+            'tirages': tirages,
+            'intervalle': INTERVALLES_BANDES[intervalle],
+            'navigation_paresseuse': navigation_paresseuse,
+            'panneau_performance': panneau_performance
         }
     
-    def display_strategic_metrics(self, df, config):
-        """Métriques stratégiques avancées"""
+    def display_cache_stats(self):
+        """Compteurs du cache de données partagé"""
+        stats = get_data_cache().stats()
+        with st.sidebar.expander("🗄️ Cache de données"):
+            col1, col2 = st.columns(2)
+            col1.metric("Taux de hit", f"{stats['taux_hit']:.0%}")
+            col2.metric("Entrées", stats['entrees'])
+            st.caption(f"{stats['hits']} hits • {stats['misses']} misses • "
+                       f"{stats['evictions']} évictions • {stats['octets'] / 1024:.0f} Ko")
+    
+    def display_warmup_status(self):
+        """Progression du préchauffage, rafraîchie toutes les 2 s tant qu'il n'est pas terminé"""
+        if not PRECHAUFFAGE:
+            return
+        termine = get_warmup(self, VERSION_CODE).status()['termine']
+        with st.sidebar:
+            st.fragment(self.render_warmup_status, run_every=None if termine else 2)()
+    
+    def render_warmup_status(self):
+        etat = get_warmup(self, VERSION_CODE).status()
+        with st.expander("🔥 Préchauffage", expanded=not etat['termine']):
+            if not etat['lance']:
+                st.caption("Lancé après le premier rendu")
+            elif not etat['termine']:
+                st.progress(etat['progression'], text=f"{etat['faites']}/{etat['total']} • {etat['en_cours']}")
+            else:
+                st.caption(f"✅ {etat['total']} tâches en {etat['duree']:.1f} s • "
+                           f"{len(etat['erreurs'])} erreurs")
+            st.caption("Combinaisons non préchauffées : calculées à la demande")
+    
+    def display_report_panel(self, controls):
+        """Rapport imprimable rendu en arrière-plan, suivi chaque seconde tant qu'il est en cours"""
+        en_attente = st.session_state.get('rapport_en_attente', False)
+        with st.sidebar:
+            st.fragment(self.render_report_panel, run_every=1 if en_attente else None)(controls)
+    
+    def render_report_panel(self, controls):
+        en_attente = st.session_state.get('rapport_en_attente', False)
+        with st.expander("🖨️ Rapport imprimable", expanded=en_attente):
+            selections = st.multiselect("Sélections:", list(dict.fromkeys(self.branches_options +
+                                                                           self.programmes_options)),
+                                        default=self.branches_options, key='rapport_selections')
+            format_ = st.radio("Format:", ['PDF', 'PNG'], horizontal=True, key='rapport_format')
+            st.caption(f"Scénario {controls['scenario']} • {controls['annee_debut']}-{controls['annee_fin']} • "
+                       f"une page de synthèse et une page par sélection")
+            if st.button("Générer le rapport", key='rapport_generer', disabled=not selections):
+                st.session_state['rapport_cle'] = self.generate_report(
+                    selections, controls['scenario'], controls['annee_debut'], controls['annee_fin'],
+                    controls['pas'], format_.lower())
+                st.session_state['rapport_en_attente'] = True
+                # Rerun complet : le fragment repart avec son rafraîchissement périodique
+                st.rerun()
+            
+            cle = st.session_state.get('rapport_cle')
+            if cle is None:
+                return
+            etat = get_report_jobs().status(cle)
+            if not etat['connu']:
+                # Processus redémarré depuis la demande : le rapport est relancé
+                self.generate_report(*cle[:7])
+                etat = get_report_jobs().status(cle)
+            if not etat['termine']:
+                progression = etat['faites'] / etat['total'] if etat['total'] else 0.0
+                st.progress(progression, text=f"Rendu en cours • {etat['faites']}/{etat['total']} étapes")
+            elif etat['erreur']:
+                st.error(f"Échec du rendu : {etat['erreur']}")
+            else:
+                rapport = self.get_report(cle)
+                st.download_button(f"📥 Télécharger ({rapport.extension.upper()})", rapport.octets,
+                                   file_name=f"briefing_russie_{cle[2]}-{cle[3]}.{rapport.extension}",
+                                   mime=rapport.mime, key='rapport_telecharger')
+                st.caption(f"{rapport.pages} pages • {len(rapport.octets) / 1024:.0f} Ko • "
+                           f"rendu en {rapport.duree:.1f} s")
+            if en_attente and etat['termine']:
+                # Rendu terminé : rerun complet pour arrêter le rafraîchissement
+                st.session_state['rapport_en_attente'] = False
+                st.rerun()
+    
+    def display_performance_panel(self, traceur):
+        """Spans du rerun courant et export Chrome trace"""
+        with st.sidebar.expander("⏱️ Performance", expanded=True):
+            spans = traceur.frame()
+            total = spans.loc[spans['Catégorie'] == 'rerun', 'Mur (ms)'].sum()
+            figures = spans[spans['Catégorie'] == 'figure']
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Rerun", f"{total:.0f} ms")
+            col2.metric("Figures", f"{figures['Octets'].sum() / 1024:.0f} Ko")
+            col3.metric("WebGL", f"{figures['Rendu'].isin(['webgl', 'mixte']).sum()}/{len(figures)}")
+            st.caption(f"Courbes en WebGL au-delà de {SEUIL_WEBGL:,} points par figure ; "
+                       f"décimation au-delà de {POINTS_MAX_TRACE:,} points par trace")
+            st.dataframe(spans, hide_index=True, use_container_width=True)
+            st.download_button("📥 Export Chrome trace", traceur.chrome_trace(),
+                               file_name="dashboard_trace.json", mime="application/json")
+    
+    def display_memory_report(self, controls):
+        """Empreinte mémoire par frame en cache, par session et des caches partagés"""
+        with st.sidebar.expander("🧮 Mémoire"):
+            frames = [df for df, _ in get_data_cache().values()]
+            rapports = [frame_memory(df) for df in frames]
+            partages = sum(cache().stats()['octets'] for cache in
+                           (get_data_cache, get_figure_cache, get_band_cache, get_sweep_cache,
+                            get_report_cache, get_cube_cache))
+            session = object_size(dict(st.session_state))
+            
+            col1, col2 = st.columns(2)
+            col1.metric("Session", f"{session / 1024:.0f} Ko")
+            col2.metric("Caches partagés", f"{partages / 1024 ** 2:.1f} Mo")
+            octets = sum(rapport['octets'] - rapport['partages'] for rapport in rapports)
+            float64 = sum(rapport['float64'] for rapport in rapports)
+            st.caption(f"Mode compact {'activé' if self.compact else 'désactivé'} • {len(frames)} frames : "
+                       f"{octets / 1024:.0f} Ko propres, {float64 / 1024:.0f} Ko en float64")
+            stockage = get_store().stats()
+            if stockage:
+                st.caption("Stockage sur disque (memory map) : " + " • ".join(
+                    f"{espace} {stats['entrees']} ({stats['octets'] / 1024:.0f} Ko)"
+                    for espace, stats in stockage.items()))
+            if frames:
+                st.dataframe(pd.DataFrame({
+                    'Sélection': [df.attrs['cle'][0] for df in frames],
+                    'Scénario': [df.attrs['cle'][1] for df in frames],
+                    'Lignes': [rapport['lignes'] for rapport in rapports],
+                    'Ko': [rapport['octets'] / 1024 for rapport in rapports],
+                    'Ko partagés': [rapport['partages'] / 1024 for rapport in rapports],
+                    'Ko float64': [rapport['float64'] / 1024 for rapport in rapports],
+                }).iloc[::-1], hide_index=True, use_container_width=True)
+    
+    def display_startup_report(self, duree_rendu):
+        """Coût des imports et temps jusqu'au premier rendu du processus"""
+        rapport = record_startup(duree_rendu)
+        with st.sidebar.expander("🚀 Démarrage"):
+            col1, col2 = st.columns(2)
+            col1.metric("Premier rendu", f"{rapport['premier_rendu'] * 1000:.0f} ms")
+            col2.metric("Dernier rendu", f"{rapport['dernier_rendu'] * 1000:.0f} ms")
+            imports = sorted(rapport['imports'].items(), key=lambda item: -item[1])
+            st.dataframe(pd.DataFrame({'Module': [nom for nom, _ in imports],
+                                       'Import (ms)': [duree * 1000 for _, duree in imports]}),
+                         hide_index=True, use_container_width=True)
+            st.caption(f"{rapport['rendus']} rendus depuis le démarrage du processus")
+    
+    def display_strategic_metrics(self, kpi):
+        """Métriques stratégiques avancées (lues dans la synthèse des indicateurs)"""
         st.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        derniere_annee = df['Annee'].max()
-        data_actuelle = df[df['Annee'] == derniere_annee].iloc[0]
-        data_2000 = df[df['Annee'] == 2000].iloc[0]
+        actuel, croissance = kpi.actuel, kpi.croissance
+        # Années des bornes de l'horizon (années décimales en résolution infra-annuelle)
+        reference, finale = int(kpi.annee_reference), int(kpi.annee_finale)
         
         # Première ligne de métriques
         col1, col2, col3, col4 = st.columns(4)
@@ -467,11 +2365,11 @@ class DefenseRussieDashboardAvance:
         with col1:
             st.markdown("""
             <div class="metric-card">
-                <h4>💰 BUDGET DÉFENSE 2027</h4>
+                <h4>💰 BUDGET DÉFENSE {}</h4>
                 <h2>{:.1f} Md$</h2>
                 <p>📈 {:.1f}% du PIB</p>
             </div>
-            """.format(data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
+            """.format(finale, actuel['Budget_Defense_Mds'], actuel['PIB_Militaire_Pourcent']), 
             unsafe_allow_html=True)
         
         with col2:
@@ -479,10 +2377,9 @@ class DefenseRussieDashboardAvance:
             <div class="metric-card">
                 <h4>👥 EFFECTIFS TOTAUX</h4>
                 <h2>{:,.0f}K</h2>
-                <p>⚔️ +{:.1f}% depuis 2000</p>
+                <p>⚔️ {:+.1f}% depuis {}</p>
             </div>
-            """.format(data_actuelle['Personnel_Milliers'], 
-                     ((data_actuelle['Personnel_Milliers'] - data_2000['Personnel_Milliers']) / data_2000['Personnel_Milliers']) * 100), 
+            """.format(actuel['Personnel_Milliers'], croissance['Personnel_Milliers'], reference), 
             unsafe_allow_html=True)
         
         with col3:
@@ -492,8 +2389,8 @@ class DefenseRussieDashboardAvance:
                 <h2>{:.0f}%</h2>
                 <p>🚀 {} ogives stratégiques</p>
             </div>
-            """.format(data_actuelle['Capacite_Dissuasion'], 
-                     int(data_actuelle.get('Stock_Ogives_Nucleaires', 0))), 
+            """.format(actuel['Capacite_Dissuasion'], 
+                     int(actuel['Stock_Ogives_Nucleaires']) if 'Stock_Ogives_Nucleaires' in kpi else 0), 
             unsafe_allow_html=True)
         
         with col4:
@@ -503,116 +2400,156 @@ class DefenseRussieDashboardAvance:
                 <h2>{:.0f}%</h2>
                 <p>⚡ {} systèmes déployés</p>
             </div>
-            """.format(data_actuelle['Developpement_Technologique'], 
-                     int(data_actuelle.get('Nouveaux_Systemes', 0))), 
+            """.format(actuel['Developpement_Technologique'], 
+                     int(actuel['Nouveaux_Systemes']) if 'Nouveaux_Systemes' in kpi else 0), 
             unsafe_allow_html=True)
         
         # Deuxième ligne de métriques
         col5, col6, col7, col8 = st.columns(4)
         
         with col5:
-            reduction_temps = ((data_2000['Temps_Mobilisation_Jours'] - data_actuelle['Temps_Mobilisation_Jours']) / 
-                             data_2000['Temps_Mobilisation_Jours']) * 100
             st.metric(
                 "⏱️ Temps Mobilisation",
-                f"{data_actuelle['Temps_Mobilisation_Jours']:.1f} jours",
-                f"{reduction_temps:+.1f}%"
+                f"{actuel['Temps_Mobilisation_Jours']:.1f} jours",
+                f"{-croissance['Temps_Mobilisation_Jours']:+.1f}%"
             )
         
         with col6:
-            croissance_ad = ((data_actuelle['Couverture_AD'] - data_2000['Couverture_AD']) / 
-                           data_2000['Couverture_AD']) * 100
             st.metric(
                 "🛡️ Défense Anti-Aérienne",
-                f"{data_actuelle['Couverture_AD']:.1f}%",
-                f"{croissance_ad:+.1f}%"
+                f"{actuel['Couverture_AD']:.1f}%",
+                f"{croissance['Couverture_AD']:+.1f}%"
             )
         
         with col7:
-            if 'Portee_Max_Missiles_Km' in df.columns:
-                croissance_portee = ((data_actuelle['Portee_Max_Missiles_Km'] - data_2000.get('Portee_Max_Missiles_Km', 11000)) / 
-                                   data_2000.get('Portee_Max_Missiles_Km', 11000)) * 100
+            if 'Portee_Max_Missiles_Km' in kpi:
                 st.metric(
                     "🎯 Portée Missiles Max",
-                    f"{data_actuelle['Portee_Max_Missiles_Km']:,.0f} km",
-                    f"{croissance_portee:+.1f}%"
+                    f"{actuel['Portee_Max_Missiles_Km']:,.0f} km",
+                    f"{croissance['Portee_Max_Missiles_Km']:+.1f}%"
                 )
         
         with col8:
             st.metric(
                 "📊 Préparation Opérationnelle",
-                f"{data_actuelle['Readiness_Operative']:.1f}%",
-                f"+{(data_actuelle['Readiness_Operative'] - data_2000['Readiness_Operative']):.1f}%"
+                f"{actuel['Readiness_Operative']:.1f}%",
+                f"+{kpi.ecart['Readiness_Operative']:.1f}%"
             )
     
-    def create_comprehensive_analysis(self, df, config):
+    def create_comprehensive_analysis(self, df, config, controls):
         """Analyse complète multidimensionnelle"""
         st.markdown('<h3 class="section-header">📊 ANALYSE MULTIDIMENSIONNELLE</h3>', 
                    unsafe_allow_html=True)
         
+        # Bandes d'incertitude : calculées une fois par combinaison, l'intervalle ne fait que les relire
+        bandes = None
+        if controls['monte_carlo']:
+            with st.spinner(f"Tirage de {controls['tirages']:,} trajectoires..."):
+                bandes = self.generate_monte_carlo_bands(controls['selection'], controls['scenario'],
+                                                         controls['tirages'], annee_debut=controls['annee_debut'],
+                                                         annee_fin=controls['annee_fin'], pas=controls['pas'])
+        
         # Graphiques principaux
         col1, col2 = st.columns(2)
         
         with col1:
-            # Évolution des capacités principales
-            fig = go.Figure()
-            
-            capacites = ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Couverture_AD']
-            noms = ['Préparation Opér.', 'Dissuasion Strat.', 'Capacités Cyber', 'Défense Anti-Aérienne']
-            couleurs = ['#0033A0', '#D52B1E', '#2d3436', '#4B0082']
-            
-            for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
-                if cap in df.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df['Annee'], y=df[cap],
-                        mode='lines', name=nom,
-                        line=dict(color=couleur, width=4),
-                        hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
-                    ))
-            
-            fig.update_layout(
-                title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES (2000-2027)",
-                xaxis_title="Année",
-                yaxis_title="Niveau de Capacité (%)",
-                height=500,
-                template="plotly_white",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            if bandes is None:
+                self.plot_figure(*self.define_data_figures(df)['capacites'])
+            else:
+                self.plot_figure(('capacites', df.attrs.get('cle'), bandes.cle, controls['intervalle']),
+                                 lambda: self.build_capabilities_figure(df, bandes, controls['intervalle']))
         
         with col2:
-            # Analyse des programmes stratégiques
-            strategic_data = []
-            strategic_names = []
-            
-            if 'Stock_Ogives_Nucleaires' in df.columns:
-                strategic_data.append(df['Stock_Ogives_Nucleaires'] / 100)  # Normalisation
-                strategic_names.append('Stock Ogives (x100)')
-            
-            if 'Tests_Missiles' in df.columns:
-                strategic_data.append(df['Tests_Missiles'])
-                strategic_names.append('Tests de Missiles')
-            
-            if 'Nouveaux_Systemes' in df.columns:
-                strategic_data.append(df['Nouveaux_Systemes'])
-                strategic_names.append('Nouveaux Systèmes')
-            
-            if strategic_data:
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                
-                for i, (data, nom) in enumerate(zip(strategic_data, strategic_names)):
-                    fig.add_trace(
-                        go.Scatter(x=df['Annee'], y=data, name=nom,
-                                 line=dict(width=4)),
-                        secondary_y=(i > 0)
-                    )
-                
-                fig.update_layout(
-                    title="🚀 PROGRAMMES STRATÉGIQUES - ÉVOLUTION COMPARÉE",
-                    height=500,
-                    template="plotly_white"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_data_figures(df)['programmes'])
+    
+    def build_capabilities_figure(self, df, bandes=None, intervalle=(5, 95)):
+        """Évolution des capacités principales, avec bandes Monte Carlo optionnelles"""
+        fig = go.Figure()
+        
+        for cap, (nom, couleur) in CAPACITES_PRINCIPALES.items():
+            if bandes is not None and cap in bandes:
+                bas, haut = bandes.band(cap, *intervalle)
+                annees = bandes.annees
+                if len(annees) > POINTS_MAX_TRACE:
+                    # Mêmes indices pour les deux bornes (au plus POINTS_MAX_TRACE) : le remplissage reste aligné
+                    indices = np.union1d(decimate_minmax(bas, POINTS_MAX_TRACE // 4),
+                                         decimate_minmax(haut, POINTS_MAX_TRACE // 4))
+                    annees, bas, haut = annees[indices], bas[indices], haut[indices]
+                rouge, vert, bleu = (int(couleur[j:j + 2], 16) for j in (1, 3, 5))
+                fig.add_trace(go.Scatter(
+                    x=annees, y=haut, mode='lines', line=dict(width=0),
+                    legendgroup=nom, showlegend=False, hoverinfo='skip'
+                ))
+                fig.add_trace(go.Scatter(
+                    x=annees, y=bas, mode='lines', line=dict(width=0),
+                    fill='tonexty', fillcolor=f'rgba({rouge}, {vert}, {bleu}, 0.2)',
+                    legendgroup=nom, showlegend=False, hoverinfo='skip'
+                ))
+            if cap in df.columns:
+                x, y = decimate(df['Annee'], df[cap])
+                fig.add_trace(go.Scatter(
+                    x=x, y=y,
+                    mode='lines', name=nom,
+                    line=dict(color=couleur, width=4),
+                    hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>",
+                    legendgroup=nom
+                ))
+        
+        titre = f"📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES ({int(df['Annee'].min())}-{int(df['Annee'].max())})"
+        if bandes is not None:
+            titre += f" — P{intervalle[0]}-P{intervalle[1]}, {bandes.tirages:,} tirages"
+        fig.update_layout(
+            title=titre,
+            xaxis_title="Année",
+            yaxis_title="Niveau de Capacité (%)",
+            height=500,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    
+    def programme_series(self, df):
+        """Séries des programmes stratégiques présentes dans la frame : (noms, séries)"""
+        strategic_data = []
+        strategic_names = []
+        
+        if 'Stock_Ogives_Nucleaires' in df.columns:
+            strategic_data.append(df['Stock_Ogives_Nucleaires'] / 100)  # Normalisation
+            strategic_names.append('Stock Ogives (x100)')
+        
+        if 'Tests_Missiles' in df.columns:
+            strategic_data.append(df['Tests_Missiles'])
+            strategic_names.append('Tests de Missiles')
+        
+        if 'Nouveaux_Systemes' in df.columns:
+            strategic_data.append(df['Nouveaux_Systemes'])
+            strategic_names.append('Nouveaux Systèmes')
+        
+        return strategic_names, strategic_data
+    
+    def build_programmes_figure(self, df):
+        """Analyse des programmes stratégiques (None sans programme à afficher)"""
+        strategic_names, strategic_data = self.programme_series(df)
+        if not strategic_data:
+            return None
+        
+        make_subplots = timed_import('plotly.subplots').make_subplots
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        
+        for i, (data, nom) in enumerate(zip(strategic_data, strategic_names)):
+            x, y = decimate(df['Annee'], data)
+            fig.add_trace(
+                go.Scatter(x=x, y=y, name=nom,
+                         line=dict(width=4)),
+                secondary_y=(i > 0)
+            )
+        
+        fig.update_layout(
+            title="🚀 PROGRAMMES STRATÉGIQUES - ÉVOLUTION COMPARÉE",
+            height=500,
+            template="plotly_white"
+        )
+        return fig
     
     def create_geopolitical_analysis(self, df, config):
         """Analyse géopolitique avancée"""
@@ -645,30 +2582,33 @@ class DefenseRussieDashboardAvance:
             """, unsafe_allow_html=True)
         
         with col2:
-            # Analyse des sanctions
-            sanctions_data = {
-                'Année': [2014, 2016, 2018, 2020, 2022, 2023],
-                'Sanctions': ['Crimée', 'Syrie', 'Skripal', 'Nord Stream 2', 'Opération Spéciale', 'Nouvelles sanctions'],
-                'Impact': [4, 5, 6, 5, 8, 9]  # sur 10
-            }
-            sanctions_df = pd.DataFrame(sanctions_data)
-            
-            fig = px.bar(sanctions_df, x='Année', y='Impact', 
-                        title="📉 IMPACT DES SANCTIONS INTERNATIONALES",
-                        labels={'Impact': 'Niveau d\'Impact'},
-                        color='Impact',
-                        color_continuous_scale='reds')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Indice d'autosuffisance
-            autosuffisance = [min(70 + 2 * (annee - 2000), 95) for annee in df['Annee']]
-            fig = px.area(x=df['Annee'], y=autosuffisance,
-                         title="🛠️ AUTOSUFFISANCE MILITAIRE - IMPORT SUBSTITUTION",
-                         labels={'x': 'Année', 'y': 'Niveau d\'Autosuffisance (%)'})
-            fig.update_traces(fillcolor='rgba(213, 43, 30, 0.3)', line_color='#D52B1E')
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['sanctions'])
+            self.plot_figure(*self.define_data_figures(df)['autosuffisance'])
+    
+    def build_sanctions_figure(self):
+        """Analyse des sanctions (table de référence)"""
+        sanctions_df = self.tables['sanctions']
+        
+        px = timed_import('plotly.express')
+        
+        fig = px.bar(sanctions_df, x='Année', y='Impact', 
+                    title="📉 IMPACT DES SANCTIONS INTERNATIONALES",
+                    labels={'Impact': 'Niveau d\'Impact'},
+                    color='Impact',
+                    color_continuous_scale='reds')
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_self_sufficiency_figure(self, df):
+        """Indice d'autosuffisance"""
+        annees, autosuffisance = decimate(df['Annee'], np.minimum(70 + 2 * (df['Annee'] - 2000), 95))
+        px = timed_import('plotly.express')
+        fig = px.area(x=annees, y=autosuffisance,
+                     title="🛠️ AUTOSUFFISANCE MILITAIRE - IMPORT SUBSTITUTION",
+                     labels={'x': 'Année', 'y': 'Niveau d\'Autosuffisance (%)'})
+        fig.update_traces(fillcolor='rgba(213, 43, 30, 0.3)', line_color='#D52B1E')
+        fig.update_layout(height=300)
+        return fig
     
     def create_technical_analysis(self, df, config):
         """Analyse technique détaillée"""
@@ -678,43 +2618,10 @@ class DefenseRussieDashboardAvance:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Analyse des systèmes d'armes
-            systems_data = {
-                'Système': ['T-14 Armata', 'Su-57 Felon', 'S-500 Prometheus', 
-                           'RS-28 Sarmat', 'Sous-marin Borei', 'Avion MiG-41'],
-                'Portée (km)': [5, 3500, 600, 18000, 10000, 4000],
-                'Année Service': [2020, 2020, 2021, 2022, 2013, 2025],
-                'Statut': ['Production', 'Opérationnel', 'Déploiement', 'Déploiement', 'Opérationnel', 'Développement']
-            }
-            systems_df = pd.DataFrame(systems_data)
-            
-            fig = px.scatter(systems_df, x='Portée (km)', y='Année Service', 
-                           size='Portée (km)', color='Statut',
-                           hover_name='Système', log_x=True,
-                           title="🎯 CARACTÉRISTIQUES DES SYSTÈMES D'ARMES",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['systemes'])
         
         with col2:
-            # Analyse de la modernisation
-            modernization_data = {
-                'Domaine': ['Forces Terrestres', 'Forces Stratégiques', 
-                          'Défense Aérienne', 'Marine', 'Forces Aérospatiales'],
-                'Niveau 2000': [40, 70, 60, 50, 45],
-                'Niveau 2027': [85, 95, 92, 80, 88]
-            }
-            modern_df = pd.DataFrame(modernization_data)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='2000', x=modern_df['Domaine'], y=modern_df['Niveau 2000'],
-                                marker_color='#0033A0'))
-            fig.add_trace(go.Bar(name='2027', x=modern_df['Domaine'], y=modern_df['Niveau 2027'],
-                                marker_color='#D52B1E'))
-            
-            fig.update_layout(title="📈 MODERNISATION DES CAPACITÉS MILITAIRES",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['modernisation'])
             
             # Cartographie des installations
             st.markdown("""
@@ -727,6 +2634,35 @@ class DefenseRussieDashboardAvance:
             </div>
             """, unsafe_allow_html=True)
     
+    def build_systems_figure(self):
+        """Analyse des systèmes d'armes (systèmes du catalogue dont l'année de service est connue)"""
+        systems_df = self.catalogue.frame(self.catalogue.query(annee_service=(None, None)),
+                                          ['Système', 'Portée (km)', 'Année Service', 'Statut'])
+        
+        px = timed_import('plotly.express')
+        
+        fig = px.scatter(systems_df, x='Portée (km)', y='Année Service', 
+                       size='Portée (km)', color='Statut',
+                       hover_name='Système', log_x=True,
+                       title="🎯 CARACTÉRISTIQUES DES SYSTÈMES D'ARMES",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_modernization_figure(self):
+        """Analyse de la modernisation (table de référence)"""
+        modern_df = self.tables['modernisation']
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name='2000', x=modern_df['Domaine'], y=modern_df['Niveau 2000'],
+                            marker_color='#0033A0'))
+        fig.add_trace(go.Bar(name='2027', x=modern_df['Domaine'], y=modern_df['Niveau 2027'],
+                            marker_color='#D52B1E'))
+        
+        fig.update_layout(title="📈 MODERNISATION DES CAPACITÉS MILITAIRES",
+                         barmode='group', height=500)
+        return fig
+    
     def create_doctrinal_analysis(self, config):
         """Analyse doctrinale avancée"""
         st.markdown('<h3 class="section-header">📚 ANALYSE DOCTRINALE</h3>', 
@@ -790,42 +2726,10 @@ class DefenseRussieDashboardAvance:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Matrice des menaces
-            threats_data = {
-                'Type de Menace': ['Expansion OTAN', 'Frappe de Décapitation', 'Guerre Cyber', 
-                                 'Encerclement Stratégique', 'Instabilité Périphérique', 'Sanctions Économiques'],
-                'Probabilité': [0.8, 0.3, 0.9, 0.7, 0.6, 0.9],
-                'Impact': [0.8, 0.9, 0.7, 0.8, 0.5, 0.7],
-                'Niveau Préparation': [0.9, 0.95, 0.8, 0.7, 0.6, 0.5]
-            }
-            threats_df = pd.DataFrame(threats_data)
-            
-            fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
-                           size='Niveau Préparation', color='Type de Menace',
-                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['menaces'])
         
         with col2:
-            # Capacités de réponse
-            response_data = {
-                'Scénario': ['Conflit Régional', 'Crise Nucléaire', 'Guerre Cyber', 
-                           'Opérations Hybrides', 'Intervention Étrangère'],
-                'Dissuasion': [0.7, 1.0, 0.3, 0.8, 0.9],
-                'Défense': [0.8, 0.4, 0.7, 0.6, 0.8],
-                'Riposte': [0.9, 1.0, 0.8, 0.9, 0.95]
-            }
-            response_df = pd.DataFrame(response_data)
-            
-            fig = go.Figure(data=[
-                go.Bar(name='Dissuasion', x=response_df['Scénario'], y=response_df['Dissuasion']),
-                go.Bar(name='Défense', x=response_df['Scénario'], y=response_df['Défense']),
-                go.Bar(name='Riposte', x=response_df['Scénario'], y=response_df['Riposte'])
-            ])
-            fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR SCÉNARIO",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['reponses'])
         
         # Recommandations stratégiques
         st.markdown("""
@@ -842,35 +2746,45 @@ class DefenseRussieDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
     
+    def build_threat_matrix_figure(self):
+        """Matrice des menaces (table de référence)"""
+        threats_df = self.tables['menaces']
+        
+        px = timed_import('plotly.express')
+        
+        fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
+                       size='Niveau Préparation', color='Type de Menace',
+                       title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_response_figure(self):
+        """Capacités de réponse (table de référence)"""
+        response_df = self.tables['reponses']
+        
+        fig = go.Figure(data=[
+            go.Bar(name='Dissuasion', x=response_df['Scénario'], y=response_df['Dissuasion']),
+            go.Bar(name='Défense', x=response_df['Scénario'], y=response_df['Défense']),
+            go.Bar(name='Riposte', x=response_df['Scénario'], y=response_df['Riposte'])
+        ])
+        fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR SCÉNARIO",
+                         barmode='group', height=500)
+        return fig
+    
     def create_nuclear_database(self):
         """Base de données des systèmes nucléaires"""
         st.markdown('<h3 class="section-header">☢️ BASE DE DONNÉES DES SYSTÈMES STRATÉGIQUES</h3>', 
                    unsafe_allow_html=True)
         
-        nuclear_data = []
-        for nom, specs in self.nuclear_arsenal.items():
-            nuclear_data.append({
-                'Système': nom,
-                'Type': specs['type'],
-                'Portée (km)': specs['portee'],
-                'Ogives': specs['ogives'],
-                'Statut': specs['statut'],
-                'Classification': 'Offensif' if specs['type'] in ['ICBM', 'SLBM'] else 'Défensif'
-            })
-        
-        nuclear_df = pd.DataFrame(nuclear_data)
+        # Positions lues dans l'index du catalogue ; la figure n'est construite qu'une fois
+        nucleaires = self.catalogue.query(nucleaire=True)
         
         # Affichage interactif
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig = px.scatter(nuclear_df, x='Portée (km)', y='Ogives',
-                           size='Portée (km)', color='Classification',
-                           hover_name='Système', log_x=True,
-                           title="☢️ CARACTÉRISTIQUES DES SYSTÈMES NUCLÉAIRES",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_figure(*self.define_static_figures()['nucleaire'])
         
         with col2:
             st.markdown("""
@@ -878,7 +2792,7 @@ class DefenseRussieDashboardAvance:
                 <h4>📋 INVENTAIRE STRATÉGIQUE</h4>
             """, unsafe_allow_html=True)
             
-            for systeme in nuclear_data:
+            for systeme in self.catalogue.records(nucleaires):
                 st.markdown(f"""
                 <div style="background: rgba(255,255,255,0.1); padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
                     <strong>{systeme['Système']}</strong><br>
@@ -889,53 +2803,474 @@ class DefenseRussieDashboardAvance:
             
             st.markdown("</div>", unsafe_allow_html=True)
     
+    def build_nuclear_figure(self, positions):
+        """Caractéristiques des systèmes nucléaires du catalogue"""
+        nuclear_df = self.catalogue.frame(positions, ['Système', 'Type', 'Portée (km)', 'Ogives', 'Statut',
+                                                      'Classification'])
+        
+        px = timed_import('plotly.express')
+        
+        fig = px.scatter(nuclear_df, x='Portée (km)', y='Ogives',
+                       size='Portée (km)', color='Classification',
+                       hover_name='Système', log_x=True,
+                       title="☢️ CARACTÉRISTIQUES DES SYSTÈMES NUCLÉAIRES",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def get_figure_spec(self, cle, construction):
+        """JSON d'une figure, construite et validée une seule fois par clé : (spec, infos de rendu, hit)
+        
+        Une clé contenant None (données hors cache) désactive la mise en cache.
+        """
+        if None in cle:
+            return (*render_figure(construction()), None)
+        (spec, infos), hit = get_figure_cache().lookup(cle, lambda: self.load_figure(cle, construction))
+        return spec, infos, hit
+    
+    def load_figure(self, cle, construction):
+        """Figure relue du stockage sur disque, ou construite, rendue puis écrite : (spec, infos)"""
+        def rendu():
+            spec, infos = render_figure(construction())
+            octets = np.frombuffer(spec.encode('utf-8'), dtype=np.uint8) if spec else np.empty(0, dtype=np.uint8)
+            return {'spec': octets}, {'infos': infos, 'vide': spec is None}
+        
+        colonnes, meta = get_store().load_or_save('figures', cle, rendu)
+        spec = None if meta['vide'] else colonnes['spec'].tobytes().decode('utf-8')
+        return spec, meta['infos']
+    
+    def get_figure(self, cle, construction):
+        """Figure servie par le cache ; le JSON étant déjà validé, elle est reconstruite sans validation"""
+        spec, _, _ = self.get_figure_spec(cle, construction)
+        return None if spec is None else go.Figure(json.loads(spec), _validate=False)
+    
+    def generate_report(self, selections, scenario="Statut Quo", annee_debut=2000, annee_fin=2027, pas=1,
+                        format_='pdf', dpi=DPI_RAPPORT):
+        """Lance, ou retrouve, le rendu d'un rapport en arrière-plan ; retourne sa clé sans attendre"""
+        cle = (tuple(selections), scenario, annee_debut, annee_fin, pas, format_, dpi, self.moteur.version,
+               self.compact)
+        get_report_jobs().submit(cle, lambda progression: self.get_report(cle, progression))
+        return cle
+    
+    def get_report(self, cle, progression=None):
+        """Rapport servi par le cache (mémoire, puis disque), rendu s'il n'y figure pas"""
+        rapport, _ = get_report_cache().lookup(cle, lambda: self.compute_report(cle, progression))
+        return rapport
+    
+    def compute_report(self, cle, progression=None):
+        """Rend un rapport : page de synthèse et une page par sélection, en parallèle dans le pool
+        
+        Les pages et le rapport assemblé sont conservés dans le stockage sur disque :
+        réimprimer un rapport, ou une page commune à deux rapports, ne coûte rien.
+        """
+        selections, scenario, annee_debut, annee_fin, pas, format_, dpi = cle[:7]
+        progression = progression or (lambda faites, total: None)
+        
+        def rendu():
+            debut = time.perf_counter()
+            module = importable_module()
+            pages = [('synthese', None)] + [('selection', selection) for selection in selections]
+            total = len(pages) + 1
+            octets, futurs = [None] * len(pages), {}
+            for i, (page, selection) in enumerate(pages):
+                cle_page = (page, selection, scenario, annee_debut, annee_fin, pas, dpi, self.compact)
+                stocke = get_store().load('pages', cle_page)
+                if stocke is not None:
+                    octets[i] = stocke[0]['png'].tobytes()
+                else:
+                    futur = get_process_pool().submit(module.render_report_page, page, selection, scenario,
+                                                      annee_debut, annee_fin, pas, self.compact, dpi)
+                    futurs[futur] = (i, cle_page)
+            faites = len(pages) - len(futurs)
+            progression(faites, total)
+            for futur in as_completed(futurs):
+                i, cle_page = futurs[futur]
+                octets[i] = futur.result()
+                get_store().save('pages', cle_page, {'png': np.frombuffer(octets[i], dtype=np.uint8)})
+                faites += 1
+                progression(faites, total)
+            titre = f"Briefing stratégique — {scenario}, {annee_debut}-{annee_fin}"
+            rapport = get_process_pool().submit(module.assemble_report, octets, format_, dpi, titre).result()
+            progression(total, total)
+            return ({'octets': np.frombuffer(rapport, dtype=np.uint8)},
+                    {'pages': len(pages), 'duree': time.perf_counter() - debut})
+        
+        colonnes, meta = get_store().load_or_save('rapports', cle, rendu)
+        return RapportImprimable(colonnes['octets'].tobytes(), format_, meta['pages'], meta['duree'])
+    
+    def draw_capabilities_chart(self, ax, df):
+        """Évolution des capacités principales (matplotlib)"""
+        for cap, (nom, couleur) in CAPACITES_PRINCIPALES.items():
+            if cap in df.columns:
+                ax.plot(*decimate(df['Annee'], df[cap]), label=nom, color=couleur, linewidth=2)
+        ax.set_title("Évolution des capacités stratégiques")
+        ax.set_xlabel("Année")
+        ax.set_ylabel("Niveau de capacité (%)")
+        ax.legend(loc='lower right', fontsize='small')
+    
+    def draw_programmes_chart(self, ax, df):
+        """Programmes stratégiques (matplotlib) ; les séries suivantes sur un axe secondaire"""
+        noms, series = self.programme_series(df)
+        axes = [ax]
+        if len(series) > 1:
+            axes.append(ax.twinx())
+            axes[1].grid(False)
+        couleurs = ['#D52B1E', '#0033A0', '#2d3436']
+        for i, (nom, serie) in enumerate(zip(noms, series)):
+            axes[min(i, 1)].plot(*decimate(df['Annee'], serie), label=nom, color=couleurs[i], linewidth=2)
+        ax.set_title("Programmes stratégiques - évolution comparée")
+        ax.set_xlabel("Année")
+        lignes = [ligne for axe in axes for ligne in axe.get_lines()]
+        ax.legend(lignes, [ligne.get_label() for ligne in lignes], loc='upper left', fontsize='small')
+    
+    def draw_sanctions_chart(self, ax):
+        """Impact des sanctions (matplotlib)"""
+        sanctions_df = self.tables['sanctions']
+        cmap = timed_import('matplotlib').colormaps['Reds']
+        etiquettes = [f"{annee} • {sanctions}" for annee, sanctions in
+                      zip(sanctions_df['Année'], sanctions_df['Sanctions'])]
+        ax.barh(etiquettes, sanctions_df['Impact'], color=cmap(sanctions_df['Impact'] / 10))
+        ax.invert_yaxis()
+        ax.set_title("Impact des sanctions internationales")
+        ax.set_xlabel("Niveau d'impact (/10)")
+    
+    def draw_threat_chart(self, ax):
+        """Matrice des menaces, probabilité contre impact (matplotlib)"""
+        threats_df = self.tables['menaces']
+        for _, menace in threats_df.iterrows():
+            ax.scatter(menace['Probabilité'], menace['Impact'], s=menace['Niveau Préparation'] * 400,
+                       alpha=0.7, label=menace['Type de Menace'])
+        ax.set_title("Matrice des risques - probabilité vs impact")
+        ax.set_xlabel("Probabilité")
+        ax.set_ylabel("Impact")
+        ax.legend(fontsize='x-small', loc='lower left', markerscale=0.4)
+    
+    def draw_nuclear_chart(self, ax):
+        """Systèmes nucléaires, portée contre ogives (matplotlib)"""
+        nuclear_df = self.catalogue.frame(self.catalogue.query(nucleaire=True),
+                                          ['Système', 'Portée (km)', 'Ogives', 'Classification'])
+        nuclear_df = nuclear_df.astype({'Portée (km)': float, 'Ogives': float})
+        couleurs = {'Offensif': '#D52B1E', 'Défensif': '#0033A0'}
+        for classification, groupe in nuclear_df.groupby('Classification', observed=True):
+            ax.scatter(groupe['Portée (km)'], groupe['Ogives'], s=groupe['Portée (km)'] / 30, alpha=0.7,
+                       color=couleurs.get(classification), label=classification)
+        for _, systeme in nuclear_df.iterrows():
+            ax.annotate(systeme['Système'], (systeme['Portée (km)'], systeme['Ogives']), fontsize='x-small',
+                        xytext=(4, 4), textcoords='offset points')
+        ax.set_xscale('log')
+        ax.set_title("Caractéristiques des systèmes nucléaires")
+        ax.set_xlabel("Portée (km)")
+        ax.set_ylabel("Ogives")
+        ax.legend(fontsize='small')
+    
+    def draw_summary_page(self, fig, scenario, annee_debut, annee_fin):
+        """Page de synthèse du rapport : sanctions, menaces et systèmes nucléaires"""
+        fig.suptitle(f"BRIEFING STRATÉGIQUE - FÉDÉRATION DE RUSSIE\n"
+                     f"Scénario : {scenario} • Horizon {annee_debut}-{annee_fin}", fontweight='bold')
+        grille = fig.add_gridspec(2, 2)
+        self.draw_sanctions_chart(fig.add_subplot(grille[0, 0]))
+        self.draw_threat_chart(fig.add_subplot(grille[0, 1]))
+        self.draw_nuclear_chart(fig.add_subplot(grille[1, :]))
+    
+    def draw_selection_page(self, fig, selection, scenario, annee_debut, annee_fin, pas=1):
+        """Page d'une sélection : capacités, programmes et indicateurs clés"""
+        df, _ = self.generate_advanced_data(selection, scenario, annee_debut, annee_fin, pas)
+        synthese = self.generate_kpi_summary(selection, scenario, annee_debut, annee_fin, pas)
+        fig.suptitle(f"{selection.upper()}\nScénario : {scenario} • Horizon {annee_debut}-{annee_fin}",
+                     fontweight='bold')
+        grille = fig.add_gridspec(2, 2, height_ratios=[3, 2])
+        programmes = bool(self.programme_series(df)[1])
+        self.draw_capabilities_chart(fig.add_subplot(grille[0, 0] if programmes else grille[0, :]), df)
+        if programmes:
+            self.draw_programmes_chart(fig.add_subplot(grille[0, 1]), df)
+        
+        ax = fig.add_subplot(grille[1, :])
+        ax.axis('off')
+        indicateurs = synthese.frame().head(8)
+        cellules = [[f"{valeur:,.1f}" if np.isfinite(valeur) else "-" for valeur in ligne]
+                    for ligne in indicateurs.to_numpy(float)]
+        table = ax.table(cellText=cellules, rowLabels=[nom.replace('_', ' ') for nom in indicateurs.index],
+                         colLabels=list(indicateurs.columns), loc='center', cellLoc='right')
+        table.auto_set_font_size(False)
+        table.set_fontsize(8)
+        ax.set_title("Indicateurs clés")
+    
+    def define_data_figures(self, df):
+        """Figures des sections qui ne dépendent que d'une frame : {nom: (clé de cache, construction)}"""
+        cle = df.attrs.get('cle')
+        return {
+            'capacites': (('capacites', cle), lambda: self.build_capabilities_figure(df)),
+            'programmes': (('programmes', cle), lambda: self.build_programmes_figure(df)),
+            'autosuffisance': (('autosuffisance', cle), lambda: self.build_self_sufficiency_figure(df)),
+        }
+    
+    def define_static_figures(self):
+        """Figures des tables de référence et du catalogue : {nom: (clé de cache, construction)}"""
+        return {
+            'sanctions': (('sanctions',), self.build_sanctions_figure),
+            'systemes': (('systemes',), self.build_systems_figure),
+            'modernisation': (('modernisation',), self.build_modernization_figure),
+            'menaces': (('menaces',), self.build_threat_matrix_figure),
+            'reponses': (('reponses',), self.build_response_figure),
+            'nucleaire': (('nucleaire',), lambda: self.build_nuclear_figure(self.catalogue.query(nucleaire=True))),
+        }
+    
+    def define_warmup_tasks(self, annee_debut=2000, annee_fin=2027, pas=1):
+        """Tâches de préchauffage : figures statiques, puis chaque combinaison (scénario par scénario)
+        
+        L'horizon est celui des contrôles par défaut, premier affiché par chaque session.
+        """
+        taches = [(nom, functools.partial(self.get_figure_spec, cle, construction))
+                  for nom, (cle, construction) in self.define_static_figures().items()]
+        selections = list(dict.fromkeys(self.branches_options + self.programmes_options))
+        for scenario in self.scenarios_options:
+            for selection in selections:
+                taches.append((f"{selection} • {scenario}", functools.partial(
+                    self.warm_combination, selection, scenario, annee_debut, annee_fin, pas)))
+        return taches
+    
+    def warm_combination(self, selection, scenario, annee_debut=2000, annee_fin=2027, pas=1):
+        """Données, synthèse et figures d'une combinaison, déposées dans les caches partagés"""
+        df, _ = self.generate_advanced_data(selection, scenario, annee_debut, annee_fin, pas)
+        self.generate_kpi_summary(selection, scenario, annee_debut, annee_fin, pas)
+        for cle, construction in self.define_data_figures(df).values():
+            self.get_figure_spec(cle, construction)
+    
+    def plot_figure(self, cle, construction):
+        """Affiche une figure servie par le cache de figures (rendu SVG ou WebGL selon le nombre de points)"""
+        with current_tracer().span(f"plotly_chart {cle[0]}", 'figure') as details:
+            spec, infos, hit = self.get_figure_spec(cle, construction)
+            details['cache'] = {True: 'hit', False: 'miss', None: 'aucun'}[hit]
+            details['octets'] = len(spec) if spec else 0
+            if spec is not None:
+                details.update(infos)
+                st.plotly_chart(go.Figure(json.loads(spec), _validate=False), use_container_width=True)
+    
     def run_advanced_dashboard(self):
         """Exécute le dashboard avancé complet"""
-        # Sidebar avancé
-        controls = self.create_advanced_sidebar()
-        
-        # Header avancé
-        self.display_advanced_header()
-        
-        # Génération des données avancées
-        df, config = self.generate_advanced_data(controls['selection'])
-        
-        # Navigation par onglets avancés
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📊 Tableau de Bord", 
-            "🔬 Analyse Technique", 
-            "🌍 Contexte Géopolitique", 
-            "📚 Doctrine Militaire",
-            "⚠️ Évaluation Menaces",
-            "☢️ Systèmes Stratégiques",
-            "💎 Synthèse Stratégique"
-        ])
+        # Nouveau traceur pour ce rerun (les reruns de fragments s'y ajoutent)
+        traceur = st.session_state['traceur'] = TraceurPerformance()
         
-        with tab1:
-            self.display_strategic_metrics(df, config)
-            self.create_comprehensive_analysis(df, config)
+        with traceur.span('run_advanced_dashboard', 'rerun'):
+            # Sidebar avancé
+            controls = self.create_advanced_sidebar()
+            
+            # Header avancé
+            self.display_advanced_header(controls)
+            
+            if controls['navigation_paresseuse']:
+                # Seule la section choisie est calculée ; le choix persiste dans la session
+                section = st.radio("Section:", list(self.sections), horizontal=True,
+                                   key='section_active', label_visibility="collapsed")
+                self.render_section(section, controls)
+            else:
+                # Navigation par onglets avancés : toutes les sections sont calculées
+                for onglet, section in zip(st.tabs(list(self.sections)), self.sections):
+                    with onglet:
+                        self.render_section(section, controls)
+        
+        self.display_cache_stats()
+        self.display_warmup_status()
+        self.display_report_panel(controls)
+        if controls['panneau_performance']:
+            self.display_performance_panel(traceur)
+            self.display_memory_report(controls)
+    
+    def render_section(self, nom, controls):
+        """Affiche une section, chacun de ses rendus dans son propre fragment"""
+        section = self.sections[nom]
+        if 'option' in section and not controls[section['option']]:
+            return
+        
+        for rendu, entrees_declarees in section['rendus']:
+            self.render_fragment(rendu, entrees_declarees, controls)
+    
+    def resolve_inputs(self, entrees_declarees, controls):
+        """Calcule uniquement les entrées déclarées par une section"""
+        entrees = {'controls': controls}
+        if 'kpi' in entrees_declarees:
+            entrees['kpi'] = self.generate_kpi_summary(
+                controls['selection'], controls['scenario'], controls['annee_debut'], controls['annee_fin'],
+                controls['pas'])
+        if 'df' in entrees_declarees:
+            entrees['df'], entrees['config'] = self.generate_advanced_data(
+                controls['selection'], controls['scenario'], controls['annee_debut'], controls['annee_fin'],
+                controls['pas'])
+        elif 'config' in entrees_declarees:
+            entrees['config'] = self.get_advanced_config(controls['selection'])
+        return entrees
+    
+    @st.fragment
+    def render_fragment(self, rendu, entrees_declarees, controls):
+        """Fragment relançable seul : une interaction dans la section ne relance qu'elle"""
+        with current_tracer().span(rendu.__name__, 'section'):
+            entrees = self.resolve_inputs(entrees_declarees, controls)
+            rendu(*[entrees[entree] for entree in entrees_declarees])
+    
+    def create_comparison_analysis(self, controls):
+        """Comparaison de plusieurs branches et programmes sur des axes communs"""
+        st.markdown('<h3 class="section-header">⚖️ COMPARAISON MULTI-BRANCHES</h3>', 
+                   unsafe_allow_html=True)
         
-        with tab2:
-            self.create_technical_analysis(df, config)
+        options = list(dict.fromkeys(self.branches_options + self.programmes_options))
+        col1, col2, col3 = st.columns([3, 1, 1])
+        selections = col1.multiselect("Sélections:", options, key='comparaison_selections',
+                                      default=["Marine Russe", "Forces Aérospatiales", "Forces de Missiles Stratégiques"])
+        metrique = col2.selectbox("Métrique:", self.moteur.metriques, key='comparaison_metrique')
+        mode = col3.radio("Affichage:", ["Superposition", "Petits multiples"], key='comparaison_mode')
+        if not selections:
+            st.info("Sélectionnez au moins une branche ou un programme.")
+            return
+        
+        # Toutes les sélections en un seul appel, sans DataFrame intermédiaire
+        annees, valeurs, actifs = self.generate_comparison(selections, controls['scenario'], controls['annee_debut'],
+                                                           controls['annee_fin'], controls['pas'])
+        k = self.moteur.metriques.index(metrique)
+        series = np.rint(valeurs[..., k]) if self.moteur.entiers[k] else valeurs[..., k]
+        cle = ('comparaison', tuple(selections), controls['scenario'], controls['annee_debut'],
+               controls['annee_fin'], controls['pas'], metrique, mode, self.moteur.version, self.compact)
+        self.plot_figure(cle, lambda: self.build_comparison_figure(annees, series, actifs[:, k],
+                                                                   selections, metrique, mode))
+        
+        # Synthèse : première et dernière valeur de chaque sélection qui calcule la métrique
+        suivies = series[actifs[:, k]]
+        if len(suivies):
+            st.dataframe(pd.DataFrame({
+                'Sélection': [selection for selection, actif in zip(selections, actifs[:, k]) if actif],
+                f"{annees[0]:g}": suivies[:, 0],
+                f"{annees[-1]:g}": suivies[:, -1],
+                'Évolution (%)': (suivies[:, -1] - suivies[:, 0]) / np.abs(suivies[:, 0]) * 100,
+            }), hide_index=True, use_container_width=True)
+        inactives = [selection for selection, actif in zip(selections, actifs[:, k]) if not actif]
+        if inactives:
+            st.caption(f"{metrique} n'est pas suivi pour : {', '.join(inactives)}")
+    
+    def build_comparison_figure(self, annees, series, actifs, selections, metrique, mode):
+        """Une courbe par sélection, superposées ou en petits multiples à axes partagés"""
+        visibles = [(selection, serie) for selection, serie, actif in zip(selections, series, actifs) if actif]
+        if not visibles:
+            return None
+        couleurs = timed_import('plotly.colors').qualitative.Dark24
+        
+        if mode == "Superposition":
+            fig = go.Figure()
+            lignes = 1
+        else:
+            colonnes = min(3, len(visibles))
+            lignes = -(-len(visibles) // colonnes)
+            make_subplots = timed_import('plotly.subplots').make_subplots
+            fig = make_subplots(rows=lignes, cols=colonnes, shared_xaxes=True, shared_yaxes=True,
+                                subplot_titles=[selection for selection, _ in visibles])
+        
+        for i, (selection, serie) in enumerate(visibles):
+            x, y = decimate(annees, serie)
+            trace = go.Scatter(x=x, y=y, mode='lines', name=selection,
+                               line=dict(color=couleurs[i % len(couleurs)], width=3),
+                               hovertemplate=f"{selection}: %{{y:,.1f}}<extra></extra>")
+            if mode == "Superposition":
+                fig.add_trace(trace)
+            else:
+                fig.add_trace(trace, row=i // colonnes + 1, col=i % colonnes + 1)
+        
+        fig.update_layout(title=f"⚖️ {metrique} - {len(visibles)} SÉLECTIONS",
+                          height=max(500, 250 * lignes), template="plotly_white",
+                          showlegend=(mode == "Superposition"))
+        return fig
+    
+    def create_sensitivity_analysis(self, config, controls):
+        """Analyse de sensibilité : balayage vectorisé des hypothèses du modèle"""
+        st.markdown('<h3 class="section-header">🎚️ ANALYSE DE SENSIBILITÉ</h3>', 
+                   unsafe_allow_html=True)
         
-        with tab3:
-            if controls['show_geopolitical']:
-                self.create_geopolitical_analysis(df, config)
+        actives = self.moteur.active_metrics(config)
+        metriques = [metrique for metrique, active in zip(self.moteur.metriques, actives)
+                     if active and self.moteur.metric_levers(metrique)]
         
-        with tab4:
-            if controls['show_doctrinal']:
-                self.create_doctrinal_analysis(config)
+        col1, col2, col3, col4 = st.columns(4)
+        metrique = col1.selectbox("Métrique cible:", metriques, key='sensibilite_metrique')
+        # Fin de l'horizon choisi, ramenée dans les bornes de l'analyse
+        annee = int(col2.number_input("Année:", HORIZON_MIN, HORIZON_MAX,
+                                      min(max(controls['annee_fin'], HORIZON_MIN), HORIZON_MAX),
+                                      key='sensibilite_annee'))
+        amplitude = col3.slider("Amplitude (± %):", 5, 50, 20, step=5, key='sensibilite_amplitude') / 100
+        points = col4.slider("Points par levier:", 3, 101, 15, step=2, key='sensibilite_points')
+        
+        disponibles = self.moteur.metric_levers(metrique)
+        leviers = st.multiselect("Leviers:", disponibles, default=disponibles, key=f'sensibilite_leviers_{metrique}',
+                                 format_func=lambda nom: LEVIERS_SENSIBILITE[nom]['libelle'])
+        if not leviers:
+            st.info("Sélectionnez au moins un levier.")
+            return
+        
+        combinaisons = points ** len(leviers)
+        if combinaisons > TAILLE_MAX_BALAYAGE:
+            st.warning(f"{combinaisons:,} combinaisons : réduisez le nombre de points ou de leviers "
+                       f"(maximum {TAILLE_MAX_BALAYAGE:,}).")
+            return
+        
+        # La barre avance entre deux tranches du balayage ; un résultat en cache s'affiche aussitôt
+        barre = st.progress(0.0, text=f"Balayage de {combinaisons:,} combinaisons...")
+        balayage = self.generate_sensitivity_sweep(
+            controls['selection'], controls['scenario'], metrique, annee, leviers, points, amplitude,
+            lambda fraction: barre.progress(fraction, text=f"Balayage de {combinaisons:,} combinaisons : {fraction:.0%}"))
+        barre.empty()
+        
+        resume = balayage.resume
+        colonnes = st.columns(5)
+        colonnes[0].metric("Référence", f"{balayage.valeur_base:,.1f}")
+        for colonne, (libelle, cle) in zip(colonnes[1:], [("Minimum", 'min'), ("P5", 'p5'),
+                                                           ("P95", 'p95'), ("Maximum", 'max')]):
+            colonne.metric(libelle, f"{resume[cle]:,.1f}", f"{resume[cle] - balayage.valeur_base:+,.1f}")
+        st.caption(f"{combinaisons:,} combinaisons évaluées en {balayage.duree * 1000:.0f} ms")
         
-        with tab5:
-            if controls['threat_assessment']:
-                self.create_threat_assessment(df, config)
+        col1, col2 = st.columns(2)
         
-        with tab6:
-            if controls['show_technical']:
-                self.create_nuclear_database()
+        with col1:
+            self.plot_figure(('tornado', balayage.cle), lambda: self.build_tornado_figure(balayage))
         
-        with tab7:
-            self.create_strategic_synthesis(df, config, controls)
+        with col2:
+            if len(leviers) < 2:
+                st.info("La carte de chaleur croise deux leviers.")
+                return
+            choix1, choix2, choix3 = st.columns(3)
+            levier_x = choix1.selectbox("Axe X:", leviers, index=0, key='sensibilite_x',
+                                        format_func=lambda nom: LEVIERS_SENSIBILITE[nom]['libelle'])
+            levier_y = choix2.selectbox("Axe Y:", [nom for nom in leviers if nom != levier_x], index=0,
+                                        key='sensibilite_y', format_func=lambda nom: LEVIERS_SENSIBILITE[nom]['libelle'])
+            agregation = AGREGATIONS_BALAYAGE[choix3.selectbox("Autres leviers:", list(AGREGATIONS_BALAYAGE),
+                                                               key='sensibilite_agregation')]
+            self.plot_figure(('sensibilite', balayage.cle, levier_x, levier_y, agregation),
+                             lambda: self.build_sweep_heatmap_figure(balayage, levier_x, levier_y, agregation))
+    
+    def build_tornado_figure(self, balayage):
+        """Diagramme tornade : écart à la référence aux bornes de chaque levier"""
+        tornado = balayage.tornado()
+        libelles = [LEVIERS_SENSIBILITE[nom]['libelle'] for nom in tornado['Levier']]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(y=libelles, x=tornado['Bas'] - balayage.valeur_base, orientation='h',
+                             name='Borne basse', marker_color='#0033A0',
+                             customdata=tornado['Bas'], hovertemplate="%{y}: %{customdata:,.1f}<extra></extra>"))
+        fig.add_trace(go.Bar(y=libelles, x=tornado['Haut'] - balayage.valeur_base, orientation='h',
+                             name='Borne haute', marker_color='#D52B1E',
+                             customdata=tornado['Haut'], hovertemplate="%{y}: %{customdata:,.1f}<extra></extra>"))
+        fig.update_layout(title=f"🌪️ SENSIBILITÉ DE {balayage.metrique} EN {balayage.annee}",
+                          xaxis_title=f"Écart à la référence ({balayage.valeur_base:,.1f})",
+                          barmode='overlay', height=500, template="plotly_white")
+        return fig
+    
+    def build_sweep_heatmap_figure(self, balayage, levier_x, levier_y, agregation):
+        """Carte de chaleur de la métrique cible selon deux leviers"""
+        fig = go.Figure(go.Heatmap(
+            x=balayage.grilles[levier_x], y=balayage.grilles[levier_y],
+            z=balayage.heatmap(levier_x, levier_y, agregation),
+            colorscale='RdBu_r', zmid=balayage.valeur_base,
+            colorbar=dict(title=balayage.metrique)
+        ))
+        fig.update_layout(title=f"🗺️ {balayage.metrique} EN {balayage.annee}",
+                          xaxis_title=LEVIERS_SENSIBILITE[levier_x]['libelle'],
+                          yaxis_title=LEVIERS_SENSIBILITE[levier_y]['libelle'],
+                          height=500, template="plotly_white")
+        return fig
     
     def create_strategic_synthesis(self, df, config, controls):
         """Synthèse stratégique finale"""
@@ -1038,7 +3373,17 @@ class DefenseRussieDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner=False)
+def get_dashboard(version_code=VERSION_CODE):
+    """Instance unique du dashboard pour le processus (reconstruite si le code change)"""
+    return DefenseRussieDashboardAvance()
+
 # Lancement du dashboard avancé
 if __name__ == "__main__":
-    dashboard = DefenseRussieDashboardAvance()
-    dashboard.run_advanced_dashboard()
\ No newline at end of file
+    configure_page()
+    dashboard = get_dashboard(VERSION_CODE)
+    dashboard.run_advanced_dashboard()
+    dashboard.display_startup_report(time.perf_counter() - DEBUT_SCRIPT)
+    # Lancé après le premier rendu, qu'il ne retarde pas ; sans effet s'il tourne déjà
+    if PRECHAUFFAGE:
+        get_warmup(dashboard, VERSION_CODE).start()
\ No newline at end of file
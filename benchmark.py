@@ -0,0 +1,358 @@
+# benchmark.py
+"""Benchmarks du dashboard : simulations, données, sections et reruns complets.
+
+Exemples :
+    python benchmark.py --sortie bench.json
+    python benchmark.py --niveaux simulations,donnees --horizons 28,1000,50000
+    python benchmark.py --sortie nouveau.json --comparer bench.json
+
+Chaque mesure rapporte la distribution des latences (ms), le pic mémoire
+Python (tracemalloc) et le nombre net de blocs mémoire encore alloués après
+un appel. Les résultats JSON servent de référence entre deux versions.
+
+Un horizon est un nombre de points par série, obtenu comme dans l'application :
+la résolution la plus grossière dont les années tiennent dans l'horizon
+sélectionnable (à partir de 2000, reculé si besoin jusqu'à 1950). Une section
+en échec est notée dans le JSON sans interrompre les autres mesures.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+# Stockage colonnaire temporaire : les mesures à froid ne lisent pas celui du serveur
+REPERTOIRE_STOCKAGE = tempfile.mkdtemp(prefix='bench_stockage_')
+os.environ['DASHBOARD_STOCKAGE'] = REPERTOIRE_STOCKAGE
+# Pas de préchauffage en arrière-plan : il fausserait les reruns à froid
+os.environ['DASHBOARD_PRECHAUFFAGE'] = '0'
+
+import Dashboard
+
+NIVEAUX = ['demarrage', 'simulations', 'donnees', 'monte_carlo', 'sections', 'reruns']
+TIRAGES_MONTE_CARLO = [10_000, 100_000]
+SELECTION_SECTIONS = "Forces Armées Russes"
+# Méthodes simulate_* qui prennent la configuration de la sélection
+SIMULATIONS_AVEC_CONFIG = ('simulate_advanced_budget', 'simulate_advanced_personnel',
+                           'simulate_advanced_exercises')
+
+
+def silence_streamlit():
+    """Coupe les avertissements du mode « bare » de Streamlit"""
+    from streamlit import config
+    config.get_option('logger.level')
+    for nom in list(logging.root.manager.loggerDict):
+        if nom.startswith('streamlit'):
+            logging.getLogger(nom).setLevel(logging.ERROR)
+
+
+def horizon_controls(points):
+    """Contrôles sélectionnables (annee_debut, annee_fin, pas) donnant au moins `points` points"""
+    etendue = Dashboard.HORIZON_MAX - Dashboard.HORIZON_MIN + 1
+    for pas in sorted(Dashboard.RESOLUTIONS.values()):
+        annees = math.ceil(points / pas)
+        if annees <= etendue:
+            annee_debut = min(2000, Dashboard.HORIZON_MAX - annees + 1)
+            return annee_debut, annee_debut + annees - 1, pas
+    raise ValueError(f"{points} points dépassent l'horizon sélectionnable "
+                     f"({etendue * max(Dashboard.RESOLUTIONS.values())} points au plus)")
+
+
+def clear_caches(stockage=True):
+    """Vide les caches partagés du processus, et le stockage sur disque (mesures à froid)"""
+    if stockage:
+        Dashboard.get_store().clear()
+    Dashboard.get_data_cache().clear()
+    Dashboard.get_figure_cache().clear()
+    Dashboard.get_kpi_cache().clear()
+    Dashboard.get_band_cache().clear()
+    Dashboard.get_sweep_cache().clear()
+    Dashboard.get_cube_cache().clear()
+
+
+def summarize(durees):
+    """Distribution des latences en millisecondes"""
+    ms = np.asarray(durees) * 1000
+    return {
+        'n': int(ms.size),
+        'moyenne': float(ms.mean()),
+        'min': float(ms.min()),
+        'p50': float(np.percentile(ms, 50)),
+        'p95': float(np.percentile(ms, 95)),
+        'p99': float(np.percentile(ms, 99)),
+        'max': float(ms.max()),
+    }
+
+
+def measure(fonction, repetitions, preparation=None):
+    """Chronomètre `fonction`, puis une exécution tracée pour la mémoire"""
+    durees = []
+    for _ in range(repetitions):
+        if preparation:
+            preparation()
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+
+    if preparation:
+        preparation()
+    blocs_avant = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        courant_avant, _ = tracemalloc.get_traced_memory()
+        fonction()
+        courant_apres, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    resultat = summarize(durees)
+    resultat['pic_memoire_octets'] = int(pic - courant_avant)
+    resultat['memoire_retenue_octets'] = int(courant_apres - courant_avant)
+    resultat['blocs_nets'] = int(sys.getallocatedblocks() - blocs_avant)
+    return resultat
+
+
+def bench_startup(repetitions):
+    """Import à froid du module dans un nouveau processus"""
+    commande = [sys.executable, '-c', 'import Dashboard']
+    repertoire = os.path.dirname(os.path.abspath(Dashboard.__file__))
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        subprocess.run(commande, cwd=repertoire, check=True, capture_output=True)
+        durees.append(time.perf_counter() - debut)
+    return {'demarrage/import_module': summarize(durees)}
+
+
+def bench_simulations(dashboard, horizons, repetitions):
+    """Chaque méthode simulate_* sur des vecteurs d'années de taille croissante"""
+    config = dashboard.get_advanced_config(SELECTION_SECTIONS)
+    resultats = {}
+    for horizon in horizons:
+        annees = Dashboard.time_axis(*horizon_controls(horizon)).tolist()
+        for nom in sorted(n for n in dir(dashboard) if n.startswith('simulate_') and n != 'simulate_metric'):
+            methode = getattr(dashboard, nom)
+            arguments = (annees, config) if nom in SIMULATIONS_AVEC_CONFIG else (annees,)
+            resultats[f'simulations/{nom}/{horizon}'] = measure(lambda: methode(*arguments), repetitions)
+    return resultats
+
+
+def bench_data(dashboard, horizons, repetitions):
+    """generate_advanced_data pour chaque sélection, à froid, relue du stockage, puis depuis le cache"""
+    selections = list(dict.fromkeys(dashboard.branches_options + dashboard.programmes_options))
+    resultats = {}
+    for horizon in horizons:
+        annee_debut, annee_fin, pas = horizon_controls(horizon)
+        for selection in selections:
+            generation = lambda: dashboard.generate_advanced_data(selection, "Statut Quo", annee_debut, annee_fin, pas)
+            resultats[f'donnees/{selection}/{horizon}/froid'] = measure(generation, repetitions, clear_caches)
+            df, _ = generation()
+            memoire = Dashboard.frame_memory(df)
+            resultats[f'donnees/{selection}/{horizon}/froid'].update({
+                'frame_octets': memoire['octets'],
+                'frame_octets_partages': memoire['partages'],
+                'frame_octets_float64': memoire['float64'],
+            })
+            # Nouveau processus, stockage déjà écrit : caches en mémoire seuls vidés
+            resultats[f'donnees/{selection}/{horizon}/stockage'] = measure(
+                generation, repetitions, lambda: clear_caches(stockage=False))
+            resultats[f'donnees/{selection}/{horizon}/chaud'] = measure(generation, repetitions)
+    return resultats
+
+
+def bench_monte_carlo(dashboard, repetitions):
+    """Bandes Monte Carlo (tous les tirages sur 28 ans), à froid puis depuis le cache"""
+    resultats = {}
+    for tirages in TIRAGES_MONTE_CARLO:
+        generation = lambda: dashboard.generate_monte_carlo_bands(SELECTION_SECTIONS, "Statut Quo", tirages)
+        resultats[f'monte_carlo/{tirages}/froid'] = measure(generation, repetitions, clear_caches)
+        resultats[f'monte_carlo/{tirages}/chaud'] = measure(generation, repetitions)
+    return resultats
+
+
+def bench_sections(dashboard, horizons, repetitions):
+    """Chaque rendu de section, hors session (mode « bare »), à froid puis à chaud
+
+    Un rendu en échec est noté (`erreur`) à la place de ses mesures.
+    """
+    resultats = {}
+    for horizon in horizons:
+        annee_debut, annee_fin, pas = horizon_controls(horizon)
+        controls = {'selection': SELECTION_SECTIONS, 'scenario': "Statut Quo", 'monte_carlo': False,
+                    'annee_debut': annee_debut, 'annee_fin': annee_fin, 'pas': pas}
+        for section in dashboard.sections.values():
+            for rendu, entrees_declarees in section['rendus']:
+                def appel(rendu=rendu, entrees_declarees=entrees_declarees):
+                    # Seules les entrées déclarées par la section sont calculées
+                    entrees = {'controls': controls, 'config': dashboard.get_advanced_config(SELECTION_SECTIONS)}
+                    if 'kpi' in entrees_declarees:
+                        entrees['kpi'] = dashboard.generate_kpi_summary(SELECTION_SECTIONS, "Statut Quo",
+                                                                        annee_debut, annee_fin, pas)
+                    if 'df' in entrees_declarees:
+                        entrees['df'], _ = dashboard.generate_advanced_data(
+                            SELECTION_SECTIONS, "Statut Quo", annee_debut, annee_fin, pas)
+                    rendu(*[entrees[entree] for entree in entrees_declarees])
+                nom = rendu.__name__
+                try:
+                    resultats[f'sections/{nom}/{horizon}/froid'] = measure(appel, repetitions, clear_caches)
+                    resultats[f'sections/{nom}/{horizon}/chaud'] = measure(appel, repetitions)
+                except Exception as erreur:
+                    resultats.pop(f'sections/{nom}/{horizon}/froid', None)
+                    resultats[f'sections/{nom}/{horizon}'] = {'erreur': repr(erreur)}
+    return resultats
+
+
+def bench_reruns(repetitions):
+    """Reruns complets de run_advanced_dashboard via le harnais AppTest de Streamlit"""
+    from streamlit.testing.v1 import AppTest
+
+    chemin = os.path.abspath(Dashboard.__file__)
+    resultats = {}
+
+    def chrono(at):
+        debut = time.perf_counter()
+        at.run()
+        return time.perf_counter() - debut
+
+    premiers, reruns, sections, branches, options, scenarios = [], [], [], [], [], []
+    for _ in range(repetitions):
+        clear_caches()
+        at = AppTest.from_file(chemin, default_timeout=120)
+        premiers.append(chrono(at))
+        reruns.append(chrono(at))
+        for section in at.radio(key='section_active').options:
+            at.radio(key='section_active').set_value(section)
+            sections.append(chrono(at))
+        for branche in at.sidebar.selectbox[0].options:
+            at.sidebar.selectbox[0].select(branche)
+            branches.append(chrono(at))
+        for case in at.sidebar.checkbox[:4]:
+            case.set_value(not case.value)
+            options.append(chrono(at))
+        for scenario in at.selectbox(key='scenario').options:
+            at.selectbox(key='scenario').select(scenario)
+            scenarios.append(chrono(at))
+        if at.exception:
+            raise RuntimeError(f"Exception pendant les reruns : {at.exception[0].value}")
+
+    resultats['reruns/premier_rendu'] = summarize(premiers)
+    resultats['reruns/sans_changement'] = summarize(reruns)
+    resultats['reruns/changement_section'] = summarize(sections)
+    resultats['reruns/changement_branche'] = summarize(branches)
+    resultats['reruns/options'] = summarize(options)
+    resultats['reruns/changement_scenario'] = summarize(scenarios)
+    return resultats
+
+
+def compare(resultats, reference, seuil):
+    """Compare les p50 à une référence ; retourne le nombre de régressions"""
+    regressions = 0
+    print(f"\n{'Mesure':<70} {'réf. p50':>10} {'p50':>10} {'ratio':>7}")
+    for nom, mesure in resultats.items():
+        # Les rendus en échec, ici ou dans la référence, n'ont pas de latence à comparer
+        if 'p50' not in mesure or 'p50' not in reference.get(nom, {}):
+            continue
+        avant, apres = reference[nom]['p50'], mesure['p50']
+        ratio = apres / avant if avant > 0 else float('inf')
+        marque = ''
+        if ratio > seuil:
+            marque = '  ⚠ régression'
+            regressions += 1
+        elif ratio < 1 / seuil:
+            marque = '  ✓ amélioration'
+        print(f"{nom:<70} {avant:>10.3f} {apres:>10.3f} {ratio:>7.2f}{marque}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du dashboard de défense")
+    parser.add_argument('--niveaux', default=','.join(NIVEAUX),
+                        help="niveaux à mesurer, séparés par des virgules (%(default)s)")
+    parser.add_argument('--horizons', default='28,1000,50000',
+                        help="nombre de points par série (%(default)s)")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--sortie', help="fichier JSON des résultats")
+    parser.add_argument('--comparer', help="fichier JSON de référence")
+    parser.add_argument('--seuil', type=float, default=1.25,
+                        help="ratio de p50 au-delà duquel une mesure est une régression")
+    parser.add_argument('--strict', action='store_true',
+                        help="code de sortie 1 en cas de régression ou de section en échec")
+    parser.add_argument('--sans-compact', action='store_true',
+                        help="frames en float64/int64 (référence du mode compact)")
+    args = parser.parse_args(argv)
+
+    niveaux = args.niveaux.split(',')
+    horizons = [int(h) for h in args.horizons.split(',')]
+    try:
+        controles = {horizon: horizon_controls(horizon) for horizon in horizons}
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    silence_streamlit()
+    dashboard = Dashboard.DefenseRussieDashboardAvance(compact=not args.sans_compact)
+
+    resultats = {}
+    if 'demarrage' in niveaux:
+        resultats.update(bench_startup(args.repetitions))
+    if 'simulations' in niveaux:
+        resultats.update(bench_simulations(dashboard, horizons, args.repetitions))
+    if 'donnees' in niveaux:
+        resultats.update(bench_data(dashboard, horizons, args.repetitions))
+    if 'monte_carlo' in niveaux:
+        resultats.update(bench_monte_carlo(dashboard, max(1, args.repetitions // 2)))
+    if 'sections' in niveaux:
+        resultats.update(bench_sections(dashboard, horizons, args.repetitions))
+    if 'reruns' in niveaux:
+        resultats.update(bench_reruns(max(1, args.repetitions // 2)))
+
+    print(f"{'Mesure':<70} {'p50 ms':>10} {'p95 ms':>10} {'pic Ko':>10}")
+    echecs = {nom: mesure['erreur'] for nom, mesure in resultats.items() if 'erreur' in mesure}
+    for nom, mesure in resultats.items():
+        if nom in echecs:
+            continue
+        pic = mesure.get('pic_memoire_octets')
+        print(f"{nom:<70} {mesure['p50']:>10.3f} {mesure['p95']:>10.3f} "
+              f"{'' if pic is None else f'{pic / 1024:.0f}':>10}")
+    for nom, erreur in echecs.items():
+        print(f"{nom:<70} échec : {erreur}")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump({
+                'meta': {
+                    'date': datetime.now().isoformat(timespec='seconds'),
+                    'version_code': Dashboard.VERSION_CODE,
+                    'version_modele': dashboard.moteur.version,
+                    'compact': dashboard.compact,
+                    'python': platform.python_version(),
+                    'numpy': np.__version__,
+                    'plateforme': platform.platform(),
+                    'repetitions': args.repetitions,
+                    'horizons': {str(horizon): {'annee_debut': debut, 'annee_fin': fin, 'pas': pas,
+                                                'points': (fin - debut + 1) * pas}
+                                 for horizon, (debut, fin, pas) in controles.items()},
+                },
+                'resultats': resultats,
+            }, fichier, indent=2, ensure_ascii=False)
+
+    shutil.rmtree(REPERTOIRE_STOCKAGE, ignore_errors=True)
+
+    if args.comparer:
+        with open(args.comparer, encoding='utf-8') as fichier:
+            reference = json.load(fichier)['resultats']
+        regressions = compare(resultats, reference, args.seuil)
+        if regressions and args.strict:
+            return 1
+    return 1 if echecs and args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# export_batch.py
+"""Export par lots des séries du dashboard, sans serveur Streamlit.
+
+Exemples :
+    python export_batch.py --sortie export
+    python export_batch.py --format csv --horizons 2000:2027,1950:2100 --processus 8
+    python export_batch.py --selections "Marine Russe,Flotte Nord" --scenarios "Statut Quo" --format json
+
+Chaque combinaison sélection × scénario × horizon est générée par
+DefenseRussieDashboardAvance dans un pool de processus et écrite dès qu'elle
+est prête (fichier temporaire renommé : un outil qui surveille le répertoire
+ne lit jamais de fichier partiel). Les cubes des scénarios sont construits
+une fois par le processus principal et relus par memory map depuis le
+stockage colonnaire. Le débit (combinaisons/s) et le temps de chaque
+processus sont rapportés à la fin, avec un manifeste des fichiers écrits.
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import Dashboard
+
+FORMATS = {'parquet': '.parquet', 'csv': '.csv', 'json': '.json'}
+
+# Instance du dashboard propre à chaque processus du pool (voir init_worker)
+DASHBOARD = None
+
+
+def silence_streamlit():
+    """Coupe les avertissements du mode « bare » de Streamlit"""
+    from streamlit import config
+    config.get_option('logger.level')
+    for nom in list(logging.root.manager.loggerDict):
+        if nom.startswith('streamlit'):
+            logging.getLogger(nom).setLevel(logging.ERROR)
+
+
+def slug(texte):
+    """Nom de fichier ASCII d'un libellé (« Forces Aérospatiales » → forces_aerospatiales)"""
+    ascii_ = unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_.lower()).strip('_')
+
+
+def parse_horizons(texte):
+    """« 2000:2027,1950:2100 » → [(2000, 2027), (1950, 2100)]"""
+    horizons = []
+    for morceau in texte.split(','):
+        debut, fin = (int(annee) for annee in morceau.split(':'))
+        if debut > fin:
+            raise argparse.ArgumentTypeError(f"horizon inversé : {morceau}")
+        horizons.append((debut, fin))
+    return horizons
+
+
+def parquet_available():
+    return any(importlib.util.find_spec(moteur) for moteur in ('pyarrow', 'fastparquet'))
+
+
+def write_frame(df, chemin, format_):
+    """Écrit la frame sous un nom temporaire puis la renomme"""
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    if format_ == 'parquet':
+        df.to_parquet(temporaire, index=False)
+    elif format_ == 'csv':
+        df.to_csv(temporaire, index=False)
+    else:
+        df.to_json(temporaire, orient='records', force_ascii=False)
+    os.replace(temporaire, chemin)
+    return os.path.getsize(chemin)
+
+
+def init_worker(compact):
+    """Dashboard construit une fois par processus du pool"""
+    global DASHBOARD
+    silence_streamlit()
+    DASHBOARD = Dashboard.DefenseRussieDashboardAvance(compact=compact)
+
+
+def export_combination(selection, scenario, annee_debut, annee_fin, pas, repertoire, format_):
+    """Génère et écrit une combinaison ; retourne sa fiche (fichier, lignes, octets, temps)"""
+    debut = time.perf_counter()
+    df, _ = DASHBOARD.generate_advanced_data(selection, scenario, annee_debut, annee_fin, pas)
+    generation = time.perf_counter() - debut
+    nom = f"{slug(selection)}__{slug(scenario)}__{annee_debut}-{annee_fin}{FORMATS[format_]}"
+    octets = write_frame(df, os.path.join(repertoire, nom), format_)
+    return {
+        'selection': selection,
+        'scenario': scenario,
+        'horizon': [annee_debut, annee_fin],
+        'fichier': nom,
+        'lignes': len(df),
+        'colonnes': len(df.columns),
+        'octets': octets,
+        'source': df.attrs.get('source'),
+        'processus': os.getpid(),
+        'generation_s': generation,
+        'ecriture_s': time.perf_counter() - debut - generation,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export par lots des séries du dashboard de défense")
+    parser.add_argument('--sortie', default='export', help="répertoire des fichiers (%(default)s)")
+    parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+    parser.add_argument('--selections', help="sélections séparées par des virgules (toutes les branches "
+                                             "et tous les programmes par défaut)")
+    parser.add_argument('--scenarios', help="scénarios séparés par des virgules (tous par défaut)")
+    parser.add_argument('--horizons', type=parse_horizons, default=[(2000, 2027)],
+                        help="horizons debut:fin séparés par des virgules (2000:2027)")
+    parser.add_argument('--resolution', choices=list(Dashboard.RESOLUTIONS), default="Annuelle")
+    parser.add_argument('--processus', type=int, default=Dashboard.NB_PROCESSUS)
+    parser.add_argument('--sans-compact', action='store_true', help="frames en float64/int64")
+    parser.add_argument('--rapport', help="fichier JSON du rapport (débit et temps par processus)")
+    args = parser.parse_args(argv)
+
+    if args.format == 'parquet' and not parquet_available():
+        parser.error("le format parquet demande pyarrow ou fastparquet (pip install pyarrow)")
+    silence_streamlit()
+    dashboard = Dashboard.DefenseRussieDashboardAvance(compact=not args.sans_compact)
+    selections = (args.selections.split(',') if args.selections
+                  else list(dict.fromkeys(dashboard.branches_options + dashboard.programmes_options)))
+    scenarios = args.scenarios.split(',') if args.scenarios else list(dashboard.scenarios_options)
+    connues = set(dashboard.branches_options) | set(dashboard.programmes_options) | set(dashboard.configs)
+    inconnues = [nom for nom in selections if nom not in connues] + \
+                [nom for nom in scenarios if nom not in dashboard.scenarios_options]
+    if inconnues:
+        parser.error(f"sélections ou scénarios inconnus : {', '.join(inconnues)}")
+    pas = Dashboard.RESOLUTIONS[args.resolution]
+    os.makedirs(args.sortie, exist_ok=True)
+
+    debut = time.perf_counter()
+    # Cubes écrits une fois dans le stockage colonnaire, puis projetés par chaque processus
+    for annee_debut, annee_fin in args.horizons:
+        if dashboard.cube_fits(Dashboard.time_axis(annee_debut, annee_fin, pas)):
+            dashboard.get_scenario_cube(annee_debut, annee_fin, pas)
+    preparation = time.perf_counter() - debut
+
+    combinaisons = [(selection, scenario, annee_debut, annee_fin)
+                    for annee_debut, annee_fin in args.horizons
+                    for scenario in scenarios for selection in selections]
+    fiches = []
+    with ProcessPoolExecutor(max_workers=args.processus, initializer=init_worker,
+                             initargs=(not args.sans_compact,)) as pool:
+        futures = [pool.submit(export_combination, selection, scenario, annee_debut, annee_fin, pas,
+                               args.sortie, args.format)
+                   for selection, scenario, annee_debut, annee_fin in combinaisons]
+        for i, future in enumerate(as_completed(futures), 1):
+            fiche = future.result()
+            fiches.append(fiche)
+            print(f"[{i}/{len(futures)}] {fiche['fichier']} • {fiche['lignes']} lignes • "
+                  f"{(fiche['generation_s'] + fiche['ecriture_s']) * 1000:.0f} ms", flush=True)
+    duree = time.perf_counter() - debut
+
+    par_processus = {}
+    for fiche in fiches:
+        stats = par_processus.setdefault(fiche['processus'], {'combinaisons': 0, 'generation_s': 0.0,
+                                                              'ecriture_s': 0.0})
+        stats['combinaisons'] += 1
+        stats['generation_s'] += fiche['generation_s']
+        stats['ecriture_s'] += fiche['ecriture_s']
+    rapport = {
+        'combinaisons': len(fiches),
+        'format': args.format,
+        'processus': args.processus,
+        'duree_s': duree,
+        'preparation_cubes_s': preparation,
+        'debit_combinaisons_par_s': len(fiches) / duree,
+        'octets': sum(fiche['octets'] for fiche in fiches),
+        'par_processus': {str(pid): stats for pid, stats in sorted(par_processus.items())},
+    }
+    with open(os.path.join(args.sortie, 'manifeste.json'), 'w', encoding='utf-8') as fichier:
+        json.dump({'version_code': Dashboard.VERSION_CODE, 'version_modele': dashboard.moteur.version,
+                   'resolution': args.resolution, 'fichiers': fiches}, fichier, indent=2, ensure_ascii=False)
+
+    print(f"\n{rapport['combinaisons']} combinaisons en {duree:.2f} s "
+          f"({rapport['debit_combinaisons_par_s']:.1f}/s, cubes {preparation * 1000:.0f} ms) • "
+          f"{rapport['octets'] / 1024 ** 2:.1f} Mo")
+    print(f"\n{'Processus':>10} {'n':>6} {'génération ms':>15} {'écriture ms':>13}")
+    for pid, stats in rapport['par_processus'].items():
+        print(f"{pid:>10} {stats['combinaisons']:>6} {stats['generation_s'] * 1000:>15.0f} "
+              f"{stats['ecriture_s'] * 1000:>13.0f}")
+
+    if args.rapport:
+        with open(args.rapport, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
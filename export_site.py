@@ -0,0 +1,459 @@
+# export_site.py
+"""Export du dashboard complet en site HTML statique, sans serveur Streamlit.
+
+Exemples :
+    python export_site.py --sortie site
+    python export_site.py --scenarios "Statut Quo,Conflit Majeur" --processus 8
+    python export_site.py --horizon 1950:2100 --resolution Mensuelle
+
+Chaque sélection (branches, programmes et modes à sélection unique) est rendue
+pour chaque scénario par le harnais AppTest de Streamlit, navigation par
+onglets, dans un pool de processus : une page par combinaison avec toutes les
+sections (cartes HTML, métriques, figures Plotly, tableaux). Les paramètres des
+widgets sont figés à leur valeur par défaut et affichés comme tels.
+
+Plotly.js, la feuille de style et le script des onglets sont écrits une fois
+dans assets/ ; chaque figure y est écrite une fois sous son empreinte, de sorte
+que les figures communes à toutes les pages (tables de référence, catalogue)
+ne sont ni dupliquées ni retéléchargées d'une page à l'autre. Le résultat se
+sert tel quel par n'importe quel serveur de fichiers.
+"""
+import argparse
+import hashlib
+import html
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+# Pas de préchauffage dans les sessions du harnais : chaque page est calculée une fois
+os.environ.setdefault('DASHBOARD_PRECHAUFFAGE', '0')
+
+import Dashboard
+from export_batch import parse_horizons, silence_streamlit, slug
+
+CHEMIN_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dashboard.py')
+
+# Mise en page du site : colonnes, métriques, onglets, tableaux et paramètres figés
+CSS_SITE = """
+body {
+    font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif;
+    color: #31333F;
+    margin: 0 auto;
+    padding: 1rem 3rem 3rem;
+    max-width: 1400px;
+}
+a { color: #0033A0; }
+.navigation { display: flex; flex-wrap: wrap; gap: 1rem; align-items: flex-start; margin-bottom: 1rem; }
+.navigation details { background: #f0f2f6; border-radius: 8px; padding: 0.4rem 0.8rem; }
+.navigation summary { cursor: pointer; font-weight: 600; }
+.navigation ul { margin: 0.4rem 0; padding-left: 1.2rem; }
+.navigation .actif { font-weight: 700; color: #D52B1E; }
+.colonnes { display: flex; gap: 1rem; align-items: flex-start; }
+.colonne { min-width: 0; }
+.onglets-titres { display: flex; flex-wrap: wrap; gap: 0.2rem; border-bottom: 1px solid #e6e9ef; }
+.onglets-titres button {
+    border: none;
+    background: none;
+    padding: 0.6rem 0.8rem;
+    font-size: 0.95rem;
+    cursor: pointer;
+    border-bottom: 2px solid transparent;
+}
+.onglets-titres button.actif { color: #D52B1E; border-bottom-color: #D52B1E; }
+.metrique { padding: 0.5rem 0; }
+.metrique-libelle { font-size: 0.9rem; }
+.metrique-valeur { font-size: 2.2rem; }
+.metrique-delta { font-size: 0.9rem; display: inline-block; padding: 0 0.4rem; border-radius: 1rem; }
+.metrique-delta.green { color: #09ab3b; background: rgba(9, 171, 59, 0.1); }
+.metrique-delta.red { color: #ff2b2b; background: rgba(255, 43, 43, 0.1); }
+.metrique-delta.gray { color: #808495; background: rgba(128, 132, 149, 0.1); }
+.legende { font-size: 0.85rem; color: #808495; }
+.parametre { font-size: 0.9rem; padding: 0.3rem 0; }
+.parametre span { color: #808495; }
+.graphique { width: 100%; min-height: 450px; }
+table.tableau { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+table.tableau th, table.tableau td { border: 1px solid #e6e9ef; padding: 0.3rem 0.6rem; text-align: right; }
+table.tableau th { background: #f0f2f6; }
+.index td, .index th { padding: 0.3rem 0.8rem; text-align: left; }
+"""
+
+# Onglets et tracé des figures : une figure n'est tracée qu'à l'affichage de son onglet
+JS_SITE = """
+(function () {
+    function tracer(panneau) {
+        panneau.querySelectorAll('.graphique[data-figure]').forEach(function (cadre) {
+            if (cadre.closest('.onglet[hidden]')) {
+                return;
+            }
+            var figure = window.FIGURES[cadre.dataset.figure];
+            Plotly.newPlot(cadre, figure.data, figure.layout, {responsive: true, displaylogo: false});
+            cadre.removeAttribute('data-figure');
+        });
+    }
+    document.querySelectorAll('.onglets').forEach(function (onglets) {
+        var titres = onglets.querySelector('.onglets-titres');
+        var boutons = titres.querySelectorAll('button');
+        var panneaux = onglets.querySelectorAll(':scope > .onglet');
+        function afficher(i) {
+            panneaux.forEach(function (panneau, j) { panneau.hidden = i !== j; });
+            boutons.forEach(function (bouton, j) { bouton.classList.toggle('actif', i === j); });
+            tracer(panneaux[i]);
+            window.dispatchEvent(new Event('resize'));
+        }
+        boutons.forEach(function (bouton, i) {
+            bouton.addEventListener('click', function () {
+                history.replaceState(null, '', '#' + panneaux[i].id);
+                afficher(i);
+            });
+        });
+        var initial = Array.prototype.findIndex.call(panneaux, function (panneau) {
+            return '#' + panneau.id === location.hash;
+        });
+        titres.hidden = false;
+        afficher(Math.max(initial, 0));
+    });
+    // Figures hors onglets
+    tracer(document.body);
+    // Changer de sélection ou de scénario conserve l'onglet affiché
+    document.querySelectorAll('.navigation a').forEach(function (lien) {
+        lien.addEventListener('click', function () { lien.hash = location.hash; });
+    });
+})();
+"""
+
+# Session du harnais et plan du site propres à chaque processus du pool (voir init_worker)
+SESSION = None
+PLAN = None
+
+
+def importable_module():
+    """Ce script sous forme de module importable
+
+    Le harnais remplace __main__ dans les processus du pool : les tâches sont
+    désignées par le nom du module, pas par __main__.
+    """
+    if __name__ != '__main__':
+        return sys.modules[__name__]
+    return importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+
+
+def page_name(selection, scenario):
+    return f"{slug(selection)}__{slug(scenario)}.html"
+
+
+def write_file(contenu, chemin):
+    """Écrit le fichier sous un nom temporaire puis le renomme ; retourne sa taille"""
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as fichier:
+        fichier.write(contenu)
+    os.replace(temporaire, chemin)
+    return os.path.getsize(chemin)
+
+
+def write_assets(repertoire):
+    """Plotly.js, feuille de style et script des onglets, partagés par toutes les pages"""
+    plotly = Dashboard.timed_import('plotly')
+    assets = {
+        f"plotly-{plotly.__version__}.min.js": Dashboard.timed_import('plotly.offline').get_plotlyjs(),
+        'dashboard.css': Dashboard.CSS_DASHBOARD.replace('<style>', '').replace('</style>', '') + CSS_SITE,
+        'site.js': JS_SITE,
+    }
+    os.makedirs(os.path.join(repertoire, 'assets', 'figures'), exist_ok=True)
+    octets = {nom: write_file(contenu, os.path.join(repertoire, 'assets', nom)) for nom, contenu in assets.items()}
+    return octets
+
+
+def head(titre, scripts=()):
+    """En-tête commun des pages : styles et scripts partagés"""
+    balises = ''.join(f'<script src="{src}" defer></script>' for src in scripts)
+    return (f'<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<title>{html.escape(titre)}</title><link rel="stylesheet" href="assets/dashboard.css">'
+            f'{balises}</head>')
+
+
+def init_worker(annee_debut, annee_fin, resolution, plan):
+    """Session du harnais ouverte une fois par processus, navigation par onglets et horizon fixés"""
+    from streamlit.testing.v1 import AppTest
+    global SESSION, PLAN
+    silence_streamlit()
+    PLAN = plan
+    SESSION = AppTest.from_file(CHEMIN_APP, default_timeout=300).run()
+    SESSION.checkbox(key='navigation_paresseuse').uncheck()
+    SESSION.slider(key='horizon').set_value((annee_debut, annee_fin))
+    SESSION.selectbox(key='resolution').select(resolution)
+    SESSION.run()
+
+
+class PageStatique:
+    """Conversion de l'arbre d'éléments d'une session AppTest en HTML statique
+
+    Les figures sont écrites dans assets/figures sous l'empreinte de leur spec ;
+    la page n'en garde qu'une référence.
+    """
+
+    def __init__(self, repertoire):
+        self.repertoire = repertoire
+        self.figures = []
+        self.nouvelles = 0
+        self.onglets = 0
+
+    def render(self, noeud):
+        """HTML d'un élément ou d'un bloc et de ses enfants"""
+        type_ = getattr(noeud, 'type', None)
+        enfants = list(noeud.children.values()) if hasattr(noeud, 'children') else []
+        contenu = ''.join(self.render(enfant) for enfant in enfants)
+        if type_ == 'markdown':
+            # Le CSS de l'application est servi par la feuille de style partagée
+            return '' if noeud.value.strip() == Dashboard.CSS_DASHBOARD.strip() else noeud.value
+        if type_ == 'caption':
+            return f'<p class="legende">{html.escape(noeud.value)}</p>'
+        if type_ == 'metric':
+            return self.render_metric(noeud)
+        if type_ == 'plotly_chart':
+            return self.render_figure(noeud.proto.spec)
+        if type_ == 'dataframe':
+            df = noeud.value
+            index = not df.index.equals(pd.RangeIndex(len(df)))
+            return df.to_html(index=index, border=0, classes='tableau', float_format=lambda v: f"{v:,.2f}")
+        if type_ in ('selectbox', 'multiselect', 'radio', 'slider', 'select_slider', 'number_input',
+                     'checkbox', 'text_input'):
+            valeur = noeud.value
+            if isinstance(valeur, (list, tuple)):
+                valeur = ' – '.join(map(str, valeur)) if type_ in ('slider', 'select_slider') \
+                    else ', '.join(map(str, valeur))
+            return (f'<div class="parametre"><span>{html.escape(noeud.label)}</span> '
+                    f'<strong>{html.escape(str(valeur))}</strong></div>')
+        if type_ in ('info', 'success', 'warning', 'error'):
+            return f'<div class="{type_}-card">{html.escape(str(noeud.value))}</div>'
+        if type_ == 'tab_container':
+            titres = ''.join(f'<button type="button">{html.escape(enfant.label)}</button>' for enfant in enfants)
+            return f'<div class="onglets"><div class="onglets-titres" hidden>{titres}</div>{contenu}</div>'
+        if type_ == 'tab':
+            self.onglets += 1
+            return f'<section class="onglet" id="{slug(noeud.label)}">{contenu}</section>'
+        if type_ == 'column':
+            return f'<div class="colonne" style="flex: {noeud.proto.weight:g}">{contenu}</div>'
+        if type_ == 'expandable':
+            return f'<details><summary>{html.escape(noeud.label)}</summary>{contenu}</details>'
+        if enfants and all(getattr(enfant, 'type', None) == 'column' for enfant in enfants):
+            return f'<div class="colonnes">{contenu}</div>'
+        # Blocs verticaux et éléments sans équivalent statique (st.empty, fragments)
+        return f'<div>{contenu}</div>' if contenu else ''
+
+    def render_metric(self, noeud):
+        proto = noeud.proto
+        couleur = type(proto).MetricColor.Name(proto.color).lower()
+        delta = f'<div class="metrique-delta {couleur}">{html.escape(proto.delta)}</div>' if proto.delta else ''
+        return (f'<div class="metrique"><div class="metrique-libelle">{html.escape(proto.label)}</div>'
+                f'<div class="metrique-valeur">{html.escape(proto.body)}</div>{delta}</div>')
+
+    def render_figure(self, spec):
+        """Référence à la figure, écrite une seule fois par empreinte dans assets/figures"""
+        empreinte = hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]
+        chemin = os.path.join(self.repertoire, 'assets', 'figures', f"{empreinte}.js")
+        if not os.path.exists(chemin):
+            contenu = spec.replace('</', '<\\/')
+            write_file(f'(window.FIGURES = window.FIGURES || {{}})["{empreinte}"] = {contenu};\n', chemin)
+            self.nouvelles += 1
+        self.figures.append(empreinte)
+        return f'<div class="graphique" data-figure="{empreinte}"></div>'
+
+
+def navigation(selection, scenario):
+    """Liens vers les autres sélections (par mode d'analyse) et les autres scénarios"""
+    def lien(texte, cible, actif):
+        classe = ' class="actif"' if actif else ''
+        return f'<li><a href="{cible}"{classe}>{html.escape(texte)}</a></li>'
+
+    modes = ''.join(
+        f"<li>{html.escape(mode)}<ul>" +
+        ''.join(lien(nom, page_name(nom, scenario), nom == selection) for nom in selections) + "</ul></li>"
+        for mode, selections in PLAN['modes'].items())
+    scenarios = ''.join(lien(nom, page_name(selection, nom), nom == scenario) for nom in PLAN['scenarios'])
+    return (f'<nav class="navigation"><a href="index.html">⚡ Accueil</a>'
+            f'<details><summary>Sélection : {html.escape(selection)}</summary><ul>{modes}</ul></details>'
+            f'<details><summary>Scénario : {html.escape(scenario)}</summary><ul>{scenarios}</ul></details>'
+            f'<span class="legende">{html.escape(PLAN["legende"])}</span></nav>')
+
+
+def select_page(mode, selection, scenario):
+    """Place la session sur la combinaison : mode d'analyse, sélection, scénario"""
+    radio = SESSION.sidebar.radio[0]
+    if radio.value != mode:
+        radio.set_value(mode)
+        SESSION.run()
+    listes = [liste for liste in SESSION.sidebar.selectbox if liste.key is None]
+    if listes:
+        listes[0].select(selection)
+    SESSION.selectbox(key='scenario').select(scenario)
+    SESSION.run()
+    if SESSION.exception:
+        raise RuntimeError(f"{selection} / {scenario} : " + ' | '.join(e.value for e in SESSION.exception))
+
+
+def export_page(mode, selection, scenario, repertoire):
+    """Rend et écrit la page d'une combinaison ; retourne sa fiche (fichier, figures, octets, temps)"""
+    debut = time.perf_counter()
+    select_page(mode, selection, scenario)
+    generation = time.perf_counter() - debut
+    page = PageStatique(repertoire)
+    corps = page.render(SESSION.main)
+    scripts = [f"assets/plotly-{PLAN['plotly']}.min.js"] + \
+              [f"assets/figures/{empreinte}.js" for empreinte in dict.fromkeys(page.figures)] + ['assets/site.js']
+    contenu = (head(f"{selection} • {scenario} - Analyse stratégique avancée", scripts) +
+               f'<body>{navigation(selection, scenario)}{corps}</body></html>')
+    nom = page_name(selection, scenario)
+    octets = write_file(contenu, os.path.join(repertoire, nom))
+    return {
+        'selection': selection,
+        'scenario': scenario,
+        'fichier': nom,
+        'onglets': page.onglets,
+        'figures': len(page.figures),
+        'figures_ecrites': page.nouvelles,
+        'octets': octets,
+        'processus': os.getpid(),
+        'generation_s': generation,
+        'ecriture_s': time.perf_counter() - debut - generation,
+    }
+
+
+def index_page(plan):
+    """Page d'accueil : une ligne par sélection, un lien par scénario"""
+    lignes = ''.join(
+        f'<tr><th colspan="{len(plan["scenarios"]) + 1}">{html.escape(mode)}</th></tr>' + ''.join(
+            f'<tr><td>{html.escape(selection)}</td>' +
+            ''.join(f'<td><a href="{page_name(selection, scenario)}">{html.escape(scenario)}</a></td>'
+                    for scenario in plan['scenarios']) + '</tr>'
+            for selection in selections)
+        for mode, selections in plan['modes'].items())
+    return (head("Analyse stratégique avancée - Fédération de Russie") +
+            '<body><h1 class="main-header">⚡ ANALYSE STRATÉGIQUE AVANCÉE - FÉDÉRATION DE RUSSIE</h1>'
+            f'<p class="legende">{html.escape(plan["legende"])}</p>'
+            f'<table class="index">{lignes}</table></body></html>')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export du dashboard de défense en site HTML statique")
+    parser.add_argument('--sortie', default='site', help="répertoire du site (%(default)s)")
+    parser.add_argument('--selections', help="sélections séparées par des virgules (toutes par défaut)")
+    parser.add_argument('--scenarios', help="scénarios séparés par des virgules (tous par défaut)")
+    parser.add_argument('--horizon', type=parse_horizons, default=[(2000, 2027)], help="debut:fin (2000:2027)")
+    parser.add_argument('--resolution', choices=list(Dashboard.RESOLUTIONS), default="Annuelle")
+    parser.add_argument('--processus', type=int, default=Dashboard.NB_PROCESSUS)
+    parser.add_argument('--rapport', help="fichier JSON du rapport (débit et temps par processus)")
+    args = parser.parse_args(argv)
+
+    if len(args.horizon) != 1:
+        parser.error("un seul horizon par site")
+    (annee_debut, annee_fin), = args.horizon
+    silence_streamlit()
+    dashboard = Dashboard.DefenseRussieDashboardAvance()
+    # Une page par sélection : un mode dont la sélection est déjà proposée par un autre n'en ajoute pas
+    pages, modes = {}, {}
+    for mode, selections in dashboard.modes_analyse.items():
+        for selection in selections:
+            if selection not in pages:
+                pages[selection] = mode
+                modes.setdefault(mode, []).append(selection)
+    scenarios = args.scenarios.split(',') if args.scenarios else list(dashboard.scenarios_options)
+    if args.selections:
+        choisies = args.selections.split(',')
+        inconnues = [nom for nom in choisies if nom not in pages]
+        modes = {mode: [nom for nom in noms if nom in choisies] for mode, noms in modes.items()}
+        modes = {mode: noms for mode, noms in modes.items() if noms}
+    else:
+        inconnues = []
+    inconnues += [nom for nom in scenarios if nom not in dashboard.scenarios_options]
+    if inconnues:
+        parser.error(f"sélections ou scénarios inconnus : {', '.join(inconnues)}")
+    pas = Dashboard.RESOLUTIONS[args.resolution]
+
+    debut = time.perf_counter()
+    os.makedirs(args.sortie, exist_ok=True)
+    assets = write_assets(args.sortie)
+    # Cube écrit une fois dans le stockage colonnaire, puis projeté par chaque session
+    if dashboard.cube_fits(Dashboard.time_axis(annee_debut, annee_fin, pas)):
+        dashboard.get_scenario_cube(annee_debut, annee_fin, pas)
+    preparation = time.perf_counter() - debut
+
+    plan = {
+        'modes': modes,
+        'scenarios': scenarios,
+        'plotly': Dashboard.timed_import('plotly').__version__,
+        'legende': f"Horizon {annee_debut}-{annee_fin} • résolution {args.resolution.lower()} • "
+                   f"généré le {datetime.now():%d/%m/%Y %H:%M} • version {Dashboard.VERSION_CODE}",
+    }
+    write_file(index_page(plan), os.path.join(args.sortie, 'index.html'))
+
+    # Combinaisons groupées par mode : une session ne change de mode qu'au changement de groupe
+    combinaisons = [(mode, selection, scenario) for mode, selections in modes.items()
+                    for selection in selections for scenario in scenarios]
+    fiches = []
+    module = importable_module()
+    with ProcessPoolExecutor(max_workers=args.processus, initializer=module.init_worker,
+                             initargs=(annee_debut, annee_fin, args.resolution, plan)) as pool:
+        futures = [pool.submit(module.export_page, mode, selection, scenario, args.sortie)
+                   for mode, selection, scenario in combinaisons]
+        for i, future in enumerate(as_completed(futures), 1):
+            fiche = future.result()
+            fiches.append(fiche)
+            print(f"[{i}/{len(futures)}] {fiche['fichier']} • {fiche['onglets']} onglets • "
+                  f"{fiche['figures']} figures • {(fiche['generation_s'] + fiche['ecriture_s']) * 1000:.0f} ms",
+                  flush=True)
+    duree = time.perf_counter() - debut
+
+    repertoire_figures = os.path.join(args.sortie, 'assets', 'figures')
+    octets_figures = sum(os.path.getsize(os.path.join(repertoire_figures, nom))
+                         for nom in os.listdir(repertoire_figures))
+    par_processus = {}
+    for fiche in fiches:
+        stats = par_processus.setdefault(fiche['processus'], {'pages': 0, 'generation_s': 0.0,
+                                                              'ecriture_s': 0.0})
+        stats['pages'] += 1
+        stats['generation_s'] += fiche['generation_s']
+        stats['ecriture_s'] += fiche['ecriture_s']
+    rapport = {
+        'pages': len(fiches),
+        'processus': args.processus,
+        'duree_s': duree,
+        'preparation_s': preparation,
+        'debit_pages_par_s': len(fiches) / duree,
+        'octets_pages': sum(fiche['octets'] for fiche in fiches),
+        'octets_assets': sum(assets.values()),
+        'figures_referencees': sum(fiche['figures'] for fiche in fiches),
+        'figures_uniques': len(os.listdir(repertoire_figures)),
+        'octets_figures': octets_figures,
+        'par_processus': {str(pid): stats for pid, stats in sorted(par_processus.items())},
+    }
+    with open(os.path.join(args.sortie, 'manifeste.json'), 'w', encoding='utf-8') as fichier:
+        json.dump({'version_code': Dashboard.VERSION_CODE, 'version_modele': dashboard.moteur.version,
+                   'horizon': [annee_debut, annee_fin], 'resolution': args.resolution,
+                   'assets': assets, 'pages': sorted(fiches, key=lambda fiche: fiche['fichier'])},
+                  fichier, indent=2, ensure_ascii=False)
+
+    print(f"\n{rapport['pages']} pages en {duree:.2f} s ({rapport['debit_pages_par_s']:.1f}/s) • "
+          f"pages {rapport['octets_pages'] / 1024 ** 2:.1f} Mo • "
+          f"assets {rapport['octets_assets'] / 1024 ** 2:.1f} Mo • "
+          f"{rapport['figures_uniques']} figures uniques sur {rapport['figures_referencees']} "
+          f"({octets_figures / 1024 ** 2:.1f} Mo)")
+    print(f"\n{'Processus':>10} {'n':>6} {'génération ms':>15} {'écriture ms':>13}")
+    for pid, stats in rapport['par_processus'].items():
+        print(f"{pid:>10} {stats['pages']:>6} {stats['generation_s'] * 1000:>15.0f} "
+              f"{stats['ecriture_s'] * 1000:>13.0f}")
+
+    if args.rapport:
+        with open(args.rapport, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+# load_test.py
+"""Test de charge : N sessions d'analystes simulées en parallèle sur une seule machine.
+
+Exemples :
+    python load_test.py --sessions 8 --actions 30
+    python load_test.py --sessions 16 --actions 50 --pause 0.5 --sortie charge.json
+
+Chaque session parcourt une séquence réaliste (mode d'analyse, branche ou
+programme, options, scénario, section) via le harnais AppTest de Streamlit,
+sans serveur ni réseau. Comme sur un serveur, toutes les sessions sont des
+threads d'un même processus : elles partagent les caches st.cache_resource
+(données, figures, cubes) et se les disputent. Elles démarrent ensemble après
+un échauffement (imports et singletons du processus) ; la croissance mémoire
+rapportée est celle de ce processus.
+
+Le stockage sur disque est temporaire et le préchauffage en arrière-plan est
+désactivé, comme pour le benchmark : il tournerait pendant les reruns mesurés
+(`--prechauffage` pour le mesurer avec).
+
+Les latences viennent du harnais AppTest, dont quelques attributs internes
+sont remplacés pour le rendre sûr entre threads (share_test_harness), et non
+d'un serveur réel. Ce remplacement est écrit pour Streamlit 1.65 (borne de
+requirements.txt) ; le test s'arrête si l'un de ces attributs manque.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+CHEMIN_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dashboard.py')
+
+# Stockage colonnaire temporaire : le test ne lit ni n'écrit celui du serveur
+REPERTOIRE_STOCKAGE = tempfile.mkdtemp(prefix='charge_stockage_')
+os.environ['DASHBOARD_STOCKAGE'] = REPERTOIRE_STOCKAGE
+
+# Version de Streamlit pour laquelle share_test_harness est écrit
+STREAMLIT_TESTE = '1.65'
+
+# Actions d'un analyste et leur fréquence relative
+ACTIONS = {
+    'section': 0.3,
+    'selection': 0.3,
+    'option': 0.15,
+    'scenario': 0.15,
+    'type_analyse': 0.1,
+}
+
+
+def rss_octets():
+    """Mémoire résidente du processus (Linux)"""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def silence_streamlit():
+    """Coupe les avertissements du mode « bare » de Streamlit"""
+    from streamlit import config
+    config.get_option('logger.level')
+    for nom in list(logging.root.manager.loggerDict):
+        if nom.startswith('streamlit'):
+            logging.getLogger(nom).setLevel(logging.ERROR)
+
+
+def share_test_harness():
+    """Fige l'état global que le harnais AppTest bascule à chaque exécution
+
+    AppTest suppose une exécution à la fois : chaque run compile le script dans
+    un ScriptCache neuf (ast.parse n'est pas sûr entre threads en CPython 3.11),
+    patche config.get_option le temps du run et remet Runtime._instance à None
+    en sortie, sous les pieds des sessions encore en cours. Comme sur un
+    serveur unique, les sessions partagent donc un seul ScriptCache (verrouillé,
+    script compilé une fois), global.appTest reste actif et le dernier runtime
+    installé reste visible.
+    """
+    import streamlit
+    from streamlit import config, runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    # Attributs remplacés, et code du harnais qui doit encore y passer
+    manquants = [nom for nom, present in (
+        ('testing.v1.app_test.ScriptCache', hasattr(app_test, 'ScriptCache')
+         and 'ScriptCache' in app_test.AppTest._run.__code__.co_names),
+        ('testing.v1.local_script_runner.ScriptCache', hasattr(local_script_runner, 'ScriptCache')
+         and 'ScriptCache' in local_script_runner.LocalScriptRunner.__init__.__code__.co_names),
+        ('runtime.get_instance', hasattr(runtime, 'get_instance')),
+        ('runtime.exists', hasattr(runtime, 'exists')),
+        ('runtime.Runtime._instance', hasattr(runtime.Runtime, '_instance')),
+        ('config global.appTest', 'global.appTest' in config.get_config_options()),
+    ) if not present]
+    if manquants:
+        raise RuntimeError(f"harnais AppTest de streamlit {streamlit.__version__} incompatible avec le test "
+                           f"de charge (écrit pour {STREAMLIT_TESTE}) : {', '.join(manquants)} introuvable(s)")
+    if not streamlit.__version__.startswith(STREAMLIT_TESTE + '.'):
+        print(f"Avertissement : streamlit {streamlit.__version__}, harnais vérifié avec {STREAMLIT_TESTE}",
+              file=sys.stderr)
+
+    cache_script = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: cache_script
+    config.set_option('global.appTest', True)
+
+    installe = {}
+
+    def get_instance():
+        if runtime.Runtime._instance is not None:
+            installe['runtime'] = runtime.Runtime._instance
+        return installe['runtime']
+
+    runtime.get_instance = get_instance
+    runtime.exists = lambda: runtime.Runtime._instance is not None or 'runtime' in installe
+
+
+def apply_action(at, action, rng):
+    """Modifie un widget de la session ; retourne l'action effectivement jouée
+
+    None si le rendu précédent n'a pas produit le panneau de contrôle (script en
+    erreur) : il n'y a aucun widget à modifier.
+    """
+    if not at.sidebar.radio or len(at.sidebar.checkbox) < 4:
+        return None
+    if action == 'selection':
+        listes = [sb for sb in at.sidebar.selectbox if sb.key is None]
+        if not listes:
+            # Vue systémique ou scénarios : pas de liste, on change de mode
+            action = 'type_analyse'
+        else:
+            liste = listes[0]
+            liste.select(rng.choice(liste.options))
+    if action == 'type_analyse':
+        mode = at.sidebar.radio[0]
+        mode.set_value(rng.choice(mode.options))
+    elif action == 'option':
+        case = rng.choice(list(at.sidebar.checkbox[:4]))
+        case.set_value(not case.value)
+    elif action == 'scenario':
+        scenario = at.selectbox(key='scenario')
+        scenario.select(rng.choice(scenario.options))
+    elif action == 'section':
+        try:
+            navigation = at.radio(key='section_active')
+        except KeyError:
+            # Navigation par onglets : rien à changer, simple rerun
+            return 'rerun'
+        navigation.set_value(rng.choice(navigation.options))
+    return action
+
+
+def run_session(numero, actions, graine, pause, barriere):
+    """Une session simulée (un thread) ; retourne ses latences par rerun et ses erreurs
+
+    Une exception du harnais termine la session et compte comme une erreur, sans
+    interrompre les autres sessions.
+    """
+    from streamlit.testing.v1 import AppTest
+    barriere.wait()
+
+    rng = random.Random(graine)
+    mesures, erreurs, exception = [], 0, None
+    debut_session = time.perf_counter()
+
+    try:
+        at = AppTest.from_file(CHEMIN_APP, default_timeout=300)
+        action = 'nouvelle_session'
+        for _ in range(actions + 1):
+            debut = time.perf_counter()
+            at.run()
+            mesures.append((action, time.perf_counter() - debut))
+            erreurs += len(at.exception)
+            if pause:
+                time.sleep(rng.uniform(0, pause))
+            action = apply_action(at, rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0], rng)
+            if action is None:
+                # Rendu sans panneau de contrôle : erreur de la session (une seule fois par rerun), simple rerun
+                erreurs += 0 if at.exception else 1
+                action = 'rerun'
+    except Exception as erreur:
+        erreurs += 1
+        exception = repr(erreur)
+
+    return {
+        'session': numero,
+        'mesures': mesures,
+        'erreurs': erreurs,
+        'exception': exception,
+        'duree': time.perf_counter() - debut_session,
+    }
+
+
+def percentiles(durees):
+    """Distribution des latences en millisecondes"""
+    ms = np.asarray(durees) * 1000
+    return {
+        'n': int(ms.size),
+        'p50': float(np.percentile(ms, 50)),
+        'p95': float(np.percentile(ms, 95)),
+        'p99': float(np.percentile(ms, 99)),
+        'max': float(ms.max()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du dashboard de défense")
+    parser.add_argument('--sessions', type=int, default=8, help="sessions simultanées")
+    parser.add_argument('--actions', type=int, default=30, help="interactions par session")
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help="temps de réflexion maximal entre deux actions (s)")
+    parser.add_argument('--graine', type=int, default=0)
+    parser.add_argument('--prechauffage', action='store_true',
+                        help="préchauffage en arrière-plan pendant le test (désactivé par défaut)")
+    parser.add_argument('--sortie', help="fichier JSON du rapport")
+    args = parser.parse_args(argv)
+
+    # Lu par Dashboard.py à chaque exécution du script par le harnais
+    os.environ['DASHBOARD_PRECHAUFFAGE'] = '1' if args.prechauffage else '0'
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+    silence_streamlit()
+    try:
+        share_test_harness()
+    except RuntimeError as erreur:
+        shutil.rmtree(REPERTOIRE_STOCKAGE, ignore_errors=True)
+        print(f"Erreur : {erreur}", file=sys.stderr)
+        return 2
+
+    try:
+        # Échauffement hors mesure : imports, singletons et caches du processus
+        AppTest.from_file(CHEMIN_APP, default_timeout=300).run()
+        rss_depart = rss_octets()
+
+        barriere = threading.Barrier(args.sessions)
+        with ThreadPoolExecutor(max_workers=args.sessions, thread_name_prefix='session') as pool:
+            futures = [pool.submit(run_session, numero, args.actions, args.graine + numero, args.pause, barriere)
+                       for numero in range(args.sessions)]
+            sessions = [future.result() for future in futures]
+        croissance = (rss_octets() - rss_depart) / 1024 ** 2
+    finally:
+        # Le préchauffage écrit dans le stockage temporaire : on l'attend avant de le supprimer
+        for thread in threading.enumerate():
+            if thread.name == 'prechauffage':
+                thread.join()
+        shutil.rmtree(REPERTOIRE_STOCKAGE, ignore_errors=True)
+
+    toutes = [duree for session in sessions for _, duree in session['mesures']]
+    par_action = {}
+    for session in sessions:
+        for action, duree in session['mesures']:
+            par_action.setdefault(action, []).append(duree)
+    duree_totale = max(session['duree'] for session in sessions)
+
+    rapport = {
+        'sessions': args.sessions,
+        'actions_par_session': args.actions,
+        'reruns': len(toutes),
+        'erreurs': sum(session['erreurs'] for session in sessions),
+        'sessions_interrompues': {str(session['session']): session['exception']
+                                  for session in sessions if session['exception']},
+        'prechauffage': args.prechauffage,
+        'harnais': f"AppTest patché, streamlit {streamlit.__version__} (pas un serveur réel)",
+        'debit_reruns_par_s': len(toutes) / duree_totale,
+        'latence_ms': percentiles(toutes),
+        'latence_par_action_ms': {action: percentiles(durees) for action, durees in sorted(par_action.items())},
+        'croissance_memoire_mo': {
+            'processus': croissance,
+            'par_session': croissance / args.sessions,
+        },
+    }
+
+    latence = rapport['latence_ms']
+    print(f"{args.sessions} sessions × {args.actions} actions : {rapport['reruns']} reruns, "
+          f"{rapport['erreurs']} erreurs, {rapport['debit_reruns_par_s']:.1f} reruns/s")
+    print(f"Latence rerun : p50 {latence['p50']:.0f} ms • p95 {latence['p95']:.0f} ms • "
+          f"p99 {latence['p99']:.0f} ms • max {latence['max']:.0f} ms")
+    print(f"Harnais : {rapport['harnais']}")
+    print(f"\n{'Action':<20} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for action, stats in rapport['latence_par_action_ms'].items():
+        print(f"{action:<20} {stats['n']:>6} {stats['p50']:>10.0f} {stats['p95']:>10.0f} {stats['p99']:>10.0f}")
+    memoire = rapport['croissance_memoire_mo']
+    print(f"\nCroissance mémoire du processus : {memoire['processus']:.1f} Mo "
+          f"({memoire['par_session']:.1f} Mo par session)")
+    for numero, exception in rapport['sessions_interrompues'].items():
+        print(f"Session {numero} interrompue : {exception}")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+    return 1 if rapport['erreurs'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
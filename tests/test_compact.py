@@ -0,0 +1,33 @@
+import os
+
+# Ni stockage sur disque ni préchauffage : chaque test calcule ses données
+os.environ['DASHBOARD_STOCKAGE'] = ''
+os.environ['DASHBOARD_PRECHAUFFAGE'] = '0'
+
+import numpy as np
+
+import Dashboard
+
+
+def test_compact_years_int16_range():
+    annees = Dashboard.compact_years(np.arange(2000, 2028))
+    assert annees.dtype == np.int16
+    np.testing.assert_array_equal(annees, np.arange(2000, 2028))
+
+
+def test_compact_years_beyond_int16():
+    annees = Dashboard.compact_years(np.arange(2000, 102000))
+    assert annees.dtype == np.int32
+    np.testing.assert_array_equal(annees, np.arange(2000, 102000))
+
+
+def test_long_horizon_keeps_unique_year_index():
+    dashboard = Dashboard.DefenseRussieDashboardAvance(compact=True)
+    df, _ = dashboard.generate_advanced_data("Forces Armées Russes", "Statut Quo", 2000, 101999)
+    assert len(df) == 100_000
+    assert df['Annee'].iloc[0] == 2000 and df['Annee'].iloc[-1] == 101999
+    assert df['Annee'].is_unique and df['Annee'].is_monotonic_increasing
+
+    synthese = dashboard.generate_kpi_summary("Forces Armées Russes", "Statut Quo", 2000, 101999)
+    assert synthese.annee_reference == 2000
+    assert synthese.annee_finale == 101999
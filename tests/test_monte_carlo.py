@@ -0,0 +1,25 @@
+import os
+
+os.environ['DASHBOARD_STOCKAGE'] = ''
+os.environ['DASHBOARD_PRECHAUFFAGE'] = '0'
+
+import numpy as np
+
+import Dashboard
+
+SELECTION = "Forces Armées Russes"
+
+
+def test_bands_follow_resolution():
+    dashboard = Dashboard.DefenseRussieDashboardAvance()
+    for pas in (12, 365):
+        bandes = dashboard.generate_monte_carlo_bands(SELECTION, "Statut Quo", 1000, annee_debut=2000,
+                                                      annee_fin=2005, pas=pas)
+        df, _ = dashboard.generate_advanced_data(SELECTION, "Statut Quo", 2000, 2005, pas)
+        np.testing.assert_allclose(bandes.annees, df['Annee'].to_numpy(dtype=float))
+
+        # Au-delà de POINTS_MAX_TRACE, les deux bornes sont décimées sur les mêmes abscisses
+        fig = dashboard.build_capabilities_figure(df, bandes)
+        haut, bas = fig.data[0], fig.data[1]
+        np.testing.assert_array_equal(haut.x, bas.x)
+        assert len(haut.x) <= Dashboard.POINTS_MAX_TRACE
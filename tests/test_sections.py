@@ -0,0 +1,16 @@
+import os
+
+os.environ['DASHBOARD_STOCKAGE'] = ''
+os.environ['DASHBOARD_PRECHAUFFAGE'] = '0'
+
+import Dashboard
+
+SELECTION = "Forces Armées Russes"
+
+
+def test_sensitivity_analysis_horizon_beyond_max():
+    dashboard = Dashboard.DefenseRussieDashboardAvance()
+    controls = {'selection': SELECTION, 'scenario': "Statut Quo", 'monte_carlo': False,
+                'annee_debut': 2000, 'annee_fin': 2999, 'pas': 1}
+    # L'année par défaut (fin de l'horizon) dépasse HORIZON_MAX : elle est ramenée dans les bornes
+    dashboard.create_sensitivity_analysis(dashboard.get_advanced_config(SELECTION), controls)
@@ -0,0 +1,31 @@
+import os
+
+os.environ['DASHBOARD_STOCKAGE'] = ''
+os.environ['DASHBOARD_PRECHAUFFAGE'] = '0'
+
+import threading
+
+import Dashboard
+
+
+def test_span_depth_is_per_thread():
+    traceur = Dashboard.TraceurPerformance()
+    dans_span, fin = threading.Event(), threading.Event()
+
+    def tache():
+        with traceur.span('externe', 'test'):
+            dans_span.set()
+            fin.wait()
+
+    thread = threading.Thread(target=tache)
+    thread.start()
+    dans_span.wait()
+    # Le span ouvert par l'autre thread n'imbrique pas ceux de ce thread
+    with traceur.span('principal', 'test'):
+        with traceur.span('interne', 'test'):
+            pass
+    fin.set()
+    thread.join()
+
+    profondeurs = {span['nom']: span['profondeur'] for span in traceur.spans}
+    assert profondeurs == {'interne': 1, 'principal': 0, 'externe': 0}